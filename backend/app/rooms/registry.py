@@ -166,11 +166,7 @@ class RoomRegistry:
         with self.lock_room(game.room_id):
             game = self.get_game(game_id)
             if self._get_phase(game) != "settlement":
-                state = game.engine.dump_state()
-                if not isinstance(state, dict):
-                    raise GameStateConflictError(f"game_id={game_id} has invalid engine state")
-                state["phase"] = "settlement"
-                game.engine.load_state(state)
+                self._force_settlement_phase(game, reason="mark_game_settlement")
             self._finalize_settlement(game)
 
     @contextmanager
@@ -264,6 +260,7 @@ class RoomRegistry:
                     game = self._games_by_id.get(room.current_game_id)
                     if game is not None:
                         game.status = "aborted"
+                        self._close_engine(game)
                 room.status = "waiting"
                 room.current_game_id = None
                 for member in room.members:
@@ -321,12 +318,13 @@ class RoomRegistry:
             game = self.get_game(game_id)
             return self._get_phase(game)
 
-    def _force_settlement_phase(self, game: GameSession) -> None:
-        state = game.engine.dump_state()
-        if not isinstance(state, dict):
-            raise GameStateConflictError(f"game_id={game.game_id} has invalid engine state")
-        state["phase"] = "settlement"
-        game.engine.load_state(state)
+    def _force_settlement_phase(self, game: GameSession, reason: str = "no_legal_actions") -> None:
+        try:
+            game.engine.force_phase("settlement", reason=reason)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Forcing settlement is a host decision, not a player action: any
+            # engine failure here means the game state itself is unusable.
+            raise GameStateConflictError(f"game_id={game.game_id} has invalid engine state") from exc
 
     def _ensure_progressable_phase(self, game: GameSession) -> None:
         """Force phase convergence when current seat has no legal action."""
@@ -351,6 +349,13 @@ class RoomRegistry:
             return
         self._force_settlement_phase(game)
 
+    @staticmethod
+    def _close_engine(game: GameSession) -> None:
+        # Flush the engine's game log once the game is over; the state stays readable.
+        close = getattr(game.engine, "close", None)
+        if callable(close):
+            close()
+
     @staticmethod
     def _map_engine_error(exc: Exception, *, game_id: int) -> RoomError:
         code = str(exc)
@@ -478,6 +483,7 @@ class RoomRegistry:
                     f"game_id={game.game_id} engine settlement payload is invalid"
                 )
             game.settlement_payload = deepcopy(settlement)
+            self._close_engine(game)
 
         game.status = "settlement"
 
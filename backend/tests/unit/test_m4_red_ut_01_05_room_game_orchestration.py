@@ -135,3 +135,22 @@ def test_m4_ut_05_settlement_ready_transition_to_all_ready_starts_only_one_new_g
         registry.set_ready(room_id=0, user_id=user_ids[2], ready=True)
 
     assert registry.get_room(0).current_game_id == second_game_id
+
+
+def test_m4_ut_06_engine_failure_while_forcing_settlement_is_a_state_conflict() -> None:
+    """Input: engine raises a non-Runtime error in force_phase -> Output: GameStateConflictError."""
+    from app.rooms.registry import GameStateConflictError
+
+    registry = RoomRegistry(room_count=3)
+    user_ids = _seed_three_members(registry)
+    _set_all_ready(registry, user_ids)
+    game_id = registry.get_room(0).current_game_id
+    assert game_id is not None
+    game = registry.get_game(game_id)
+
+    def broken_force_phase(phase: str, reason: str | None = None) -> int:
+        raise ValueError("ENGINE_INVALID_PHASE")
+
+    game.engine.force_phase = broken_force_phase
+    with pytest.raises(GameStateConflictError):
+        registry.mark_game_settlement(game_id=game_id)
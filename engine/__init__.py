@@ -2,4 +2,6 @@
 
 from engine.core import XianqiGameEngine
 
+__version__ = "0.1.0"
+
 __all__ = ["XianqiGameEngine"]
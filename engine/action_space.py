@@ -0,0 +1,161 @@
+"""Canonical fixed action space and legal-action bitmasks.
+
+Every action the rules can ever offer gets a stable id: each single, pair,
+dog pair and niu triple PLAY (in combo-table order: singles, same-type
+pairs, dog pair, triples), then BUCKLE, PASS_BUCKLE, REVEAL, PASS_REVEAL and
+COVER. A legal-action mask is an int whose bit ``i`` is set when action id
+``i`` is legal, so bots can test legality without building action dicts.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from engine.cards import CARD_POWER, CARD_TYPES, DECK_TEMPLATE, clamp_lanes, pack_cards
+from engine.combos import combo_table_packed
+
+
+def _build_action_space() -> tuple[list[str], list[dict[str, int]], list[int]]:
+    types: list[str] = []
+    cards: list[dict[str, int]] = []
+    powers: list[int] = []
+    for card_type in CARD_TYPES:
+        types.append("PLAY")
+        cards.append({card_type: 1})
+        powers.append(CARD_POWER[card_type])
+    for card_type in CARD_TYPES:
+        if DECK_TEMPLATE[card_type] >= 2:
+            types.append("PLAY")
+            cards.append({card_type: 2})
+            powers.append(CARD_POWER[card_type])
+    types.append("PLAY")
+    cards.append({"R_GOU": 1, "B_GOU": 1})
+    powers.append(CARD_POWER["R_SHI"])
+    for card_type, power in (("R_NIU", 11), ("B_NIU", 10)):
+        types.append("PLAY")
+        cards.append({card_type: 3})
+        powers.append(power)
+    for action_type in ("BUCKLE", "PASS_BUCKLE", "REVEAL", "PASS_REVEAL", "COVER"):
+        types.append(action_type)
+        cards.append({})
+        powers.append(-1)
+    return types, cards, powers
+
+
+_ACTION_TYPES, _ACTION_CARDS, _ACTION_POWERS = _build_action_space()
+
+ACTION_TYPES: tuple[str, ...] = tuple(_ACTION_TYPES)
+ACTION_CARDS: tuple[tuple[tuple[str, int], ...], ...] = tuple(
+    tuple(sorted(cards.items())) for cards in _ACTION_CARDS
+)
+ACTION_POWERS: tuple[int, ...] = tuple(_ACTION_POWERS)
+NUM_ACTIONS = len(ACTION_TYPES)
+NUM_PLAY_ACTIONS = ACTION_TYPES.count("PLAY")
+
+BUCKLE = ACTION_TYPES.index("BUCKLE")
+PASS_BUCKLE = ACTION_TYPES.index("PASS_BUCKLE")
+REVEAL = ACTION_TYPES.index("REVEAL")
+PASS_REVEAL = ACTION_TYPES.index("PASS_REVEAL")
+COVER = ACTION_TYPES.index("COVER")
+
+_PLAY_ID_BY_PACKED: dict[int, int] = {
+    pack_cards(dict(cards)): action_id for action_id, cards in enumerate(ACTION_CARDS[:NUM_PLAY_ACTIONS])
+}
+
+
+def describe_action(action_id: int) -> dict[str, Any]:
+    """Return the legal-action dict shape of a canonical action id."""
+
+    if not 0 <= int(action_id) < NUM_ACTIONS:
+        raise ValueError("ENGINE_INVALID_ACTION")
+    action_type = ACTION_TYPES[action_id]
+    if action_type == "PLAY":
+        return {"type": "PLAY", "payload_cards": dict(ACTION_CARDS[action_id]), "power": ACTION_POWERS[action_id]}
+    return {"type": action_type}
+
+
+def action_id_for(action: dict[str, Any]) -> int:
+    """Map one legal-action dict onto its canonical action id."""
+
+    action_type = str(action.get("type"))
+    if action_type != "PLAY":
+        if action_type not in ACTION_TYPES:
+            raise ValueError("ENGINE_INVALID_ACTION")
+        return ACTION_TYPES.index(action_type)
+    try:
+        packed = pack_cards(action.get("payload_cards") or {})
+    except ValueError as exc:
+        raise ValueError("ENGINE_INVALID_ACTION") from exc
+    action_id = _PLAY_ID_BY_PACKED.get(packed)
+    if action_id is None:
+        raise ValueError("ENGINE_INVALID_ACTION")
+    return action_id
+
+
+def mask_from_legal_actions(legal_actions: dict[str, Any]) -> int:
+    """Build a bitmask from a ``get_legal_actions`` payload."""
+
+    mask = 0
+    for action in legal_actions.get("actions", []):
+        mask |= 1 << action_id_for(action)
+    return mask
+
+
+def action_index_for(legal_actions: dict[str, Any], action_id: int) -> int:
+    """Return the ``action_idx`` of action_id inside a ``get_legal_actions`` payload."""
+
+    for idx, action in enumerate(legal_actions.get("actions", [])):
+        if action_id_for(action) == int(action_id):
+            return idx
+    raise ValueError("ENGINE_INVALID_ACTION")
+
+
+def mask_to_action_ids(mask: int) -> list[int]:
+    return [action_id for action_id in range(NUM_ACTIONS) if mask >> action_id & 1]
+
+
+@lru_cache(maxsize=8192)
+def _play_mask(packed_hand: int, round_kind: int, last_power: int) -> int:
+    mask = 0
+    combos = combo_table_packed(packed_hand, round_kind or None)
+    for combo in combos:
+        if round_kind and combo.power <= last_power:
+            continue
+        mask |= 1 << _PLAY_ID_BY_PACKED[combo.packed]
+    if round_kind and not mask:
+        mask = 1 << COVER
+    return mask
+
+
+def legal_action_mask(state: dict[str, Any] | None, seat: int) -> int:
+    """Compute the legal-action bitmask of seat directly from state.
+
+    Mirrors ``actions.get_legal_actions`` without building action dicts.
+    """
+
+    if state is None:
+        return 0
+    turn = state.get("turn") or {}
+    current_seat = turn.get("current_seat")
+    if current_seat is None or int(current_seat) != int(seat):
+        return 0
+
+    phase = state.get("phase")
+    if phase == "buckle_flow":
+        reveal = state.get("reveal") or {}
+        pending_order = reveal.get("pending_order") or []
+        if pending_order:
+            if int(pending_order[0]) != int(seat):
+                return 0
+            return 1 << REVEAL | 1 << PASS_REVEAL
+        return 1 << BUCKLE | 1 << PASS_BUCKLE
+
+    if phase == "in_round":
+        hand = clamp_lanes(pack_cards(state["players"][int(seat)]["hand"]), 3)
+        round_kind = int(turn.get("round_kind", 0))
+        last_combo = turn.get("last_combo") or {}
+        last_power = int(last_combo.get("power", -1)) if round_kind else -1
+        return _play_mask(hand, round_kind, last_power)
+
+    return 0
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
-from engine.combos import enumerate_combos
+from engine.cards import pack_cards
+from engine.combos import combo_table_packed
 
 
 def get_legal_actions(state: dict[str, Any] | None, seat: int) -> dict[str, Any]:
@@ -45,8 +46,7 @@ def get_legal_actions(state: dict[str, Any] | None, seat: int) -> dict[str, Any]
             ],
         }
 
-    raw_hand = state["players"][int(seat)]["hand"]
-    hand = {str(card_type): int(count) for card_type, count in raw_hand.items()}
+    hand = pack_cards(state["players"][int(seat)]["hand"])
 
     if phase == "in_round":
         turn = state.get("turn") or {}
@@ -55,16 +55,16 @@ def get_legal_actions(state: dict[str, Any] | None, seat: int) -> dict[str, Any]
             return {
                 "seat": seat,
                 "actions": [
-                    {"type": "PLAY", "payload_cards": combo["cards"], "power": int(combo["power"])}
-                    for combo in enumerate_combos(hand)
+                    {"type": "PLAY", "payload_cards": dict(combo.cards), "power": combo.power}
+                    for combo in combo_table_packed(hand)
                 ],
             }
 
         last_combo = turn.get("last_combo") or {}
         last_power = int(last_combo.get("power", -1))
 
-        combos = enumerate_combos(hand, round_kind=round_kind)
-        beatable = [combo for combo in combos if int(combo["power"]) > last_power]
+        combos = combo_table_packed(hand, round_kind=round_kind)
+        beatable = [combo for combo in combos if combo.power > last_power]
 
         if beatable:
             return {
@@ -72,8 +72,8 @@ def get_legal_actions(state: dict[str, Any] | None, seat: int) -> dict[str, Any]
                 "actions": [
                     {
                         "type": "PLAY",
-                        "payload_cards": combo["cards"],
-                        "power": int(combo["power"]),
+                        "payload_cards": dict(combo.cards),
+                        "power": combo.power,
                     }
                     for combo in beatable
                 ],
@@ -0,0 +1,311 @@
+"""Equity estimates from one seat's private view.
+
+``equity`` answers "what is each of my legal actions worth?" for the seat
+to move: every sample deals the hidden cards with ``engine.sampling``, then
+each candidate move is applied to a copy of that same deal and played out to
+settlement with a rollout policy. Scoring all moves on the same deals
+(common random numbers) keeps the comparison between actions much tighter
+than independent samples would. COVER is split into its undominated cover
+lists (``combos.enumerate_covers``).
+
+Samples are cut into fixed-size jobs with their own derived seeds and
+spread over a process pool, so a given ``seed`` produces the same estimate
+for any worker count. With the default ``random_weakest_cover`` policy each
+job plays all of its playouts together on ``engine.batch.BatchXianqiEngine``
+when NumPy is installed. The module-level ``equity`` runs in-process by
+default; ``EquityEstimator`` keeps a process pool alive between calls for
+interactive use such as in-game hints.
+"""
+
+from __future__ import annotations
+
+import math
+from multiprocessing import get_context
+import os
+import random
+import time
+from typing import Any
+
+from engine.actions import get_legal_actions
+from engine.bots import BotPolicy, create_bot, weakest_cover
+from engine.combos import combo_table_packed, enumerate_covers
+from engine.reducer import ReducerDeps, fork_state, reduce_apply_action
+from engine.sampling import sample_state
+from engine.serializer import get_private_state, get_public_state
+from engine.settlements import forced_settlement_deltas, settlement_deltas
+
+try:
+    from engine.batch import BatchXianqiEngine
+except ModuleNotFoundError:  # pragma: no cover - depends on environment
+    BatchXianqiEngine = None  # type: ignore[assignment,misc]
+
+DEFAULT_POLICY = "random_weakest_cover"
+DEFAULT_JOB_SAMPLES = 128
+_MAX_ROLLOUT_STEPS = 1000
+
+Move = tuple[int, dict[str, Any], "dict[str, int] | None"]
+
+
+def candidate_moves(state: dict[str, Any], seat: int) -> list[Move]:
+    """Return (action_idx, action, cover_list) for each legal move, one per undominated cover."""
+
+    moves: list[Move] = []
+    for action_idx, action in enumerate(get_legal_actions(state, seat)["actions"]):
+        if action["type"] != "COVER":
+            moves.append((action_idx, action, None))
+            continue
+        hand = state["players"][seat]["hand"]
+        for cover_list in enumerate_covers(hand, int(action["required_count"]), prune_dominated=True):
+            moves.append((action_idx, action, cover_list))
+    return moves
+
+
+def _apply(state: dict[str, Any], action_idx: int, cover_list: dict[str, int] | None) -> None:
+    seat = int(state["turn"]["current_seat"])
+    legal_actions = get_legal_actions(state, seat)
+    deps: ReducerDeps = {"get_legal_actions": lambda _seat: legal_actions, "combo_table": combo_table_packed}
+    reduce_apply_action(state=state, action_idx=action_idx, cover_list=cover_list, client_version=None, deps=deps)
+
+
+def _forced_deltas(state: dict[str, Any]) -> list[int]:
+    # The backend force-settles a seat with no legal action; score the playout the same way.
+    return [int(row["delta"]) for row in forced_settlement_deltas(state)]
+
+
+def _random_rollout(state: dict[str, Any], rng: random.Random) -> list[int] | None:
+    # Fast path for the default policy: no observations are built.
+    for _ in range(_MAX_ROLLOUT_STEPS):
+        if state["phase"] == "settlement":
+            return [int(row["delta"]) for row in settlement_deltas(state)]
+        seat = int(state["turn"]["current_seat"])
+        actions = get_legal_actions(state, seat)["actions"]
+        if not actions:
+            return _forced_deltas(state)
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx]["type"] == "COVER":
+            cover_list = weakest_cover(state["players"][seat]["hand"], int(actions[action_idx]["required_count"]))
+        _apply(state, action_idx, cover_list)
+    return None
+
+
+def _batch_rollouts(states: list[dict[str, Any]], rng: random.Random) -> list[list[int] | None]:
+    batch = BatchXianqiEngine.from_states(states, seed=rng.getrandbits(32))
+    # Rows of games left stuck already hold their forced settlement.
+    deltas, _settled = batch.play_out()
+    return [[int(value) for value in row] for row in deltas]
+
+
+def _policy_rollout(state: dict[str, Any], bots: list[BotPolicy], rng: random.Random) -> list[int] | None:
+    for _ in range(_MAX_ROLLOUT_STEPS):
+        if state["phase"] == "settlement":
+            return [int(row["delta"]) for row in settlement_deltas(state)]
+        seat = int(state["turn"]["current_seat"])
+        legal_actions = get_legal_actions(state, seat)
+        if not legal_actions["actions"]:
+            return _forced_deltas(state)
+        action_idx, cover_list = bots[seat].choose_action(
+            {
+                "seat": seat,
+                "public_state": get_public_state(state),
+                "private_state": get_private_state(state, seat),
+                "legal_actions": legal_actions,
+                "rng": rng,
+            }
+        )
+        _apply(state, action_idx, cover_list)
+    return None
+
+
+def _run_job(job: tuple[dict[str, Any], dict[str, Any], int, str, int, int]) -> dict[str, Any]:
+    """Score every candidate move on samples deals; return per-move sums."""
+
+    public_state, private_state, seat, policy, job_seed, samples = job
+    rng = random.Random(job_seed)
+    bots = None if policy == DEFAULT_POLICY else [create_bot(policy, seed=job_seed * 3 + idx) for idx in range(3)]
+    sums: list[float] = []
+    sums_sq: list[float] = []
+    counts: list[int] = []
+    unsettled = 0
+    pending: list[tuple[int, dict[str, Any]]] = []
+    for _ in range(samples):
+        deal = sample_state(public_state, private_state, seat, rng)
+        moves = candidate_moves(deal, seat)
+        if not sums:
+            sums, sums_sq, counts = [0.0] * len(moves), [0.0] * len(moves), [0] * len(moves)
+        for move_no, (action_idx, _, cover_list) in enumerate(moves):
+            state = fork_state(deal)
+            _apply(state, action_idx, cover_list)
+            pending.append((move_no, state))
+
+    if bots is None and BatchXianqiEngine is not None:
+        outcomes = _batch_rollouts([state for _, state in pending], rng)
+    elif bots is None:
+        outcomes = [_random_rollout(state, rng) for _, state in pending]
+    else:
+        outcomes = [_policy_rollout(state, bots, rng) for _, state in pending]
+
+    for (move_no, _), deltas in zip(pending, outcomes):
+        if deltas is None:
+            unsettled += 1
+            continue
+        value = deltas[seat]
+        sums[move_no] += value
+        sums_sq[move_no] += value * value
+        counts[move_no] += 1
+    return {"deals": samples, "sums": sums, "sums_sq": sums_sq, "counts": counts, "unsettled": unsettled}
+
+
+def _jobs(
+    public_state: dict[str, Any],
+    private_state: dict[str, Any],
+    seat: int,
+    n_samples: int,
+    policy: str,
+    seed: int,
+    job_samples: int,
+) -> list[tuple[dict[str, Any], dict[str, Any], int, str, int, int]]:
+    # Plain dicts pickle faster than the engine's read-only projections.
+    public_state = _thaw(public_state)
+    private_state = _thaw(private_state)
+    jobs = []
+    for job_index, start in enumerate(range(0, n_samples, job_samples)):
+        job_seed = seed * 1_000_003 + job_index
+        jobs.append((public_state, private_state, seat, policy, job_seed, min(job_samples, n_samples - start)))
+    return jobs
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _summarize(
+    public_state: dict[str, Any],
+    private_state: dict[str, Any],
+    seat: int,
+    results: list[dict[str, Any]],
+    elapsed: float,
+) -> dict[str, Any]:
+    moves = candidate_moves(sample_state(public_state, private_state, seat, random.Random(0)), seat)
+    sums = [0.0] * len(moves)
+    sums_sq = [0.0] * len(moves)
+    counts = [0] * len(moves)
+    deals = 0
+    unsettled = 0
+    for result in results:
+        deals += result["deals"]
+        unsettled += result["unsettled"]
+        for move_no in range(len(result["counts"])):
+            sums[move_no] += result["sums"][move_no]
+            sums_sq[move_no] += result["sums_sq"][move_no]
+            counts[move_no] += result["counts"][move_no]
+
+    actions = []
+    for move_no, (action_idx, action, cover_list) in enumerate(moves):
+        count = counts[move_no]
+        mean = sums[move_no] / count if count else 0.0
+        stderr = 0.0
+        if count > 1:
+            variance = max(0.0, (sums_sq[move_no] - count * mean * mean) / (count - 1))
+            stderr = math.sqrt(variance / count)
+        actions.append(
+            {
+                "action_idx": action_idx,
+                "action": dict(action),
+                "cover_list": cover_list,
+                "mean": mean,
+                "stderr": stderr,
+                "samples": count,
+            }
+        )
+    return {
+        "seat": seat,
+        "samples": deals,
+        "actions": actions,
+        "unsettled": unsettled,
+        "elapsed": elapsed,
+        "samples_per_sec": deals / elapsed if elapsed > 0 else 0.0,
+        "playouts_per_sec": sum(counts) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class EquityEstimator:
+    """Equity estimates on a long-lived process pool; workers=1 runs in-process."""
+
+    def __init__(self, workers: int | None = None, job_samples: int = DEFAULT_JOB_SAMPLES) -> None:
+        if job_samples < 1:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.job_samples = int(job_samples)
+        self._pool = None
+        if self.workers > 1:
+            self._pool = get_context("spawn").Pool(processes=self.workers)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> EquityEstimator:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def equity(
+        self,
+        private_state: dict[str, Any],
+        public_state: dict[str, Any],
+        n_samples: int,
+        policy: str = DEFAULT_POLICY,
+        seed: int = 0,
+    ) -> dict[str, Any]:
+        """Estimate the chip delta of each legal move of the seat to act; see ``equity``."""
+
+        if public_state.get("phase") not in ("buckle_flow", "in_round"):
+            raise ValueError("ENGINE_INVALID_PHASE")
+        if n_samples < 1:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        if policy != DEFAULT_POLICY:
+            create_bot(policy)
+        seat = int(public_state["turn"]["current_seat"])
+        started = time.perf_counter()
+        jobs = _jobs(public_state, private_state, seat, n_samples, policy, seed, self.job_samples)
+        if self._pool is None:
+            results = [_run_job(job) for job in jobs]
+        else:
+            results = self._pool.map(_run_job, jobs)
+        return _summarize(jobs[0][0], jobs[0][1], seat, results, time.perf_counter() - started)
+
+
+def equity(
+    private_state: dict[str, Any],
+    public_state: dict[str, Any],
+    n_samples: int,
+    policy: str = DEFAULT_POLICY,
+    seed: int = 0,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """Estimate the expected chip delta of each legal move for the seat to act.
+
+    private_state must belong to ``public_state.turn.current_seat``. policy
+    is a bot spec (see ``engine.bots``) used for every seat after the move;
+    the default ``"random_weakest_cover"`` plays uniformly random actions
+    with weakest covers directly on the sampled state (the ``"random"`` bot
+    picks random covers too). The result lists each move with its ``mean``
+    chip delta, ``stderr`` and sample count. A playout that ends with no
+    legal action is scored as the forced settlement the backend applies
+    (``settlements.forced_settlement_deltas``); only playouts cut off by the
+    rollout step cap are left out and counted in ``unsettled``.
+
+    Each call with workers > 1 starts and tears down its own process pool;
+    repeated callers should hold an ``EquityEstimator`` instead.
+    """
+
+    with EquityEstimator(workers=workers) as estimator:
+        return estimator.equity(private_state, public_state, n_samples, policy=policy, seed=seed)
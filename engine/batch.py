@@ -0,0 +1,605 @@
+"""NumPy-backed batched simulation engine for offline analysis and training.
+
+``BatchXianqiEngine`` holds N independent games as structure-of-arrays
+tensors and advances all of them in lockstep. It reproduces the rules of
+``reducer.reduce_apply_action`` on a compact state (hands, covered cards,
+turn, reveal and pillar counts); plays and pillar groups are not recorded.
+Actions use the canonical id space of ``engine.action_space`` so legality
+is a boolean mask instead of a per-state dict list.
+
+NumPy is an optional dependency of the engine: only this module needs it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import numpy as np
+except ModuleNotFoundError as exc:  # pragma: no cover - depends on environment
+    raise ModuleNotFoundError("engine.batch requires numpy (pip install numpy)") from exc
+
+from engine import action_space
+from engine.actions import get_legal_actions as actions_get_legal_actions
+from engine.cards import CARD_INDEX, CARD_POWER, CARD_TYPES, DECK_TEMPLATE
+from engine.combos import combo_table_packed
+from engine.indexes import read_state_index
+from engine.reducer import ReducerDeps, reduce_apply_action
+from engine.settlements import settle_state
+
+PHASE_BUCKLE_FLOW = 0
+PHASE_IN_ROUND = 1
+PHASE_SETTLEMENT = 2
+PHASE_NAMES: tuple[str, ...] = ("buckle_flow", "in_round", "settlement")
+
+NUM_CARD_TYPES = len(CARD_TYPES)
+
+ACTION_TYPES = action_space.ACTION_TYPES
+NUM_ACTIONS = action_space.NUM_ACTIONS
+NUM_PLAY_ACTIONS = action_space.NUM_PLAY_ACTIONS
+BUCKLE = action_space.BUCKLE
+PASS_BUCKLE = action_space.PASS_BUCKLE
+REVEAL = action_space.REVEAL
+PASS_REVEAL = action_space.PASS_REVEAL
+COVER = action_space.COVER
+
+ACTION_CARDS = np.zeros((NUM_ACTIONS, NUM_CARD_TYPES), dtype=np.int8)
+for _action_id, _cards in enumerate(action_space.ACTION_CARDS):
+    for _card_type, _count in _cards:
+        ACTION_CARDS[_action_id, CARD_INDEX[_card_type]] = _count
+ACTION_CARDS.setflags(write=False)
+ACTION_POWER = np.array(action_space.ACTION_POWERS, dtype=np.int8)
+ACTION_KIND = ACTION_CARDS.sum(axis=1).astype(np.int8)
+IS_PLAY = np.array([action_type == "PLAY" for action_type in ACTION_TYPES])
+_PLAY_KIND = ACTION_KIND[:NUM_PLAY_ACTIONS]
+_PLAY_POWER = ACTION_POWER[:NUM_PLAY_ACTIONS]
+# Play ids are laid out as singles, same-type pairs, the dog pair, then niu
+# triples; these index arrays rebuild availability in that order.
+_PAIR_TYPES = np.array([CARD_INDEX[card_type] for card_type in CARD_TYPES if DECK_TEMPLATE[card_type] >= 2])
+_GOU_TYPES = (CARD_INDEX["R_GOU"], CARD_INDEX["B_GOU"])
+_TRIPLE_TYPES = np.array([CARD_INDEX["R_NIU"], CARD_INDEX["B_NIU"]])
+
+DECK = np.repeat(np.arange(NUM_CARD_TYPES), [DECK_TEMPLATE[card_type] for card_type in CARD_TYPES])
+_SHI_XIANG = np.array([CARD_INDEX[card_type] for card_type in ("R_SHI", "B_SHI", "R_XIANG", "B_XIANG")])
+# Default cover policy: give up the weakest card types first.
+_COVER_ORDER = np.array(sorted(range(NUM_CARD_TYPES), key=lambda idx: (CARD_POWER[CARD_TYPES[idx]], idx)))
+
+
+class BatchXianqiEngine:
+    """Run N Xianqi games in lockstep on NumPy arrays.
+
+    Seats with no pending decision still index into the same arrays, so all
+    per-game fields are dense. ``conformance_samples`` shadows that many
+    randomly chosen games with dict states advanced by
+    ``reduce_apply_action`` and asserts both engines agree after each step.
+    """
+
+    def __init__(self, n_games: int, seed: int | None = None, conformance_samples: int = 0) -> None:
+        if n_games < 1:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        self.n_games = int(n_games)
+        self._rng = np.random.default_rng(seed)
+        self._conformance_samples = max(0, min(int(conformance_samples), self.n_games))
+        self._shadow_games: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._shadow_states: list[dict[str, Any]] = []
+        self.reset()
+
+    # ------------------------------------------------------------------ state
+
+    def _allocate(self) -> None:
+        n = self.n_games
+        self.hands = np.zeros((n, 3, NUM_CARD_TYPES), dtype=np.int8)
+        self.covered = np.zeros((n, 3, NUM_CARD_TYPES), dtype=np.int8)
+        self.version = np.ones(n, dtype=np.int32)
+        self.phase = np.full(n, PHASE_BUCKLE_FLOW, dtype=np.int8)
+        self.current_seat = np.zeros(n, dtype=np.int8)
+        self.round_index = np.zeros(n, dtype=np.int16)
+        self.round_kind = np.zeros(n, dtype=np.int8)
+        self.last_power = np.full(n, -1, dtype=np.int8)
+        self.last_owner = np.full(n, -1, dtype=np.int8)
+        self.plays_count = np.zeros(n, dtype=np.int8)
+        self.buckler_seat = np.full(n, -1, dtype=np.int8)
+        self.active_revealer = np.full(n, -1, dtype=np.int8)
+        self.pending = np.full((n, 2), -1, dtype=np.int8)
+        self.pillars = np.zeros((n, 3), dtype=np.int8)
+        # Relations only matter to settlement through these two aggregates.
+        self.reveal_unenough = np.zeros((n, 3, 3), dtype=np.int16)
+        self.revealer_enough = np.zeros((n, 3), dtype=bool)
+
+    def _deal(self, games: np.ndarray) -> None:
+        pending = games
+        while pending.size:
+            keys = self._rng.random((pending.size, DECK.size))
+            dealt = DECK[np.argsort(keys, axis=1)]
+            one_hot = np.eye(NUM_CARD_TYPES, dtype=np.int8)[dealt]
+            hands = one_hot.reshape(pending.size, DECK.size // 3, 3, NUM_CARD_TYPES).sum(axis=1, dtype=np.int8)
+            self.hands[pending] = hands
+            black = (hands[:, :, _SHI_XIANG].sum(axis=2) == 0).any(axis=1)
+            pending = pending[black]
+        self.current_seat[games] = self._rng.integers(0, 3, size=games.size, dtype=np.int8)
+
+    def reset(self) -> None:
+        """Deal fresh games for every slot and restart conformance shadows."""
+
+        self._allocate()
+        self._deal(np.arange(self.n_games))
+        if self._conformance_samples:
+            self._shadow_games = np.sort(
+                self._rng.choice(self.n_games, size=self._conformance_samples, replace=False)
+            )
+            self._shadow_states = [self.to_state(int(game)) for game in self._shadow_games]
+
+    @classmethod
+    def from_states(cls, states: list[dict[str, Any]], seed: int | None = None) -> BatchXianqiEngine:
+        """Build a batch whose game ``i`` continues from ``states[i]``.
+
+        Only the fields the batch rules read are loaded: hands, covered and
+        pillar indexes, turn, reveal and the relation aggregates settlement
+        needs. Conformance shadows are not supported for loaded batches.
+        """
+
+        engine = cls(len(states), seed=seed)
+        for game, state in enumerate(states):
+            engine._load(game, state)
+        return engine
+
+    def _load(self, game: int, state: dict[str, Any]) -> None:
+        index = read_state_index(state)
+        for seat in range(3):
+            self.hands[game, seat] = 0
+            for card_type, count in state["players"][seat]["hand"].items():
+                self.hands[game, seat, CARD_INDEX[card_type]] = int(count)
+            self.covered[game, seat] = 0
+            for card_type, count in index["covered"][seat].items():
+                self.covered[game, seat, CARD_INDEX[card_type]] = int(count)
+        self.pillars[game] = index["pillar_counts"]
+        turn = state["turn"]
+        last_combo = turn.get("last_combo") or {}
+        self.version[game] = int(state["version"])
+        self.phase[game] = PHASE_NAMES.index(state["phase"])
+        self.current_seat[game] = int(turn["current_seat"])
+        self.round_index[game] = int(turn["round_index"])
+        self.round_kind[game] = int(turn["round_kind"])
+        self.last_power[game] = int(last_combo.get("power", -1))
+        self.last_owner[game] = int(last_combo.get("owner_seat", -1))
+        self.plays_count[game] = len(turn.get("plays") or [])
+        reveal = state["reveal"]
+        self.buckler_seat[game] = -1 if reveal["buckler_seat"] is None else int(reveal["buckler_seat"])
+        active = reveal["active_revealer_seat"]
+        self.active_revealer[game] = -1 if active is None else int(active)
+        self.pending[game] = -1
+        for slot, seat in enumerate(reveal["pending_order"]):
+            self.pending[game, slot] = int(seat)
+        self.reveal_unenough[game] = 0
+        self.revealer_enough[game] = False
+        for relation in reveal["relations"]:
+            revealer = int(relation["revealer_seat"])
+            if relation["revealer_enough_at_time"]:
+                self.revealer_enough[game, revealer] = True
+            else:
+                self.reveal_unenough[game, revealer, int(relation["buckler_seat"])] += 1
+
+    def to_state(self, game: int) -> dict[str, Any]:
+        """Export one game as a dict state accepted by ``XianqiGameEngine.load_state``.
+
+        Only valid at round boundaries for play history: the batch engine does
+        not record plays, so ``turn.plays`` and ``pillar_groups`` are empty.
+        """
+
+        g = int(game)
+        players = [
+            {
+                "seat": seat,
+                "hand": {
+                    CARD_TYPES[idx]: int(count) for idx, count in enumerate(self.hands[g, seat]) if count
+                },
+            }
+            for seat in range(3)
+        ]
+        last_combo = None
+        if self.last_owner[g] >= 0:
+            last_combo = {"power": int(self.last_power[g]), "owner_seat": int(self.last_owner[g])}
+        return {
+            "version": int(self.version[g]),
+            "phase": PHASE_NAMES[int(self.phase[g])],
+            "players": players,
+            "turn": {
+                "current_seat": int(self.current_seat[g]),
+                "round_index": int(self.round_index[g]),
+                "round_kind": int(self.round_kind[g]),
+                "last_combo": last_combo,
+                "plays": [],
+            },
+            "pillar_groups": [],
+            "reveal": {
+                "buckler_seat": None if self.buckler_seat[g] < 0 else int(self.buckler_seat[g]),
+                "active_revealer_seat": None if self.active_revealer[g] < 0 else int(self.active_revealer[g]),
+                "pending_order": [int(seat) for seat in self.pending[g] if seat >= 0],
+                "relations": [],
+            },
+        }
+
+    # ---------------------------------------------------------------- queries
+
+    def legal_action_mask(self) -> np.ndarray:
+        """Return a (N, NUM_ACTIONS) bool mask of legal actions for each current seat."""
+
+        n = self.n_games
+        mask = np.zeros((n, NUM_ACTIONS), dtype=bool)
+        games = np.arange(n)
+
+        buckle_flow = self.phase == PHASE_BUCKLE_FLOW
+        asking = self.pending[:, 0] >= 0
+        mask[buckle_flow & ~asking, BUCKLE] = True
+        mask[buckle_flow & ~asking, PASS_BUCKLE] = True
+        mask[buckle_flow & asking, REVEAL] = True
+        mask[buckle_flow & asking, PASS_REVEAL] = True
+
+        in_round = self.phase == PHASE_IN_ROUND
+        hand = self.hands[games, self.current_seat]
+        has_one = hand >= 1
+        available = np.concatenate(
+            (
+                has_one,
+                hand[:, _PAIR_TYPES] >= 2,
+                (has_one[:, _GOU_TYPES[0]] & has_one[:, _GOU_TYPES[1]])[:, None],
+                hand[:, _TRIPLE_TYPES] >= 3,
+            ),
+            axis=1,
+        )
+        leading = (self.round_kind == 0)[:, None]
+        beats = (_PLAY_KIND[None, :] == self.round_kind[:, None]) & (_PLAY_POWER[None, :] > self.last_power[:, None])
+        plays = available & (leading | beats) & in_round[:, None]
+        mask[:, :NUM_PLAY_ACTIONS] = plays
+        mask[in_round & ~plays.any(axis=1) & (self.round_kind > 0), COVER] = True
+        return mask
+
+    def done(self) -> np.ndarray:
+        """Return games that reached settlement or whose current seat cannot act."""
+
+        return (self.phase == PHASE_SETTLEMENT) | ~self.legal_action_mask().any(axis=1)
+
+    def default_cover(self, games: np.ndarray | None = None) -> np.ndarray:
+        """Return (N, 12) covers made of each current seat's weakest cards."""
+
+        selected = np.arange(self.n_games) if games is None else np.asarray(games)
+        cover = np.zeros((self.n_games, NUM_CARD_TYPES), dtype=np.int8)
+        hand = self.hands[selected, self.current_seat[selected]]
+        remaining = self.round_kind[selected].astype(np.int16)
+        for idx in _COVER_ORDER:
+            take = np.minimum(remaining, hand[:, idx]).astype(np.int8)
+            cover[selected, idx] = take
+            remaining -= take
+        return cover
+
+    def sample_actions(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """Pick one legal action per game uniformly at random (-1 when none)."""
+
+        legal = self.legal_action_mask() if mask is None else mask
+        scores = np.where(legal, self._rng.random(legal.shape), -1.0)
+        actions = scores.argmax(axis=1)
+        actions[~legal.any(axis=1)] = -1
+        return actions
+
+    # ------------------------------------------------------------------- step
+
+    def step(
+        self,
+        actions: np.ndarray,
+        cover: np.ndarray | None = None,
+        mask: np.ndarray | None = None,
+    ) -> None:
+        """Apply one action id per game; games that are done must pass -1.
+
+        ``cover`` is an optional (N, 12) card-count array used by COVER
+        actions; rows left empty fall back to ``default_cover``. ``mask`` may
+        pass the ``legal_action_mask()`` already computed for this step.
+        """
+
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.n_games,):
+            raise ValueError("ENGINE_INVALID_ACTION")
+        if mask is None:
+            mask = self.legal_action_mask()
+        acting = actions >= 0
+        games = np.nonzero(acting)[0]
+        if games.size and not mask[games, actions[games]].all():
+            raise ValueError("ENGINE_INVALID_ACTION")
+
+        cover_cards = self._resolve_cover(actions, cover)
+        shadow_inputs = self._shadow_inputs(actions, cover_cards, mask)
+
+        seat = self.current_seat[games].astype(np.int64)
+        action = actions[games]
+
+        self._step_play(games[IS_PLAY[action]], seat[IS_PLAY[action]], action[IS_PLAY[action]])
+        is_cover = action == COVER
+        self._step_cover(games[is_cover], seat[is_cover], cover_cards[games[is_cover]])
+        for action_id, handler in (
+            (BUCKLE, self._step_buckle),
+            (PASS_BUCKLE, self._step_pass_buckle),
+            (REVEAL, self._step_reveal),
+            (PASS_REVEAL, self._step_pass_reveal),
+        ):
+            selected = action == action_id
+            handler(games[selected], seat[selected])
+
+        self.version[games] += 1
+        self._check_conformance(shadow_inputs)
+
+    def _resolve_cover(self, actions: np.ndarray, cover: np.ndarray | None) -> np.ndarray:
+        covering = actions == COVER
+        resolved = self.default_cover(np.nonzero(covering)[0])
+        if cover is not None:
+            given = np.asarray(cover, dtype=np.int8)
+            use_given = covering & (given.sum(axis=1) > 0)
+            resolved[use_given] = given[use_given]
+        games = np.nonzero(covering)[0]
+        if games.size:
+            hand = self.hands[games, self.current_seat[games]]
+            if (resolved[games] > hand).any() or (resolved[games].sum(axis=1) != self.round_kind[games]).any():
+                raise ValueError("ENGINE_INVALID_COVER_LIST")
+        return resolved
+
+    def _next_seat(self, games: np.ndarray, seat: np.ndarray) -> None:
+        self.current_seat[games] = (seat + 1) % 3
+
+    def _step_play(self, games: np.ndarray, seat: np.ndarray, action: np.ndarray) -> None:
+        if not games.size:
+            return
+        self.hands[games, seat] -= ACTION_CARDS[action]
+        leading = self.round_kind[games] == 0
+        self.round_kind[games[leading]] = ACTION_KIND[action[leading]]
+        self.plays_count[games] += 1
+        self.last_power[games] = ACTION_POWER[action]
+        self.last_owner[games] = seat
+        self._advance_after_play(games, seat)
+
+    def _step_cover(self, games: np.ndarray, seat: np.ndarray, cards: np.ndarray) -> None:
+        if not games.size:
+            return
+        self.hands[games, seat] -= cards
+        self.covered[games, seat] += cards
+        self.plays_count[games] += 1
+        self._advance_after_play(games, seat)
+
+    def _advance_after_play(self, games: np.ndarray, seat: np.ndarray) -> None:
+        finished = self.plays_count[games] >= 3
+        self._next_seat(games[~finished], seat[~finished])
+        self._finish_round(games[finished])
+
+    def _finish_round(self, games: np.ndarray) -> None:
+        if not games.size:
+            return
+        winner = self.last_owner[games].astype(np.int64)
+        active = self.active_revealer[games].astype(np.int64)
+        has_active = active >= 0
+        active_before = self.pillars[games, np.where(has_active, active, 0)]
+        self.pillars[games, winner] += self.round_kind[games]
+        active_after = self.pillars[games, np.where(has_active, active, 0)]
+        crossed = has_active & (active_before < 3) & (active_after >= 3)
+        self.active_revealer[games[crossed]] = -1
+
+        counts = self.pillars[games]
+        settle = (counts >= 6).any(axis=1) | ((counts >= 3).sum(axis=1) == 2)
+        self.round_index[games] += 1
+        self.round_kind[games] = 0
+        self.last_power[games] = -1
+        self.last_owner[games] = -1
+        self.plays_count[games] = 0
+        self.current_seat[games] = winner
+        self.phase[games] = np.where(settle, PHASE_SETTLEMENT, PHASE_BUCKLE_FLOW)
+        self.buckler_seat[games] = -1
+        self.pending[games] = -1
+
+    def _reset_turn(self, games: np.ndarray, seat: np.ndarray) -> None:
+        self.current_seat[games] = seat
+        self.round_kind[games] = 0
+        self.last_power[games] = -1
+        self.last_owner[games] = -1
+        self.plays_count[games] = 0
+
+    def _step_buckle(self, games: np.ndarray, seat: np.ndarray) -> None:
+        if not games.size:
+            return
+        active = self.active_revealer[games].astype(np.int64)
+        self_active = active == seat
+        active[self_active] = -1
+        self.active_revealer[games[self_active]] = -1
+        first_default = (seat + 1) % 3
+        second_default = (seat + 2) % 3
+        has_active = active >= 0
+        first = np.where(has_active, active, first_default)
+        second = np.where(has_active & (active == first_default), second_default, first_default)
+        second = np.where(has_active, second, second_default)
+        self.buckler_seat[games] = seat
+        self.pending[games, 0] = first
+        self.pending[games, 1] = second
+        self.current_seat[games] = first
+
+    def _step_pass_buckle(self, games: np.ndarray, seat: np.ndarray) -> None:
+        if not games.size:
+            return
+        self.buckler_seat[games] = -1
+        self.pending[games] = -1
+        self.phase[games] = PHASE_IN_ROUND
+        self._reset_turn(games, seat)
+
+    def _pop_pending(self, games: np.ndarray) -> None:
+        self.pending[games, 0] = self.pending[games, 1]
+        self.pending[games, 1] = -1
+
+    def _step_reveal(self, games: np.ndarray, seat: np.ndarray) -> None:
+        if not games.size:
+            return
+        buckler = self.buckler_seat[games].astype(np.int64)
+        enough = self.pillars[games, seat] >= 3
+        self.revealer_enough[games[enough], seat[enough]] = True
+        np.add.at(self.reveal_unenough, (games[~enough], seat[~enough], buckler[~enough]), 1)
+        self.active_revealer[games] = seat
+        self.pending[games] = -1
+        self.buckler_seat[games] = -1
+        self.phase[games] = PHASE_IN_ROUND
+        self._reset_turn(games, buckler)
+
+    def _step_pass_reveal(self, games: np.ndarray, seat: np.ndarray) -> None:
+        if not games.size:
+            return
+        self._pop_pending(games)
+        self_active = self.active_revealer[games] == seat
+        self.active_revealer[games[self_active]] = -1
+        remaining = self.pending[games, 0] >= 0
+        self.current_seat[games[remaining]] = self.pending[games[remaining], 0]
+        closing = games[~remaining]
+        self.buckler_seat[closing] = -1
+        self.phase[closing] = PHASE_SETTLEMENT
+        self.current_seat[closing] = seat[~remaining]
+
+    def play_out(self) -> tuple[np.ndarray, np.ndarray]:
+        """Finish every game with ``sample_actions`` and default covers.
+
+        Returns ``(deltas, settled)``: the (N, 3) ``settle()`` rows and a bool
+        mask of games that reached settlement rather than getting stuck. Rows
+        of stuck games are their forced settlement
+        (``settlements.forced_settlement_deltas``), as the backend would pay.
+        """
+
+        while True:
+            mask = self.legal_action_mask()
+            actions = self.sample_actions(mask)
+            if (actions < 0).all():
+                break
+            self.step(actions, mask=mask)
+        return self.settle(), self.phase == PHASE_SETTLEMENT
+
+    # ------------------------------------------------------------- settlement
+
+    def settle(self) -> np.ndarray:
+        """Return (N, 3) chip deltas computed from each game's current pillars.
+
+        Mirrors ``settlements.settle_state``; callers should only read rows of
+        games that are ``done()``.
+        """
+
+        counts = self.pillars.astype(np.int64)
+        enough = (counts >= 3) & (counts < 6)
+        ceramic = counts >= 6
+        not_enough = counts < 3
+
+        enough_receivers = enough & ~self.revealer_enough
+        payers = not_enough.sum(axis=1, keepdims=True)
+        delta = np.where(enough_receivers, payers, 0) - np.where(
+            not_enough, enough_receivers.sum(axis=1, keepdims=True), 0
+        )
+        delta += 3 * (np.where(ceramic, payers, 0) - np.where(not_enough, ceramic.sum(axis=1, keepdims=True), 0))
+
+        effective = self.reveal_unenough * not_enough[:, :, None]
+        delta += effective.sum(axis=1) - effective.sum(axis=2)
+        self._check_settlement(delta)
+        return delta
+
+    # ------------------------------------------------------------ conformance
+
+    def _shadow_inputs(
+        self,
+        actions: np.ndarray,
+        cover: np.ndarray,
+        mask: np.ndarray,
+    ) -> list[tuple[int, int, dict[str, int] | None]]:
+        inputs: list[tuple[int, int, dict[str, int] | None]] = []
+        if not self._conformance_samples:
+            return inputs
+        for slot, game in enumerate(self._shadow_games):
+            state = self._shadow_states[slot]
+            seat = int(state["turn"]["current_seat"])
+            expected = batch_action_mask(actions_get_legal_actions(state, seat))
+            if not np.array_equal(expected, mask[game]):
+                raise AssertionError(f"batch game {int(game)} legal mask diverged at version {state['version']}")
+            action_id = int(actions[game])
+            if action_id < 0:
+                inputs.append((slot, -1, None))
+                continue
+            cover_list = None
+            if action_id == COVER:
+                cover_list = {
+                    CARD_TYPES[idx]: int(count) for idx, count in enumerate(cover[game]) if count
+                }
+            inputs.append((slot, action_id, cover_list))
+        return inputs
+
+    def _check_conformance(self, inputs: list[tuple[int, int, dict[str, int] | None]]) -> None:
+        for slot, action_id, cover_list in inputs:
+            state = self._shadow_states[slot]
+            game = int(self._shadow_games[slot])
+            if action_id >= 0:
+                seat = int(state["turn"]["current_seat"])
+                legal_actions = actions_get_legal_actions(state, seat)
+                deps: ReducerDeps = {
+                    "get_legal_actions": lambda _seat, legal=legal_actions: legal,
+                    "combo_table": combo_table_packed,
+                }
+                reduce_apply_action(
+                    state=state,
+                    action_idx=batch_action_index(legal_actions, action_id),
+                    cover_list=cover_list,
+                    client_version=None,
+                    deps=deps,
+                )
+            if _conformance_view(state) != _conformance_view(self.to_state(game)):
+                raise AssertionError(f"batch game {game} diverged from reducer at version {state['version']}")
+            if self._pillar_view(game) != _pillar_view(state):
+                raise AssertionError(f"batch game {game} pillar/covered indexes diverged at version {state['version']}")
+
+    def _check_settlement(self, delta: np.ndarray) -> None:
+        for slot, game in enumerate(self._shadow_games):
+            state = self._shadow_states[slot]
+            if state["phase"] != "settlement":
+                continue
+            settlement = settle_state(state)["settlement"]
+            expected = [int(row["delta"]) for row in settlement["chip_delta_by_seat"]]
+            if expected != [int(value) for value in delta[game]]:
+                raise AssertionError(f"batch game {int(game)} settlement diverged from settle_state")
+
+    def _pillar_view(self, game: int) -> tuple[list[int], list[dict[str, int]]]:
+        covered = [
+            {CARD_TYPES[idx]: int(count) for idx, count in enumerate(self.covered[game, seat]) if count}
+            for seat in range(3)
+        ]
+        return [int(count) for count in self.pillars[game]], covered
+
+
+def batch_action_mask(legal_actions: dict[str, Any]) -> np.ndarray:
+    """Map a ``get_legal_actions`` payload onto a bool row over the action id space."""
+
+    mask = action_space.mask_from_legal_actions(legal_actions)
+    return np.array([bool(mask >> action_id & 1) for action_id in range(NUM_ACTIONS)])
+
+
+def batch_action_index(legal_actions: dict[str, Any], action_id: int) -> int:
+    """Return the ``action_idx`` of action_id inside a ``get_legal_actions`` payload."""
+
+    return action_space.action_index_for(legal_actions, action_id)
+
+
+def _conformance_view(state: dict[str, Any]) -> dict[str, Any]:
+    turn = state["turn"]
+    last_combo = turn.get("last_combo") or {}
+    reveal = state["reveal"]
+    return {
+        "version": int(state["version"]),
+        "phase": state["phase"],
+        "hands": [dict(sorted(player["hand"].items())) for player in state["players"]],
+        "current_seat": int(turn["current_seat"]),
+        "round_index": int(turn["round_index"]),
+        "round_kind": int(turn["round_kind"]),
+        "last_power": int(last_combo.get("power", -1)),
+        "last_owner": int(last_combo.get("owner_seat", -1)),
+        "buckler_seat": reveal["buckler_seat"],
+        "active_revealer_seat": reveal["active_revealer_seat"],
+        "pending_order": list(reveal["pending_order"]),
+    }
+
+
+def _pillar_view(state: dict[str, Any]) -> tuple[list[int], list[dict[str, int]]]:
+    index = read_state_index(state)
+    return list(index["pillar_counts"]), [dict(covered) for covered in index["covered"]]
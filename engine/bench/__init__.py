@@ -0,0 +1,292 @@
+"""Engine micro/macro benchmarks with JSON results and baseline comparison.
+
+Every metric is reported as ``ops_per_sec`` (higher is better) so one
+tolerance rule covers combo enumeration, reducer, projection, settlement and
+full-game throughput. Inputs come from seeded random playouts, so two runs
+with the same parameters time exactly the same work.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from engine.bots import random_cover
+from engine.combos import clear_combo_table, enumerate_combos
+from engine.core import XianqiGameEngine
+
+BENCH_SCHEMA_VERSION = 1
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+BENCHMARKS: tuple[str, ...] = (
+    "enumerate_combos",
+    "enumerate_combos_cold",
+    "get_legal_actions",
+    "apply_action",
+    "get_public_state",
+    "get_private_state",
+    "settle",
+    "random_playout",
+)
+
+
+def random_playout(seed: int, record: list[dict[str, Any]] | None = None) -> XianqiGameEngine:
+    """Play one game with uniformly random legal actions and return the engine.
+
+    When record is given, each step appends ``{"state", "action_idx", "cover_list"}``
+    with the pre-action dump so the transition can be replayed later.
+    """
+
+    rng = random.Random(seed)
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=seed)
+    while True:
+        state = engine.dump_state()
+        if state["phase"] == "settlement":
+            return engine
+        seat = int(state["turn"]["current_seat"])
+        actions = engine.get_legal_actions(seat)["actions"]
+        if not actions:
+            return engine
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx]["type"] == "COVER":
+            cover_list = random_cover(state["players"][seat]["hand"], int(actions[action_idx]["required_count"]), rng)
+        if record is not None:
+            record.append({"state": state, "action_idx": action_idx, "cover_list": cover_list})
+        engine.apply_action(action_idx, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def _force_settlement_if_stuck(engine: XianqiGameEngine) -> None:
+    """Force a game stopped with no legal action into settlement, as the backend does."""
+
+    if engine.get_public_state()["phase"] != "settlement":
+        engine.force_phase("settlement", reason="no_legal_actions")
+
+
+def _build_corpus(games: int, seed: int) -> dict[str, list[Any]]:
+    steps: list[dict[str, Any]] = []
+    settlement_states: list[dict[str, Any]] = []
+    for offset in range(games):
+        engine = random_playout(seed + offset, record=steps)
+        _force_settlement_if_stuck(engine)
+        settlement_states.append(engine.dump_state())
+    hands = [
+        (step["state"]["players"][seat]["hand"], int(step["state"]["turn"]["round_kind"]) or None)
+        for step in steps
+        if step["state"]["phase"] == "in_round"
+        for seat in range(3)
+    ]
+    return {"steps": steps, "settlement_states": settlement_states, "hands": hands}
+
+
+def _time_ops(run_pass: Callable[[], tuple[float, int]], repeat: int) -> dict[str, Any]:
+    """Run run_pass repeat times and keep the fastest pass (timeit-style)."""
+
+    best_elapsed = float("inf")
+    ops = 0
+    for _ in range(max(1, repeat)):
+        elapsed, ops = run_pass()
+        best_elapsed = min(best_elapsed, elapsed)
+    best_elapsed = max(best_elapsed, 1e-9)
+    return {
+        "ops": ops,
+        "seconds": best_elapsed,
+        "ops_per_sec": ops / best_elapsed,
+        "mean_us": best_elapsed / max(ops, 1) * 1e6,
+    }
+
+
+def _timed_calls(items: list[Any], call: Callable[[Any], Any]) -> tuple[float, int]:
+    clock = time.perf_counter
+    started = clock()
+    for item in items:
+        call(item)
+    return clock() - started, len(items)
+
+
+def _timed_after_setup(items: list[Any], setup: Callable[[Any], Any], call: Callable[[Any], Any]) -> tuple[float, int]:
+    """Time call(setup(item)) for each item, excluding setup from the clock."""
+
+    clock = time.perf_counter
+    elapsed = 0.0
+    for item in items:
+        prepared = setup(item)
+        started = clock()
+        call(prepared)
+        elapsed += clock() - started
+    return elapsed, len(items)
+
+
+def _loaded_engine(state: dict[str, Any]) -> XianqiGameEngine:
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    return engine
+
+
+def run_benchmarks(
+    games: int = 30,
+    repeat: int = 3,
+    seed: int = 0,
+    playout_games: int | None = None,
+    only: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run the benchmark suite and return a JSON-serializable result payload."""
+
+    selected = list(BENCHMARKS) if only is None else [name for name in BENCHMARKS if name in set(only)]
+    unknown = sorted(set(only or []) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {', '.join(unknown)}")
+
+    corpus = _build_corpus(games, seed)
+    steps = corpus["steps"]
+    hands = corpus["hands"]
+    playout_seeds = list(range(seed, seed + (playout_games if playout_games is not None else games)))
+
+    def enumerate_warm() -> tuple[float, int]:
+        return _timed_calls(hands, lambda item: enumerate_combos(item[0], item[1]))
+
+    def enumerate_cold() -> tuple[float, int]:
+        clear_combo_table()
+        return _timed_calls(hands, lambda item: enumerate_combos(item[0], item[1]))
+
+    def legal_actions() -> tuple[float, int]:
+        return _timed_after_setup(
+            steps,
+            lambda step: (_loaded_engine(step["state"]), int(step["state"]["turn"]["current_seat"])),
+            lambda prepared: prepared[0].get_legal_actions(prepared[1]),
+        )
+
+    def apply_action() -> tuple[float, int]:
+        return _timed_after_setup(
+            steps,
+            lambda step: (_loaded_engine(step["state"]), step),
+            lambda prepared: prepared[0].apply_action(
+                prepared[1]["action_idx"],
+                cover_list=prepared[1]["cover_list"],
+                client_version=int(prepared[1]["state"]["version"]),
+            ),
+        )
+
+    def public_state() -> tuple[float, int]:
+        return _timed_after_setup(steps, lambda step: _loaded_engine(step["state"]), lambda engine: engine.get_public_state())
+
+    def private_state() -> tuple[float, int]:
+        return _timed_after_setup(
+            steps,
+            lambda step: _loaded_engine(step["state"]),
+            lambda engine: [engine.get_private_state(seat) for seat in range(3)],
+        )
+
+    def settle() -> tuple[float, int]:
+        return _timed_after_setup(corpus["settlement_states"], _loaded_engine, lambda engine: engine.settle())
+
+    def playouts() -> tuple[float, int]:
+        def play(seed_value: int) -> None:
+            engine = random_playout(seed_value)
+            _force_settlement_if_stuck(engine)
+            engine.settle()
+
+        return _timed_calls(playout_seeds, play)
+
+    runners: dict[str, Callable[[], tuple[float, int]]] = {
+        "enumerate_combos": enumerate_warm,
+        "enumerate_combos_cold": enumerate_cold,
+        "get_legal_actions": legal_actions,
+        "apply_action": apply_action,
+        "get_public_state": public_state,
+        "get_private_state": private_state,
+        "settle": settle,
+        "random_playout": playouts,
+    }
+
+    results = {name: _time_ops(runners[name], repeat) for name in selected}
+    return {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "created_at": int(time.time()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {"games": games, "repeat": repeat, "seed": seed, "playout_games": len(playout_seeds)},
+        "results": results,
+    }
+
+
+def params_mismatch(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, tuple[Any, Any]]:
+    """Return ``{param: (current, baseline)}`` for run params that differ from the baseline's."""
+
+    current_params = current.get("params") or {}
+    baseline_params = baseline.get("params") or {}
+    return {
+        key: (current_params.get(key), baseline_params.get(key))
+        for key in sorted(set(current_params) | set(baseline_params))
+        if current_params.get(key) != baseline_params.get(key)
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[dict[str, Any]]:
+    """Return metrics whose ops_per_sec fell more than tolerance below baseline.
+
+    Numbers from different corpora are not comparable, so a baseline recorded
+    with other run params (games, repeat, seed, playout_games) is rejected.
+    """
+
+    mismatch = params_mismatch(current, baseline)
+    if mismatch:
+        detail = ", ".join(f"{key}={value!r} (baseline {reference!r})" for key, (value, reference) in mismatch.items())
+        raise ValueError(f"bench params differ from baseline: {detail}")
+    regressions: list[dict[str, Any]] = []
+    baseline_results = baseline.get("results") or {}
+    for name, metric in (current.get("results") or {}).items():
+        reference = baseline_results.get(name)
+        if not isinstance(reference, dict):
+            continue
+        reference_ops = float(reference.get("ops_per_sec", 0.0))
+        current_ops = float(metric.get("ops_per_sec", 0.0))
+        if reference_ops <= 0:
+            continue
+        ratio = current_ops / reference_ops
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline_ops_per_sec": reference_ops,
+                    "current_ops_per_sec": current_ops,
+                    "ratio": ratio,
+                }
+            )
+    return regressions
+
+
+def load_results(path: str | Path) -> dict[str, Any]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_results(path: str | Path, results: dict[str, Any]) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8") as handle:
+        json.dump(results, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_BASELINE_PATH",
+    "DEFAULT_TOLERANCE",
+    "compare_results",
+    "load_results",
+    "random_playout",
+    "run_benchmarks",
+    "write_results",
+]
@@ -0,0 +1,85 @@
+"""Command-line entry point: ``python -m engine.bench``."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Callable
+
+from engine.bench import (
+    BENCHMARKS,
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_TOLERANCE,
+    compare_results,
+    load_results,
+    params_mismatch,
+    run_benchmarks,
+    write_results,
+)
+
+
+def _render_table(results: dict, baseline: dict | None) -> list[str]:
+    baseline_results = (baseline or {}).get("results") or {}
+    lines = [f"{'benchmark':<24}{'ops/s':>14}{'mean us':>12}{'vs base':>10}"]
+    for name, metric in results["results"].items():
+        reference = baseline_results.get(name)
+        ratio = ""
+        if isinstance(reference, dict) and float(reference.get("ops_per_sec", 0.0)) > 0:
+            ratio = f"{metric['ops_per_sec'] / float(reference['ops_per_sec']):.2f}x"
+        lines.append(f"{name:<24}{metric['ops_per_sec']:>14.1f}{metric['mean_us']:>12.2f}{ratio:>10}")
+    return lines
+
+
+def main(argv: list[str] | None = None, output_fn: Callable[[str], None] = print) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Xianqi engine and compare against a baseline.")
+    parser.add_argument("--games", type=int, default=30, help="Seeded random games used to build the input corpus.")
+    parser.add_argument("--playout-games", type=int, default=None, help="Games per random_playout pass (default: --games).")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per benchmark; the fastest pass is kept.")
+    parser.add_argument("--seed", type=int, default=0, help="First corpus seed.")
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="Run only this benchmark (repeatable).")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this path.")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE_PATH), help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed ops/s drop ratio before failing.")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite --baseline with these results.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        games=args.games,
+        repeat=args.repeat,
+        seed=args.seed,
+        playout_games=args.playout_games,
+        only=args.only,
+    )
+    if args.output:
+        write_results(args.output, results)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        write_results(baseline_path, results)
+        output_fn("\n".join(_render_table(results, None)))
+        output_fn(f"baseline saved: {baseline_path}")
+        return 0
+
+    baseline = load_results(baseline_path) if baseline_path.exists() else None
+    mismatch = params_mismatch(results, baseline) if baseline is not None else {}
+    output_fn("\n".join(_render_table(results, None if mismatch else baseline)))
+    if baseline is None:
+        output_fn(f"no baseline at {baseline_path}; skipped comparison")
+        return 0
+    if mismatch:
+        for key, (value, reference) in mismatch.items():
+            output_fn(f"PARAMS MISMATCH {key}: {value!r} vs baseline {reference!r}")
+        output_fn(f"baseline {baseline_path} was recorded with other params; rerun with them or --save-baseline")
+        return 2
+
+    regressions = compare_results(results, baseline, tolerance=args.tolerance)
+    for item in regressions:
+        output_fn(
+            f"REGRESSION {item['name']}: {item['current_ops_per_sec']:.1f} ops/s "
+            f"vs baseline {item['baseline_ops_per_sec']:.1f} ({item['ratio']:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+"""Bot policy plugin interface and built-in policies.
+
+A policy is any object with ``choose_action(observation) -> (action_idx, cover_list)``.
+The observation only carries what a seated player may see: its seat, the
+public and private projections and its legal actions, plus a per-seat
+``random.Random`` so seeded games stay reproducible.
+
+Policies are created by name through ``create_bot``. Built-in names are
+registered with ``register_bot``; any other ``"package.module:attr"`` spec is
+imported and called with ``seed`` to build a plugin policy.
+"""
+
+from __future__ import annotations
+
+import importlib
+import random
+from typing import Any, Callable, Protocol
+
+from engine.cards import CARD_POWER
+
+Observation = dict[str, Any]
+Decision = tuple[int, "dict[str, int] | None"]
+
+
+class BotPolicy(Protocol):
+    def choose_action(self, observation: Observation) -> Decision: ...
+
+
+BotFactory = Callable[[int], BotPolicy]
+
+_BOT_REGISTRY: dict[str, BotFactory] = {}
+
+
+def register_bot(name: str) -> Callable[[BotFactory], BotFactory]:
+    """Register a policy factory under name; the factory receives a seed."""
+
+    def decorator(factory: BotFactory) -> BotFactory:
+        if name in _BOT_REGISTRY:
+            raise ValueError(f"bot already registered: {name}")
+        _BOT_REGISTRY[name] = factory
+        return factory
+
+    return decorator
+
+
+def available_bots() -> list[str]:
+    return sorted(_BOT_REGISTRY)
+
+
+def create_bot(spec: str, seed: int = 0) -> BotPolicy:
+    """Build a policy from a registered name or a ``module:attr`` plugin spec."""
+
+    factory = _BOT_REGISTRY.get(spec)
+    if factory is None:
+        module_name, sep, attr = spec.partition(":")
+        if not sep or not module_name or not attr:
+            raise ValueError(f"unknown bot: {spec}")
+        factory = getattr(importlib.import_module(module_name), attr)
+    return factory(seed)
+
+
+def expand_hand(hand: dict[str, int]) -> list[str]:
+    return [card_type for card_type, count in sorted(hand.items()) for _ in range(int(count))]
+
+
+def weakest_cover(hand: dict[str, int], required_count: int) -> dict[str, int]:
+    """Pick the required_count lowest-power cards of hand as a cover list."""
+
+    cards = sorted(expand_hand(hand), key=lambda card_type: (CARD_POWER[card_type], card_type))
+    cover_list: dict[str, int] = {}
+    for card_type in cards[:required_count]:
+        cover_list[card_type] = cover_list.get(card_type, 0) + 1
+    return cover_list
+
+
+def random_cover(hand: dict[str, int], required_count: int, rng: random.Random) -> dict[str, int]:
+    cover_list: dict[str, int] = {}
+    for card_type in rng.sample(expand_hand(hand), required_count):
+        cover_list[card_type] = cover_list.get(card_type, 0) + 1
+    return cover_list
+
+
+def _cover_action(observation: Observation, action_idx: int) -> dict[str, int] | None:
+    action = observation["legal_actions"]["actions"][action_idx]
+    if action.get("type") != "COVER":
+        return None
+    return weakest_cover(observation["private_state"]["hand"], int(action["required_count"]))
+
+
+class RandomBot:
+    """Uniformly random legal action and random cover cards."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self._seed = seed
+
+    def choose_action(self, observation: Observation) -> Decision:
+        rng: random.Random = observation["rng"]
+        actions = observation["legal_actions"]["actions"]
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx].get("type") == "COVER":
+            cover_list = random_cover(
+                observation["private_state"]["hand"], int(actions[action_idx]["required_count"]), rng
+            )
+        return action_idx, cover_list
+
+
+class GreedyBot:
+    """Play the highest-power combo, cover with the weakest cards, never buckle or reveal."""
+
+    _PREFERRED = ("PASS_BUCKLE", "PASS_REVEAL")
+
+    def __init__(self, seed: int = 0) -> None:
+        self._seed = seed
+
+    def choose_action(self, observation: Observation) -> Decision:
+        actions = observation["legal_actions"]["actions"]
+        plays = [idx for idx, action in enumerate(actions) if action.get("type") == "PLAY"]
+        if plays:
+            action_idx = max(plays, key=lambda idx: (int(actions[idx].get("power", -1)), -idx))
+            return action_idx, None
+        for preferred in self._PREFERRED:
+            for idx, action in enumerate(actions):
+                if action.get("type") == preferred:
+                    return idx, None
+        return 0, _cover_action(observation, 0)
+
+
+class AlwaysBuckleBot(GreedyBot):
+    """Buckle and reveal whenever offered; otherwise play like GreedyBot."""
+
+    _PREFERRED = ("BUCKLE", "REVEAL")
+
+
+register_bot("random")(RandomBot)
+register_bot("greedy")(GreedyBot)
+register_bot("always-buckle")(AlwaysBuckleBot)
+
+
+@register_bot("ismcts")
+def _ismcts_bot(seed: int) -> BotPolicy:
+    # Imported lazily: the search pulls in the sampler and, when installed, NumPy.
+    from engine.bots.ismcts import ISMCTSBot
+
+    return ISMCTSBot(seed)
+
+
+__all__ = [
+    "AlwaysBuckleBot",
+    "BotPolicy",
+    "GreedyBot",
+    "RandomBot",
+    "available_bots",
+    "create_bot",
+    "random_cover",
+    "register_bot",
+    "weakest_cover",
+]
@@ -0,0 +1,334 @@
+"""Information-set Monte Carlo tree search policy.
+
+Single-observer ISMCTS: each iteration deals the hidden cards afresh with
+``engine.sampling.sample_state``, then walks one shared tree whose edges are
+canonical action ids (``engine.action_space``), considering only moves that
+are legal in that deal. Children are picked by UCB1 over their availability
+count, one new child is expanded, and the resulting state is played out at
+random to settlement. Rewards are each node's own seat chip delta; a playout
+that ends with no legal action is scored as the forced settlement the
+backend applies (``settlements.forced_settlement_deltas``).
+
+Leaves are collected ``batch_size`` at a time (visits are counted on the way
+down, acting as a virtual loss so one batch spreads over the tree) and their
+playouts run together: on ``engine.batch.BatchXianqiEngine`` when NumPy is
+installed, otherwise one by one through the reducer. The search stops at the
+first batch boundary past ``budget_ms``, so move latency stays bounded.
+
+``python -m engine.bots.ismcts`` times the bot on recorded positions and
+prints playouts/sec and per-move latency percentiles as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from typing import Any
+
+from engine.action_space import action_id_for
+from engine.actions import get_legal_actions
+from engine.bots import Decision, Observation
+from engine.cards import pack_cards
+from engine.combos import combo_table_packed, enumerate_covers
+from engine.reducer import ReducerDeps, reduce_apply_action
+from engine.sampling import sample_state
+from engine.settlements import forced_settlement_deltas, settlement_deltas
+
+try:
+    from engine.batch import BatchXianqiEngine
+except ModuleNotFoundError:  # pragma: no cover - depends on environment
+    BatchXianqiEngine = None  # type: ignore[assignment,misc]
+
+DEFAULT_BUDGET_MS = 100.0
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_EXPLORATION = 0.7
+# Chip deltas rarely leave [-6, 6]; scaling keeps UCB exploration in range.
+REWARD_SCALE = 6.0
+
+MoveKey = tuple[int, int]
+Move = tuple[MoveKey, int, "dict[str, int] | None"]
+
+
+class _Node:
+    __slots__ = ("seat", "children", "visits", "avail", "reward")
+
+    def __init__(self, seat: int) -> None:
+        self.seat = seat
+        self.children: dict[MoveKey, _Node] = {}
+        self.visits = 0
+        self.avail = 1
+        self.reward = 0.0
+
+
+def _moves(state: dict[str, Any], seat: int, legal: dict[str, Any]) -> list[Move]:
+    """Expand legal actions into tree moves; COVER fans out into its undominated cover lists."""
+
+    moves: list[Move] = []
+    for action_idx, action in enumerate(legal["actions"]):
+        action_id = action_id_for(action)
+        if action["type"] != "COVER":
+            moves.append(((action_id, 0), action_idx, None))
+            continue
+        hand = state["players"][seat]["hand"]
+        for cover_list in enumerate_covers(hand, int(action["required_count"]), prune_dominated=True):
+            moves.append(((action_id, pack_cards(cover_list)), action_idx, cover_list))
+    return moves
+
+
+def _apply(state: dict[str, Any], legal: dict[str, Any], move: Move) -> None:
+    deps: ReducerDeps = {"get_legal_actions": lambda _seat: legal, "combo_table": combo_table_packed}
+    reduce_apply_action(state=state, action_idx=move[1], cover_list=move[2], client_version=None, deps=deps)
+
+
+def _settled_deltas(state: dict[str, Any]) -> list[int]:
+    return [int(row["delta"]) for row in settlement_deltas(state)]
+
+
+def rollout(state: dict[str, Any], rng: random.Random) -> list[int]:
+    """Play state out in place with random actions and weakest covers.
+
+    A game stuck with no legal action scores its forced settlement.
+    """
+
+    while state["phase"] != "settlement":
+        seat = int(state["turn"]["current_seat"])
+        legal = get_legal_actions(state, seat)
+        if not legal["actions"]:
+            return [int(row["delta"]) for row in forced_settlement_deltas(state)]
+        action_idx = rng.randrange(len(legal["actions"]))
+        # Covers are listed weakest first, so this also picks the weakest cover.
+        move = next(move for move in _moves(state, seat, legal) if move[1] == action_idx)
+        _apply(state, legal, move)
+    return _settled_deltas(state)
+
+
+def batch_rollout(states: list[dict[str, Any]], rng: random.Random) -> list[list[int]]:
+    """Play many states out together on the NumPy batch engine.
+
+    Stuck rows keep the batch ``settle()`` deltas, which equal their forced settlement.
+    """
+
+    if BatchXianqiEngine is None:
+        raise ModuleNotFoundError("batch rollouts require numpy (pip install numpy)")
+    batch = BatchXianqiEngine.from_states(states, seed=rng.getrandbits(32))
+    deltas, _settled = batch.play_out()
+    return [[int(value) for value in row] for row in deltas]
+
+
+class ISMCTSBot:
+    """ISMCTS policy with a per-move time budget and batched playouts."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        budget_ms: float | None = DEFAULT_BUDGET_MS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        exploration: float = DEFAULT_EXPLORATION,
+        max_iterations: int | None = None,
+        batched: bool | None = None,
+    ) -> None:
+        if budget_ms is None and max_iterations is None:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        if batch_size < 1:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        if batched and BatchXianqiEngine is None:
+            raise ModuleNotFoundError("batch rollouts require numpy (pip install numpy)")
+        self._seed = seed
+        self.budget_ms = budget_ms
+        self.batch_size = int(batch_size)
+        self.exploration = float(exploration)
+        self.max_iterations = max_iterations
+        self.batched = BatchXianqiEngine is not None if batched is None else bool(batched)
+        self.last_report: dict[str, Any] | None = None
+        self._moves_searched = 0
+        self._playouts = 0
+        self._elapsed = 0.0
+
+    def choose_action(self, observation: Observation) -> Decision:
+        actions = observation["legal_actions"]["actions"]
+        if len(actions) == 1 and actions[0].get("type") != "COVER":
+            return 0, None
+
+        rng: random.Random = observation["rng"]
+        seat = int(observation["seat"])
+        public_state = observation["public_state"]
+        private_state = observation["private_state"]
+        started = time.perf_counter()
+        deadline = None if self.budget_ms is None else started + self.budget_ms / 1000.0
+
+        root = _Node(-1)
+        root_moves: dict[MoveKey, Move] = {}
+        iterations = 0
+        while True:
+            size = self.batch_size
+            if self.max_iterations is not None:
+                size = min(size, self.max_iterations - iterations)
+            paths: list[list[_Node]] = []
+            leaves: list[dict[str, Any]] = []
+            for _ in range(size):
+                state = sample_state(public_state, private_state, seat, rng)
+                if not root_moves:
+                    root_moves = {move[0]: move for move in _moves(state, seat, observation["legal_actions"])}
+                paths.append(self._descend(root, state, rng))
+                leaves.append(state)
+            self._backpropagate(paths, self._playout(leaves, rng))
+            iterations += size
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        key = max(root_moves, key=lambda move_key: root.children[move_key].visits if move_key in root.children else -1)
+        elapsed = time.perf_counter() - started
+        self._moves_searched += 1
+        self._playouts += iterations
+        self._elapsed += elapsed
+        self.last_report = {
+            "iterations": iterations,
+            "elapsed_ms": elapsed * 1000.0,
+            "playouts_per_sec": iterations / elapsed if elapsed > 0 else 0.0,
+            "batched": self.batched,
+        }
+        _, action_idx, cover_list = root_moves[key]
+        return action_idx, cover_list
+
+    def report(self) -> dict[str, Any]:
+        """Return cumulative search counters across every ``choose_action`` call."""
+
+        return {
+            "moves": self._moves_searched,
+            "playouts": self._playouts,
+            "elapsed_ms": self._elapsed * 1000.0,
+            "playouts_per_sec": self._playouts / self._elapsed if self._elapsed > 0 else 0.0,
+            "batched": self.batched,
+        }
+
+    def _descend(self, root: _Node, state: dict[str, Any], rng: random.Random) -> list[_Node]:
+        node = root
+        node.visits += 1
+        path = [node]
+        while state["phase"] != "settlement":
+            seat = int(state["turn"]["current_seat"])
+            legal = get_legal_actions(state, seat)
+            moves = _moves(state, seat, legal)
+            if not moves:
+                break
+            untried = [move for move in moves if move[0] not in node.children]
+            for move in moves:
+                child = node.children.get(move[0])
+                if child is not None:
+                    child.avail += 1
+            if untried:
+                move = untried[rng.randrange(len(untried))]
+                child = node.children[move[0]] = _Node(seat)
+            else:
+                move = max(moves, key=lambda candidate: self._ucb(node.children[candidate[0]]))
+                child = node.children[move[0]]
+            _apply(state, legal, move)
+            child.visits += 1
+            path.append(child)
+            node = child
+            if untried:
+                break
+        return path
+
+    def _ucb(self, node: _Node) -> float:
+        return node.reward / node.visits + self.exploration * math.sqrt(math.log(node.avail) / node.visits)
+
+    def _playout(self, leaves: list[dict[str, Any]], rng: random.Random) -> list[list[int]]:
+        pending = [idx for idx, state in enumerate(leaves) if state["phase"] != "settlement"]
+        results: list[list[int]] = [
+            _settled_deltas(state) if state["phase"] == "settlement" else [0, 0, 0] for state in leaves
+        ]
+        if self.batched and pending:
+            for idx, deltas in zip(pending, batch_rollout([leaves[idx] for idx in pending], rng)):
+                results[idx] = deltas
+        else:
+            for idx in pending:
+                results[idx] = rollout(leaves[idx], rng)
+        return results
+
+    @staticmethod
+    def _backpropagate(paths: list[list[_Node]], results: list[list[int]]) -> None:
+        for path, deltas in zip(paths, results):
+            for node in path[1:]:
+                node.reward += deltas[node.seat] / REWARD_SCALE
+
+
+def _positions(count: int, seed: int) -> list[dict[str, Any]]:
+    from engine.bench import random_playout
+
+    positions: list[dict[str, Any]] = []
+    game_seed = seed
+    while len(positions) < count:
+        record: list[dict[str, Any]] = []
+        random_playout(game_seed, record=record)
+        positions.extend(entry["state"] for entry in record[:: max(1, len(record) // 4)])
+        game_seed += 1
+    return positions[:count]
+
+
+def benchmark(
+    positions: int = 20,
+    seed: int = 0,
+    budget_ms: float = DEFAULT_BUDGET_MS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batched: bool | None = None,
+) -> dict[str, Any]:
+    """Time ``choose_action`` on recorded positions and report throughput and latency."""
+
+    from engine.core import XianqiGameEngine
+
+    bot = ISMCTSBot(seed, budget_ms=budget_ms, batch_size=batch_size, batched=batched)
+    latencies: list[float] = []
+    for offset, state in enumerate(_positions(positions, seed)):
+        engine = XianqiGameEngine()
+        engine.load_state(state)
+        seat = int(state["turn"]["current_seat"])
+        observation = {
+            "seat": seat,
+            "public_state": engine.get_public_state(),
+            "private_state": engine.get_private_state(seat),
+            "legal_actions": engine.get_legal_actions(seat),
+            "rng": random.Random(seed + offset),
+        }
+        started = time.perf_counter()
+        bot.choose_action(observation)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+
+    latencies.sort()
+    summary = bot.report()
+    summary["latency_ms"] = {
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "max": latencies[-1],
+    }
+    summary["budget_ms"] = budget_ms
+    summary["batch_size"] = batch_size
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report ISMCTS playouts/sec and move latency")
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-batch", action="store_true", help="run playouts through the reducer one by one")
+    args = parser.parse_args(argv)
+    summary = benchmark(
+        positions=args.positions,
+        seed=args.seed,
+        budget_ms=args.budget_ms,
+        batch_size=args.batch_size,
+        batched=False if args.no_batch else None,
+    )
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""Card type ordering and packed card-count encoding for engine internals.
+
+A packed card map stores one unsigned 8-bit lane per card type (in
+``CARD_TYPES`` order) inside a single Python int. Lane values stay far below
+the guard bit, so containment, subtraction and totals are plain integer
+arithmetic. State payloads keep ``dict[str, int]`` CardCountMap objects; the
+packed form is only used inside combo/action/reducer computations.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+CARD_POWER: dict[str, int] = {
+    "R_SHI": 9,
+    "B_SHI": 8,
+    "R_XIANG": 7,
+    "B_XIANG": 6,
+    "R_MA": 5,
+    "B_MA": 4,
+    "R_CHE": 3,
+    "B_CHE": 2,
+    "R_GOU": 3,
+    "B_GOU": 2,
+    "R_NIU": 1,
+    "B_NIU": 0,
+}
+
+DECK_TEMPLATE: dict[str, int] = {
+    "R_SHI": 2,
+    "B_SHI": 2,
+    "R_XIANG": 2,
+    "B_XIANG": 2,
+    "R_MA": 2,
+    "B_MA": 2,
+    "R_CHE": 2,
+    "B_CHE": 2,
+    "R_GOU": 1,
+    "B_GOU": 1,
+    "R_NIU": 3,
+    "B_NIU": 3,
+}
+
+CARD_TYPES: tuple[str, ...] = tuple(CARD_POWER)
+CARD_INDEX: dict[str, int] = {card_type: idx for idx, card_type in enumerate(CARD_TYPES)}
+
+LANE_BITS = 8
+LANE_MASK = (1 << LANE_BITS) - 1
+MAX_LANE_COUNT = (1 << (LANE_BITS - 1)) - 1
+_LANE_BYTES = len(CARD_TYPES)
+_GUARD = int.from_bytes(bytes([1 << (LANE_BITS - 1)]) * _LANE_BYTES, "little")
+
+EMPTY = 0
+
+
+def lane_shift(card_type: str) -> int:
+    return CARD_INDEX[card_type] * LANE_BITS
+
+
+def card_unit(card_type: str) -> int:
+    """Return the packed value of exactly one card of card_type."""
+
+    return 1 << lane_shift(card_type)
+
+
+def pack_cards(cards: dict[str, Any]) -> int:
+    """Pack a CardCountMap, rejecting unknown card types and bad counts with ValueError."""
+
+    packed = 0
+    for card_type, raw_count in cards.items():
+        count = int(raw_count)
+        if count == 0:
+            continue
+        idx = CARD_INDEX.get(str(card_type))
+        if idx is None or count < 0 or count > MAX_LANE_COUNT:
+            raise ValueError(f"invalid card count: {card_type}={raw_count}")
+        packed += count << (idx * LANE_BITS)
+    return packed
+
+
+def unpack_cards(packed: int) -> dict[str, int]:
+    """Expand a packed card map into a CardCountMap in CARD_TYPES order."""
+
+    lanes = packed.to_bytes(_LANE_BYTES, "little")
+    return {CARD_TYPES[idx]: count for idx, count in enumerate(lanes) if count}
+
+
+def card_count(packed: int, card_type: str) -> int:
+    return (packed >> lane_shift(card_type)) & LANE_MASK
+
+
+def cards_total(packed: int) -> int:
+    return sum(packed.to_bytes(_LANE_BYTES, "little"))
+
+
+def cards_contain(packed: int, subset: int) -> bool:
+    """Return True when every lane of subset is <= the same lane of packed."""
+
+    return ((packed | _GUARD) - subset) & _GUARD == _GUARD
+
+
+def cards_subtract(packed: int, subset: int) -> int:
+    """Remove subset from packed; raise ValueError when it is not contained."""
+
+    if not cards_contain(packed, subset):
+        raise ValueError("card map is not contained")
+    return packed - subset
+
+
+def clamp_lanes(packed: int, cap: int) -> int:
+    lanes = packed.to_bytes(_LANE_BYTES, "little")
+    return int.from_bytes(bytes(min(count, cap) for count in lanes), "little")
+
+
+def types_mask(card_types: tuple[str, ...] | list[str]) -> int:
+    """Return a mask selecting whole lanes for card_types."""
+
+    mask = 0
+    for card_type in card_types:
+        mask |= LANE_MASK << lane_shift(card_type)
+    return mask
+
+
+DECK_PACKED: int = pack_cards(DECK_TEMPLATE)
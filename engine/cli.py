@@ -7,6 +7,17 @@ import time
 from typing import Any, Callable
 
 from engine.core import XianqiGameEngine
+from engine.action_space import describe_action
+from engine.game_logger import ACTION_LOG_FORMATS, STATE_LOG_FORMATS
+from engine.replay import (
+    ReplayAction,
+    ReplayOverride,
+    encode_replay,
+    read_replay,
+    replay_from_log_dir,
+    run_replay,
+    write_replay,
+)
 
 CARD_NAME_MAP: dict[str, str] = {
     "R_SHI": "红士",
@@ -241,6 +252,8 @@ def run_cli(
     input_fn: Callable[[str], str] = input,
     output_fn: Callable[[str], None] = print,
     log_path: str | None = None,
+    action_log_format: str | None = None,
+    state_log_format: str | None = None,
 ) -> int:
     """Run one local game loop by rotating seats according to turn.current_seat."""
 
@@ -250,12 +263,32 @@ def run_cli(
     if log_path is not None:
         output_fn(f"log_path={log_path}")
 
-    engine = XianqiGameEngine()
     init_config: dict[str, Any] = {"player_count": 3}
     if log_path is not None:
         init_config["log_path"] = log_path
-    engine.init_game(init_config, rng_seed=actual_seed)
+        if action_log_format is not None:
+            init_config["action_log_format"] = action_log_format
+        if state_log_format is not None:
+            init_config["state_log_format"] = state_log_format
+    engine = XianqiGameEngine()
+    try:
+        engine.init_game(init_config, rng_seed=actual_seed)
+        return _run_game_loop(engine, input_fn, output_fn)
+    finally:
+        _close_engine(engine)
+
+
+def _close_engine(engine: Any) -> None:
+    close = getattr(engine, "close", None)
+    if callable(close):
+        close()
+
 
+def _run_game_loop(
+    engine: XianqiGameEngine,
+    input_fn: Callable[[str], str],
+    output_fn: Callable[[str], None],
+) -> int:
     while True:
         public_state = engine.get_public_state()
         phase = str(public_state.get("phase"))
@@ -356,12 +389,119 @@ def run_cli(
             continue
 
 
+def _render_replay_action(action: ReplayAction) -> str:
+    described = describe_action(action.action_id)
+    action_type = str(described["type"])
+    action_name = ACTION_NAME_MAP.get(action_type, action_type)
+    if action_type == "PLAY":
+        return f"{action_name} {_format_hand(described['payload_cards'])}"
+    if action_type == "COVER":
+        return f"{action_name} {_format_hand(action.cover_list or {})}"
+    return action_name
+
+
+def run_replay_cli(
+    replay_path: str,
+    verify: bool = False,
+    log_config: dict[str, Any] | None = None,
+    output_fn: Callable[[str], None] = print,
+) -> int:
+    """Rebuild every version of an .xqr replay; log_config re-creates its log directory."""
+
+    try:
+        replay = read_replay(replay_path)
+    except (OSError, ValueError) as exc:
+        _emit_error(output_fn, exc)
+        return 1
+    output_fn(f"replay={replay_path} engine_version={replay.engine_version} seed={replay.seed}")
+    output_fn(f"actions={len(replay.actions)}")
+    if replay.overrides:
+        output_fn(f"overrides={len(replay.overrides)}")
+
+    def on_version(version: int, state: dict[str, Any], action: ReplayAction | ReplayOverride | None) -> None:
+        if action is None:
+            output_fn(f"v{version} 开局 先手=seat{state['turn']['current_seat']}")
+            return
+        if isinstance(action, ReplayOverride):
+            output_fn(f"v{version} 强制切换 -> phase={state['phase']} reason={action.reason}")
+            return
+        output_fn(f"v{version} {_render_replay_action(action)} -> phase={state['phase']}")
+
+    try:
+        engine = run_replay(replay, config=log_config, on_version=on_version, verify=verify)
+    except ValueError as exc:
+        _emit_error(output_fn, exc)
+        return 1
+    with engine:
+        if engine.get_public_state()["phase"] == "settlement":
+            output_fn(render_settlement_view(engine.settle()["settlement"]))
+    if verify:
+        output_fn("verify: ok")
+    return 0
+
+
+def export_replay_cli(
+    log_path: str,
+    output_path: str,
+    seed: int | None = None,
+    output_fn: Callable[[str], None] = print,
+) -> int:
+    """Pack a log directory into an .xqr replay file."""
+
+    try:
+        replay = replay_from_log_dir(log_path, seed=seed)
+    except (OSError, ValueError) as exc:
+        _emit_error(output_fn, exc)
+        return 1
+    write_replay(output_path, replay)
+    output_fn(f"replay={output_path} actions={len(replay.actions)} bytes={len(encode_replay(replay))}")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Run local Xianqi engine CLI.")
     parser.add_argument("--seed", type=int, default=None, help="Optional random seed for reproducible runs.")
     parser.add_argument("--log-path", type=str, default=None, help="Optional directory for lightweight log files.")
+    parser.add_argument(
+        "--action-log-format",
+        choices=ACTION_LOG_FORMATS,
+        default=None,
+        help="Action log format under --log-path: json (legacy array) or jsonl (append-only).",
+    )
+    parser.add_argument(
+        "--state-log-format",
+        choices=STATE_LOG_FORMATS,
+        default=None,
+        help="State log format under --log-path: files (state_v*.json) or delta (keyframes + diffs).",
+    )
+    parser.add_argument("--replay", type=str, default=None, help="Rebuild the game stored in an .xqr replay file.")
+    parser.add_argument("--verify", action="store_true", help="With --replay: check versions and the final state digest.")
+    parser.add_argument(
+        "--export-replay",
+        type=str,
+        default=None,
+        help="Write the game under --log-path to this .xqr file (pass --seed to keep it importable).",
+    )
     args = parser.parse_args(argv)
-    return run_cli(seed=args.seed, log_path=args.log_path)
+    log_config: dict[str, Any] = {}
+    if args.action_log_format is not None:
+        log_config["action_log_format"] = args.action_log_format
+    if args.state_log_format is not None:
+        log_config["state_log_format"] = args.state_log_format
+    if args.export_replay is not None:
+        if args.log_path is None:
+            parser.error("--export-replay requires --log-path")
+        return export_replay_cli(args.log_path, args.export_replay, seed=args.seed)
+    if args.replay is not None:
+        if args.log_path is not None:
+            log_config["log_path"] = args.log_path
+        return run_replay_cli(args.replay, verify=args.verify, log_config=log_config or None)
+    return run_cli(
+        seed=args.seed,
+        log_path=args.log_path,
+        action_log_format=args.action_log_format,
+        state_log_format=args.state_log_format,
+    )
 
 
 if __name__ == "__main__":
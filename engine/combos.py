@@ -2,22 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Any
-
-CARD_POWER: dict[str, int] = {
-    "R_SHI": 9,
-    "B_SHI": 8,
-    "R_XIANG": 7,
-    "B_XIANG": 6,
-    "R_MA": 5,
-    "B_MA": 4,
-    "R_CHE": 3,
-    "B_CHE": 2,
-    "R_GOU": 3,
-    "B_GOU": 2,
-    "R_NIU": 1,
-    "B_NIU": 0,
-}
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, NamedTuple
+
+from engine.cards import CARD_POWER, CARD_TYPES, clamp_lanes, pack_cards, unpack_cards
+
+# Combos only depend on whether a card type has >=1, >=2 or >=3 copies, so the
+# table key is the packed hand with every lane clamped to 3.
+_TABLE_COUNT_CAP = 3
+COMBO_TABLE_MAXSIZE = 8192
+
+
+class Combo(NamedTuple):
+    """Immutable combo entry stored in the memoized combo table."""
+
+    kind: int
+    power: int
+    cards: tuple[tuple[str, int], ...]
+    packed: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "power": self.power, "cards": dict(self.cards)}
 
 
 def _positive_hand(hand: dict[str, int]) -> dict[str, int]:
@@ -95,12 +101,7 @@ def _triple_combos(hand: dict[str, int]) -> list[dict[str, Any]]:
     return combos
 
 
-def enumerate_combos(
-    hand: dict[str, int],
-    round_kind: int | None = None,
-) -> list[dict[str, Any]]:
-    """Enumerate legal play combos from a hand in deterministic order."""
-
+def _build_combos(hand: dict[str, int], round_kind: int | None) -> list[dict[str, Any]]:
     normalized = _positive_hand(hand)
     combos = _single_combos(normalized) + _pair_combos(normalized) + _triple_combos(normalized)
 
@@ -109,3 +110,155 @@ def enumerate_combos(
 
     combos.sort(key=lambda combo: (_combo_kind(combo), -int(combo["power"]), _combo_signature(combo)))
     return combos
+
+
+@lru_cache(maxsize=COMBO_TABLE_MAXSIZE)
+def _lookup_combo_table(packed: int, round_kind: int | None) -> tuple[Combo, ...]:
+    combos = _build_combos(unpack_cards(packed), round_kind)
+    return tuple(
+        Combo(
+            kind=_combo_kind(combo),
+            power=int(combo["power"]),
+            cards=_combo_signature(combo),
+            packed=pack_cards(combo["cards"]),
+        )
+        for combo in combos
+    )
+
+
+def combo_table_packed(packed_hand: int, round_kind: int | None = None) -> tuple[Combo, ...]:
+    """Return the memoized, pre-sorted immutable combo tuple for a packed hand."""
+
+    return _lookup_combo_table(clamp_lanes(packed_hand, _TABLE_COUNT_CAP), round_kind)
+
+
+def combo_table(hand: dict[str, int], round_kind: int | None = None) -> tuple[Combo, ...]:
+    """Return the memoized, pre-sorted immutable combo tuple for a hand."""
+
+    return combo_table_packed(pack_cards(_positive_hand(hand)), round_kind)
+
+
+def combo_table_info() -> dict[str, int]:
+    """Return hit/miss counters and size of the memoized combo table."""
+
+    info = _lookup_combo_table.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": int(info.maxsize or 0),
+    }
+
+
+def clear_combo_table() -> None:
+    """Drop every memoized combo table entry and reset counters."""
+
+    _lookup_combo_table.cache_clear()
+
+
+def enumerate_combos(
+    hand: dict[str, int],
+    round_kind: int | None = None,
+) -> list[dict[str, Any]]:
+    """Enumerate legal play combos from a hand in deterministic order."""
+
+    return [combo.to_dict() for combo in combo_table(hand, round_kind)]
+
+
+def _bounded_multisets(counts: tuple[tuple[str, int], ...], size: int) -> list[dict[str, int]]:
+    """Return every distinct multiset of size cards drawn from (card_type, available) lanes."""
+
+    if size == 0:
+        return [{}]
+    if not counts or sum(available for _, available in counts) < size:
+        return []
+    (card_type, available), rest = counts[0], counts[1:]
+    picked: list[dict[str, int]] = []
+    for take in range(min(available, size), -1, -1):
+        for tail in _bounded_multisets(rest, size - take):
+            picked.append({card_type: take, **tail} if take else tail)
+    return picked
+
+
+def _loose_types(hand: dict[str, int]) -> set[str]:
+    """Return card types of hand that cannot be part of any pair, dog pair or triple."""
+
+    loose = {card_type for card_type, count in hand.items() if count == 1}
+    if hand.get("R_GOU", 0) and hand.get("B_GOU", 0):
+        loose -= {"R_GOU", "B_GOU"}
+    return loose
+
+
+def _undominated_loose(loose: list[str], size: int) -> list[dict[str, int]]:
+    """Return the size-subsets of loose single cards made only of the weakest powers."""
+
+    if size == 0:
+        return [{}]
+    if size > len(loose):
+        return []
+    powers = sorted(CARD_POWER[card_type] for card_type in loose)
+    threshold = powers[size - 1]
+    forced = [card_type for card_type in loose if CARD_POWER[card_type] < threshold]
+    tied = [card_type for card_type in loose if CARD_POWER[card_type] == threshold]
+    return [
+        {card_type: 1 for card_type in forced + list(extra)}
+        for extra in combinations(tied, size - len(forced))
+    ]
+
+
+def _cover_sort_key(cover: dict[str, int]) -> tuple[int, tuple[tuple[str, int], ...]]:
+    power = sum(CARD_POWER[card_type] * count for card_type, count in cover.items())
+    return power, tuple(sorted(cover.items()))
+
+
+@lru_cache(maxsize=COMBO_TABLE_MAXSIZE)
+def _lookup_cover_table(
+    packed: int,
+    required_count: int,
+    prune_dominated: bool,
+) -> tuple[tuple[tuple[str, int], ...], ...]:
+    hand = unpack_cards(packed)
+    lanes = tuple((card_type, count) for card_type, count in hand.items())
+    if not prune_dominated:
+        covers = _bounded_multisets(lanes, required_count)
+    else:
+        loose = _loose_types(hand)
+        grouped = tuple((card_type, count) for card_type, count in lanes if card_type not in loose)
+        loose_cards = [card_type for card_type, _ in lanes if card_type in loose]
+        covers = []
+        for grouped_size in range(required_count + 1):
+            loose_covers = _undominated_loose(loose_cards, required_count - grouped_size)
+            if not loose_covers:
+                continue
+            for grouped_cover in _bounded_multisets(grouped, grouped_size):
+                covers.extend({**grouped_cover, **loose_cover} for loose_cover in loose_covers)
+    covers.sort(key=_cover_sort_key)
+    return tuple(tuple(sorted(cover.items())) for cover in covers)
+
+
+def cover_table_packed(
+    packed_hand: int,
+    required_count: int,
+    prune_dominated: bool = False,
+) -> tuple[tuple[tuple[str, int], ...], ...]:
+    """Return the memoized distinct cover choices of a packed hand, weakest total power first."""
+
+    return _lookup_cover_table(packed_hand, int(required_count), bool(prune_dominated))
+
+
+def enumerate_covers(
+    hand: dict[str, int],
+    required_count: int,
+    prune_dominated: bool = False,
+) -> list[dict[str, int]]:
+    """Enumerate each distinct multiset of required_count cards a COVER may give up.
+
+    With ``prune_dominated`` a cover is dropped when another one gives up
+    weaker single cards instead: cards that cannot join any pair, dog pair
+    or triple of hand are interchangeable apart from their power, so only
+    the weakest of them are ever worth covering. Cards that can still form
+    a multi-card combo are never pruned against each other.
+    """
+
+    packed = pack_cards(_positive_hand(hand))
+    return [dict(cover) for cover in cover_table_packed(packed, required_count, prune_dominated)]
@@ -5,21 +5,66 @@ from __future__ import annotations
 from collections import Counter
 from copy import deepcopy
 import random
-from typing import Any
+import weakref
+from typing import Any, Iterator
 
+from engine.action_space import action_index_for, legal_action_mask as action_space_legal_action_mask
 from engine.actions import get_legal_actions as actions_get_legal_actions
-from engine.combos import enumerate_combos
-from engine.game_logger import GameLogger
-from engine.reducer import ReducerDeps, reduce_apply_action
+from engine.cards import DECK_TEMPLATE, pack_cards, types_mask
+from engine.combos import combo_table_packed, enumerate_covers
+from engine.game_logger import (
+    ACTION_LOG_FORMATS,
+    DEFAULT_KEYFRAME_INTERVAL,
+    DEFAULT_LOG_QUEUE_SIZE,
+    LOG_OVERFLOW_POLICIES,
+    LOG_WRITERS,
+    STATE_LOG_FORMATS,
+    AsyncGameLogger,
+    GameLogger,
+)
+from engine.indexes import INDEX_KEY, ensure_state_index, get_state_hash
+from engine.reducer import ReducerDeps, fork_state, reduce_apply_action
 from engine.settlements import settle_state
 from engine.serializer import (
+    ProjectionCache,
     dump_state as serializer_dump_state,
+    freeze_projection,
     get_private_state as serializer_get_private_state,
     get_public_state as serializer_get_public_state,
     load_state as serializer_load_state,
 )
 
 
+PHASES: tuple[str, ...] = ("init", "buckle_flow", "in_round", "settlement")
+DEFAULT_HISTORY_SIZE = 64
+
+
+def build_initial_state(hands: list[dict[str, int]], first_seat: int) -> dict[str, Any]:
+    """Return the version-1 state ``init_game`` produces for a given deal."""
+
+    state: dict[str, Any] = {
+        "version": 1,
+        "phase": "buckle_flow",
+        "players": [{"seat": seat, "hand": dict(hand)} for seat, hand in enumerate(hands)],
+        "turn": {
+            "current_seat": int(first_seat),
+            "round_index": 0,
+            "round_kind": 0,
+            "last_combo": None,
+            "plays": [],
+        },
+        "pillar_groups": [],
+        "reveal": {
+            "buckler_seat": None,
+            "active_revealer_seat": None,
+            "pending_order": [],
+            "relations": [],
+        },
+    }
+    ensure_state_index(state)
+    return state
+
+
 class XianqiGameEngine:
     """Stateful game engine facade.
 
@@ -27,48 +72,138 @@ class XianqiGameEngine:
     and a minimal playable transition path for tests.
     """
 
-    _DECK_TEMPLATE: dict[str, int] = {
-        "R_SHI": 2,
-        "B_SHI": 2,
-        "R_XIANG": 2,
-        "B_XIANG": 2,
-        "R_MA": 2,
-        "B_MA": 2,
-        "R_CHE": 2,
-        "B_CHE": 2,
-        "R_GOU": 1,
-        "B_GOU": 1,
-        "R_NIU": 3,
-        "B_NIU": 3,
-    }
+    _DECK_TEMPLATE: dict[str, int] = DECK_TEMPLATE
+    _SHI_XIANG_MASK: int = types_mask(("R_SHI", "B_SHI", "R_XIANG", "B_XIANG"))
 
     def __init__(self) -> None:
         self._state: dict[str, Any] | None = None
-        self._logger: GameLogger | None = None
+        self._logger: GameLogger | AsyncGameLogger | None = None
+        self._logger_finalizer: weakref.finalize | None = None
+        self._projection_version: int | None = None
+        self._public_projection: dict[str, Any] | None = None
+        self._private_projections: dict[int, dict[str, Any]] = {}
+        self._legal_actions: dict[int, dict[str, Any]] = {}
+        self._legal_action_masks: dict[int, int] = {}
+        self._shared_projections: ProjectionCache = {}
+        self._history_size = DEFAULT_HISTORY_SIZE
+        self._history: dict[int, dict[str, Any]] = {}
 
     def load_state(self, state: dict[str, Any]) -> None:
         self._state = serializer_load_state(state)
+        self._shared_projections = {}
+        self._history = {}
+        self._invalidate_projections()
+        self._record_version()
 
     def dump_state(self) -> dict[str, Any]:
         return serializer_dump_state(self._state)
 
+    def _invalidate_projections(self) -> None:
+        self._projection_version = None
+        self._public_projection = None
+        self._private_projections = {}
+        self._legal_actions = {}
+        self._legal_action_masks = {}
+
+    def _sync_projection_version(self, state: dict[str, Any]) -> None:
+        version = int(state.get("version", 0))
+        if self._projection_version != version:
+            self._invalidate_projections()
+            self._projection_version = version
+
     def _require_state(self) -> dict[str, Any]:
         if self._state is None:
             raise RuntimeError("engine state is not initialized")
         return self._state
 
-    @staticmethod
-    def _is_black_hand(hand: dict[str, int]) -> bool:
-        shi_xiang = (
-            int(hand.get("R_SHI", 0))
-            + int(hand.get("B_SHI", 0))
-            + int(hand.get("R_XIANG", 0))
-            + int(hand.get("B_XIANG", 0))
+    def _record_version(self) -> None:
+        # Versions share unchanged subtrees (see ``reducer.fork_state``), so
+        # each retained entry costs only the fields its transition changed.
+        if self._history_size <= 0 or self._state is None:
+            return
+        version = int(self._state.get("version", 0))
+        self._history.pop(version, None)
+        self._history[version] = self._state
+        while len(self._history) > self._history_size:
+            del self._history[next(iter(self._history))]
+
+    def _state_at(self, version: int | None) -> dict[str, Any] | None:
+        state = self._state
+        if version is None or state is None or int(version) == int(state.get("version", 0)):
+            return state
+        past = self._history.get(int(version))
+        if past is None:
+            raise ValueError("ENGINE_VERSION_UNAVAILABLE")
+        return past
+
+    def history_versions(self) -> list[int]:
+        """Return the versions still retained in history, oldest first."""
+
+        return list(self._history)
+
+    def changes_since(self, version: int) -> Iterator[dict[str, Any]]:
+        """Yield ``{"version", "public_state"}`` for each retained version after version.
+
+        version must itself still be retained (or be the current version),
+        so a client at version can catch up without gaps; otherwise
+        ``ENGINE_VERSION_UNAVAILABLE`` is raised before anything is yielded.
+        """
+
+        self._state_at(version)
+        later = [known for known in self._history if known > int(version)]
+        return (
+            {"version": known, "public_state": self.get_public_state(version=known)}
+            for known in later
         )
-        return shi_xiang == 0
+
+    @classmethod
+    def _is_black_hand(cls, hand: dict[str, int]) -> bool:
+        return pack_cards(hand) & cls._SHI_XIANG_MASK == 0
 
     def get_legal_actions(self, seat: int) -> dict[str, Any]:
-        return actions_get_legal_actions(self._state, seat)
+        """Return the cached read-only legal actions of seat for the current version.
+
+        The same result is shared by apply_action, the reducer and backend
+        response builders until the next state transition.
+        """
+
+        state = self._state
+        if state is None:
+            return actions_get_legal_actions(state, seat)
+        self._sync_projection_version(state)
+        seat_key = int(seat)
+        legal_actions = self._legal_actions.get(seat_key)
+        if legal_actions is None:
+            legal_actions = freeze_projection(actions_get_legal_actions(state, seat))
+            self._legal_actions[seat_key] = legal_actions
+        return legal_actions
+
+    def get_legal_action_mask(self, seat: int) -> int:
+        """Return legal actions of seat as a bitmask over ``engine.action_space`` ids."""
+
+        state = self._state
+        if state is None:
+            return 0
+        self._sync_projection_version(state)
+        seat_key = int(seat)
+        mask = self._legal_action_masks.get(seat_key)
+        if mask is None:
+            mask = action_space_legal_action_mask(state, seat_key)
+            self._legal_action_masks[seat_key] = mask
+        return mask
+
+    def get_cover_choices(self, seat: int, prune_dominated: bool = False) -> list[dict[str, int]]:
+        """Return the distinct cover lists seat may submit with its COVER action.
+
+        Empty unless COVER is currently legal for seat; see
+        ``combos.enumerate_covers`` for ``prune_dominated``.
+        """
+
+        for action in self.get_legal_actions(seat)["actions"]:
+            if action.get("type") == "COVER":
+                hand = self._require_state()["players"][int(seat)]["hand"]
+                return enumerate_covers(hand, int(action["required_count"]), prune_dominated)
+        return []
 
     def _init_deck(self) -> list[str]:
         deck: list[str] = []
@@ -90,21 +225,103 @@ class XianqiGameEngine:
             raise ValueError("ENGINE_INVALID_CONFIG")
         return log_path
 
-    def _setup_logger(self, log_path: str | None) -> None:
+    @staticmethod
+    def _parse_history_size(config: dict[str, Any]) -> int:
+        try:
+            history_size = int(config.get("history_size", DEFAULT_HISTORY_SIZE))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("ENGINE_INVALID_CONFIG") from exc
+        if history_size < 0:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        return history_size
+
+    @staticmethod
+    def _parse_logger_options(config: dict[str, Any]) -> dict[str, Any]:
+        action_log_format = str(config.get("action_log_format", "json"))
+        state_log_format = str(config.get("state_log_format", "files"))
+        log_writer = str(config.get("log_writer", "sync"))
+        if (
+            action_log_format not in ACTION_LOG_FORMATS
+            or state_log_format not in STATE_LOG_FORMATS
+            or log_writer not in LOG_WRITERS
+        ):
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        try:
+            keyframe_interval = int(config.get("state_keyframe_interval", DEFAULT_KEYFRAME_INTERVAL))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("ENGINE_INVALID_CONFIG") from exc
+        if keyframe_interval <= 0:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        options: dict[str, Any] = {
+            "action_format": action_log_format,
+            "state_format": state_log_format,
+            "keyframe_interval": keyframe_interval,
+        }
+        if log_writer == "sync":
+            return options
+        overflow = str(config.get("log_overflow", "block"))
+        try:
+            queue_size = int(config.get("log_queue_size", DEFAULT_LOG_QUEUE_SIZE))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("ENGINE_INVALID_CONFIG") from exc
+        if overflow not in LOG_OVERFLOW_POLICIES or queue_size <= 0:
+            raise ValueError("ENGINE_INVALID_CONFIG")
+        options.update(
+            {
+                "queue_size": queue_size,
+                "overflow": overflow,
+                "flush_on_settle": bool(config.get("log_flush_on_settle", True)),
+            }
+        )
+        return options
+
+    def _setup_logger(self, log_path: str | None, options: dict[str, Any] | None = None) -> None:
+        self.close()
         if log_path is None:
-            self._logger = None
             return
-        logger = GameLogger(log_path)
+        options = options or {}
+        logger_class = AsyncGameLogger if "overflow" in options else GameLogger
+        logger = logger_class(log_path, **options)
         logger.reset()
         self._logger = logger
+        # Engines dropped without close() still flush at collection or exit.
+        self._logger_finalizer = weakref.finalize(self, logger.close)
 
-    def _log_state_snapshot(self, state: dict[str, Any]) -> None:
+    def close(self) -> None:
+        """Flush and close the game log (joining the async writer); the state stays usable.
+
+        Re-raises a pending async writer error. Safe to call more than once.
+        """
+
+        logger, self._logger = self._logger, None
+        if self._logger_finalizer is not None:
+            self._logger_finalizer.detach()
+            self._logger_finalizer = None
+        if logger is not None:
+            logger.close()
+
+    def __enter__(self) -> XianqiGameEngine:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def flush_logs(self) -> None:
+        """Block until every log record issued so far is on disk."""
+
+        if self._logger is not None:
+            self._logger.sync()
+
+    def _log_state_snapshot(self) -> None:
         if self._logger is None:
             return
-        public_state = serializer_get_public_state(state)
-        private_states = [serializer_get_private_state(state, seat) for seat in range(3)]
+        state = self._require_state()
+        public_state = self.get_public_state()
+        private_states = [self.get_private_state(seat) for seat in range(3)]
+        # Versions are never edited once replaced (see ``reducer.fork_state``),
+        # so the live tree can be handed to the writer without a copy.
         snapshot_payload = {
-            "global": deepcopy(state),
+            "global": {key: value for key, value in state.items() if key != INDEX_KEY},
             "public": public_state,
             "private_states": private_states,
         }
@@ -114,7 +331,9 @@ class XianqiGameEngine:
         player_count = int(config.get("player_count", 0))
         if player_count != 3:
             raise ValueError("ENGINE_INVALID_CONFIG")
-        self._setup_logger(self._parse_log_path(config))
+        history_size = self._parse_history_size(config)
+        self._setup_logger(self._parse_log_path(config), self._parse_logger_options(config))
+        self._history_size = history_size
         base_seed = int(rng_seed) if rng_seed is not None else random.SystemRandom().randrange(0, 1 << 63)
         effective_seed = base_seed
         while True:
@@ -135,27 +354,13 @@ class XianqiGameEngine:
 
         first_seat = int(rng.randint(0, 2))
 
-        self._state = {
-            "version": 1,
-            "phase": "buckle_flow",
-            "players": players,
-            "turn": {
-                "current_seat": first_seat,
-                "round_index": 0,
-                "round_kind": 0,
-                "last_combo": None,
-                "plays": [],
-            },
-            "pillar_groups": [],
-            "reveal": {
-                "buckler_seat": None,
-                "active_revealer_seat": None,
-                "pending_order": [],
-                "relations": [],
-            },
-        }
+        self._state = build_initial_state([player["hand"] for player in players], first_seat)
+        self._shared_projections = {}
+        self._history = {}
+        self._invalidate_projections()
+        self._record_version()
         new_state = self.dump_state()
-        self._log_state_snapshot(new_state)
+        self._log_state_snapshot()
         return {"new_state": new_state}
 
     def apply_action(
@@ -171,7 +376,7 @@ class XianqiGameEngine:
         legal_actions = self.get_legal_actions(current_seat) if current_seat >= 0 else {"seat": -1, "actions": []}
         action_list = legal_actions.get("actions", []) if isinstance(legal_actions, dict) else []
         selected_action = (
-            deepcopy(action_list[action_idx])
+            action_list[action_idx]
             if isinstance(action_idx, int)
             and 0 <= action_idx < len(action_list)
             and isinstance(action_list[action_idx], dict)
@@ -180,24 +385,30 @@ class XianqiGameEngine:
 
         deps: ReducerDeps = {
             "get_legal_actions": self.get_legal_actions,
-            "enumerate_combos": enumerate_combos,
+            "combo_table": combo_table_packed,
         }
-        self._state = reduce_apply_action(
-            state=state,
-            action_idx=action_idx,
-            cover_list=cover_list,
-            client_version=client_version,
-            deps=deps,
-        )
+        # The new version shares every unchanged subtree with the old one,
+        # which is left intact.
+        try:
+            self._state = reduce_apply_action(
+                state=fork_state(state),
+                action_idx=action_idx,
+                cover_list=cover_list,
+                client_version=client_version,
+                deps=deps,
+            )
+        finally:
+            self._invalidate_projections()
+        self._record_version()
         new_state = self.dump_state()
-        self._log_state_snapshot(new_state)
+        self._log_state_snapshot()
         if self._logger is not None:
             action_seat = legal_actions.get("seat", current_seat) if isinstance(legal_actions, dict) else current_seat
             self._logger.append_action(
                 {
                     "version": old_version,
                     "seat": int(action_seat),
-                    "legal_actions": deepcopy(action_list),
+                    "legal_actions": action_list,
                     "taken_action": {
                         "action_idx": int(action_idx),
                         "action_type": selected_action.get("type"),
@@ -207,13 +418,33 @@ class XianqiGameEngine:
             )
         return {"new_state": new_state}
 
+    def apply_canonical_action(
+        self,
+        action_id: int,
+        cover_list: dict[str, int] | None = None,
+        client_version: int | None = None,
+    ) -> dict[str, Any]:
+        """Apply an ``engine.action_space`` action id for the current seat."""
+
+        state = self._require_state()
+        current_seat_raw = (state.get("turn") or {}).get("current_seat")
+        if current_seat_raw is None:
+            raise ValueError("ENGINE_INVALID_PHASE")
+        seat = int(current_seat_raw)
+        if not self.get_legal_action_mask(seat) >> int(action_id) & 1:
+            raise ValueError("ENGINE_INVALID_ACTION")
+        action_idx = action_index_for(self.get_legal_actions(seat), int(action_id))
+        return self.apply_action(action_idx=action_idx, cover_list=cover_list, client_version=client_version)
+
     def settle(self) -> dict[str, Any]:
         state = self._require_state()
         old_version = int(state.get("version", 0))
         output = settle_state(state)
         self._state = output["new_state"]
+        self._invalidate_projections()
+        self._record_version()
         new_state = self.dump_state()
-        self._log_state_snapshot(new_state)
+        self._log_state_snapshot()
         if self._logger is not None:
             self._logger.write_settlement(
                 {
@@ -227,8 +458,74 @@ class XianqiGameEngine:
             "settlement": output["settlement"],
         }
 
-    def get_public_state(self) -> dict[str, Any]:
-        return serializer_get_public_state(self._state)
+    def force_phase(self, phase: str, reason: str | None = None) -> int:
+        """Move the game to phase outside the rules and return the new version.
+
+        For hosts that must end or unstick a game (for example forcing
+        settlement when the seat to act has no legal action). Only ``phase``
+        and ``version`` change; the new state shares everything else with the
+        previous one. The override is appended to the log's ``override.jsonl``
+        next to the new version's state snapshot. Forcing the phase the game
+        is already in is a no-op that returns the current version.
+        """
+
+        if phase not in PHASES:
+            raise ValueError("ENGINE_INVALID_PHASE")
+        state = self._require_state()
+        old_version = int(state.get("version", 0))
+        old_phase = state.get("phase")
+        if phase == old_phase:
+            return old_version
+        self._state = {**state, "phase": phase, "version": old_version + 1}
+        self._invalidate_projections()
+        self._record_version()
+        if self._logger is not None:
+            self._log_state_snapshot()
+            self._logger.append_override(
+                {
+                    "from_version": old_version,
+                    "to_version": old_version + 1,
+                    "from_phase": old_phase,
+                    "to_phase": phase,
+                    "reason": reason,
+                }
+            )
+        return old_version + 1
+
+    def state_hash(self) -> int:
+        """Return the 64-bit Zobrist hash of the current state (see ``engine.zobrist``)."""
+
+        return get_state_hash(self._require_state())
+
+    def get_public_state(self, version: int | None = None) -> dict[str, Any]:
+        """Return the read-only public projection of the current or a retained version.
+
+        Past versions come from the bounded history (``history_size`` in the
+        ``init_game`` config); an expired one raises ``ENGINE_VERSION_UNAVAILABLE``.
+        """
+
+        state = self._state_at(version)
+        if state is None:
+            return serializer_get_public_state(state)
+        if state is not self._state:
+            return freeze_projection(serializer_get_public_state(state, self._shared_projections))
+        self._sync_projection_version(state)
+        if self._public_projection is None:
+            self._public_projection = freeze_projection(serializer_get_public_state(state, self._shared_projections))
+        return self._public_projection
+
+    def get_private_state(self, seat: int, version: int | None = None) -> dict[str, Any]:
+        """Return the read-only private projection of seat for the current or a retained version."""
 
-    def get_private_state(self, seat: int) -> dict[str, Any]:
-        return serializer_get_private_state(self._state, seat)
+        state = self._state_at(version)
+        if state is None:
+            return serializer_get_private_state(state, seat)
+        if state is not self._state:
+            return freeze_projection(serializer_get_private_state(state, int(seat)))
+        self._sync_projection_version(state)
+        seat_key = int(seat)
+        projection = self._private_projections.get(seat_key)
+        if projection is None:
+            projection = freeze_projection(serializer_get_private_state(state, seat_key))
+            self._private_projections[seat_key] = projection
+        return projection
@@ -3,33 +3,109 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
-from typing import Any
+import queue
+import threading
+from typing import Any, IO, Iterator
+
+from engine.patches import apply_json_patch, diff_json
+
+ACTION_LOG_FORMATS: tuple[str, ...] = ("json", "jsonl")
+LEGACY_ACTION_FILE = "action.json"
+JSONL_ACTION_FILE = "action.jsonl"
+DEFAULT_FSYNC_EVERY = 16
+LOG_WRITERS: tuple[str, ...] = ("sync", "async")
+LOG_OVERFLOW_POLICIES: tuple[str, ...] = ("block", "drop")
+DEFAULT_LOG_QUEUE_SIZE = 1024
+STATE_LOG_FORMATS: tuple[str, ...] = ("files", "delta")
+DELTA_STATE_FILE = "states.jsonl"
+DELTA_STATE_INDEX_FILE = "states.index.jsonl"
+OVERRIDE_FILE = "override.jsonl"
+DEFAULT_KEYFRAME_INTERVAL = 32
 
 
 class GameLogger:
-    """Persist per-version state snapshots and action traces to disk."""
+    """Persist per-version state snapshots and action traces to disk.
+
+    ``action_format="json"`` keeps the legacy ``action.json`` array, rewritten
+    on every append. ``action_format="jsonl"`` appends one JSON line per action
+    to ``action.jsonl`` through a kept-open handle: each line is flushed to the
+    OS immediately and fsync'ed every ``fsync_every`` records, on settlement
+    and on close, so a crash loses at most the trailing partial line.
 
-    def __init__(self, log_path: str | Path) -> None:
+    ``state_format="files"`` writes one ``state_v{N}.json`` per version.
+    ``state_format="delta"`` appends every version to ``states.jsonl`` as
+    either a full keyframe or an ``engine.patches`` diff against the previous
+    line, with a keyframe at least every ``keyframe_interval`` lines. Each
+    line gets a ``{version, offset, keyframe}`` entry in ``states.index.jsonl``
+    (byte offset into ``states.jsonl``) so readers can seek to one version.
+    """
+
+    def __init__(
+        self,
+        log_path: str | Path,
+        action_format: str = "json",
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        state_format: str = "files",
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        if action_format not in ACTION_LOG_FORMATS:
+            raise ValueError(f"unsupported action log format: {action_format}")
+        if state_format not in STATE_LOG_FORMATS:
+            raise ValueError(f"unsupported state log format: {state_format}")
         self._log_dir = Path(log_path)
+        self._action_format = action_format
+        self._state_format = state_format
+        self._fsync_every = max(1, int(fsync_every))
+        self._keyframe_interval = max(1, int(keyframe_interval))
+        self._streams: dict[str, IO[str]] = {}
+        self._unsynced: dict[str, int] = {}
+        self._offsets: dict[str, int] = {}
+        self._last_snapshot: Any = None
+        self._lines_since_keyframe = 0
+
+    @property
+    def action_format(self) -> str:
+        return self._action_format
+
+    @property
+    def state_format(self) -> str:
+        return self._state_format
 
     def reset(self) -> None:
+        self.close()
+        self._last_snapshot = None
+        self._lines_since_keyframe = 0
         self._log_dir.mkdir(parents=True, exist_ok=True)
 
         for state_file in self._log_dir.glob("state_v*.json"):
             if state_file.is_file():
                 state_file.unlink()
 
-        for filename in ("action.json", "settle.json"):
+        for filename in (
+            LEGACY_ACTION_FILE,
+            JSONL_ACTION_FILE,
+            DELTA_STATE_FILE,
+            DELTA_STATE_INDEX_FILE,
+            OVERRIDE_FILE,
+            "settle.json",
+        ):
             target = self._log_dir / filename
             if target.is_file():
                 target.unlink()
 
     def write_state(self, version: int, state: dict[str, Any]) -> None:
+        if self._state_format == "delta":
+            self._append_state_line(int(version), state)
+            return
         self._write_json(self._log_dir / f"state_v{int(version)}.json", state)
 
     def append_action(self, record: dict[str, Any]) -> None:
-        target = self._log_dir / "action.json"
+        if self._action_format == "jsonl":
+            self._append_line(JSONL_ACTION_FILE, record)
+            return
+        target = self._log_dir / LEGACY_ACTION_FILE
         current = self._read_json(target)
         if not isinstance(current, list):
             current = []
@@ -37,8 +113,72 @@ class GameLogger:
         self._write_json(target, current)
 
     def write_settlement(self, settlement_payload: dict[str, Any]) -> None:
+        self.sync()
         self._write_json(self._log_dir / "settle.json", settlement_payload)
 
+    def append_override(self, record: dict[str, Any]) -> None:
+        """Append one out-of-rules transition (``force_phase``) to ``override.jsonl`` and fsync it."""
+
+        self._append_line(OVERRIDE_FILE, record)
+        self.sync()
+
+    def sync(self) -> None:
+        """Flush and fsync pending JSONL records."""
+
+        for filename, stream in self._streams.items():
+            if self._unsynced.get(filename, 0) == 0:
+                continue
+            stream.flush()
+            os.fsync(stream.fileno())
+            self._unsynced[filename] = 0
+
+    def close(self) -> None:
+        if not self._streams:
+            return
+        self.sync()
+        for stream in self._streams.values():
+            stream.close()
+        self._streams = {}
+        self._unsynced = {}
+        self._offsets = {}
+
+    def _append_state_line(self, version: int, snapshot: dict[str, Any]) -> None:
+        previous = self._last_snapshot
+        keyframe = previous is None or self._lines_since_keyframe + 1 >= self._keyframe_interval
+        if keyframe:
+            line: dict[str, Any] = {"version": version, "keyframe": snapshot}
+            self._lines_since_keyframe = 0
+        else:
+            line = {"version": version, "patch": diff_json(previous, snapshot)}
+            self._lines_since_keyframe += 1
+        offset = self._append_line(DELTA_STATE_FILE, line)
+        # The index line follows its state line, so a crash can only leave the index short.
+        self._append_line(DELTA_STATE_INDEX_FILE, {"version": version, "offset": offset, "keyframe": keyframe})
+        self._last_snapshot = snapshot
+
+    def _append_line(self, filename: str, record: dict[str, Any]) -> int:
+        """Append one JSON line to filename and return its starting byte offset."""
+
+        stream = self._streams.get(filename)
+        if stream is None:
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+            path = self._log_dir / filename
+            stream = path.open("a", encoding="utf-8", newline="\n")
+            self._streams[filename] = stream
+            self._unsynced[filename] = 0
+            self._offsets[filename] = path.stat().st_size
+        encoded = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        offset = self._offsets[filename]
+        stream.write(encoded)
+        stream.flush()
+        self._offsets[filename] = offset + len(encoded.encode("utf-8"))
+        self._unsynced[filename] += 1
+        if self._unsynced[filename] >= self._fsync_every:
+            stream.flush()
+            os.fsync(stream.fileno())
+            self._unsynced[filename] = 0
+        return offset
+
     @staticmethod
     def _read_json(path: Path) -> Any:
         if not path.is_file():
@@ -54,3 +194,333 @@ class GameLogger:
             json.dump(payload, stream, ensure_ascii=False, indent=2)
             stream.write("\n")
         temp_path.replace(path)
+
+
+class AsyncGameLogger:
+    """GameLogger front-end that hands records to a background writer thread.
+
+    Calls only enqueue ``(method, args)`` on a bounded queue; one daemon thread
+    replays them in order on a wrapped ``GameLogger``. When the queue is full,
+    ``overflow="block"`` waits for room (backpressure) while ``overflow="drop"``
+    discards the state/action record and counts it in ``dropped``. Resets,
+    overrides and settlements are never dropped, and ``flush_on_settle`` makes
+    ``write_settlement`` wait until everything queued so far is on disk.
+    Writer errors are kept in ``last_error`` and re-raised only by the next
+    ``sync`` or ``close``, so they never surface from a move or a settlement
+    after the engine state has already changed.
+    """
+
+    def __init__(
+        self,
+        log_path: str | Path,
+        action_format: str = "json",
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        state_format: str = "files",
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+        overflow: str = "block",
+        flush_on_settle: bool = True,
+    ) -> None:
+        if overflow not in LOG_OVERFLOW_POLICIES:
+            raise ValueError(f"unsupported log overflow policy: {overflow}")
+        self._writer = GameLogger(
+            log_path,
+            action_format=action_format,
+            fsync_every=fsync_every,
+            state_format=state_format,
+            keyframe_interval=keyframe_interval,
+        )
+        self._overflow = overflow
+        self._flush_on_settle = bool(flush_on_settle)
+        self._queue: queue.Queue[tuple[str, tuple[Any, ...]] | None] = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.dropped = 0
+        self.last_error: BaseException | None = None
+        self._thread = threading.Thread(target=self._drain, name="xianqi-game-logger", daemon=True)
+        self._thread.start()
+
+    @property
+    def action_format(self) -> str:
+        return self._writer.action_format
+
+    @property
+    def state_format(self) -> str:
+        return self._writer.state_format
+
+    def reset(self) -> None:
+        self._put("reset", (), droppable=False)
+
+    def write_state(self, version: int, state: dict[str, Any]) -> None:
+        self._put("write_state", (version, state), droppable=True)
+
+    def append_action(self, record: dict[str, Any]) -> None:
+        self._put("append_action", (record,), droppable=True)
+
+    def append_override(self, record: dict[str, Any]) -> None:
+        self._put("append_override", (record,), droppable=False)
+
+    def write_settlement(self, settlement_payload: dict[str, Any]) -> None:
+        self._put("write_settlement", (settlement_payload,), droppable=False)
+        if self._flush_on_settle:
+            self._wait()
+
+    def sync(self) -> None:
+        """Block until every queued record is written and action lines are fsync'ed."""
+
+        self._wait()
+        self._raise_last_error()
+
+    def close(self) -> None:
+        """Write everything queued, close the files and stop the writer thread."""
+
+        if self._thread.is_alive():
+            self._put("close", (), droppable=False)
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_last_error()
+
+    def _wait(self) -> None:
+        if self._thread.is_alive():
+            self._put("sync", (), droppable=False)
+            self._queue.join()
+
+    def _raise_last_error(self) -> None:
+        error, self.last_error = self.last_error, None
+        if error is not None:
+            raise error
+
+    def _put(self, method: str, args: tuple[Any, ...], droppable: bool) -> None:
+        item = (method, args)
+        if droppable and self._overflow == "drop":
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+            return
+        self._queue.put(item)
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                method, args = item
+                getattr(self._writer, method)(*args)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.last_error = exc
+            finally:
+                self._queue.task_done()
+
+
+def _read_jsonl_lines(path: Path) -> list[str]:
+    """Return the non-empty lines of a JSONL file, dropping a torn trailing line."""
+
+    with path.open("r", encoding="utf-8") as stream:
+        lines = stream.read().split("\n")
+    # A crash mid-write can only leave the final line without its newline.
+    complete, tail = lines[:-1], lines[-1]
+    result = [line for line in complete if line.strip()]
+    if tail.strip():
+        try:
+            json.loads(tail)
+        except json.JSONDecodeError:
+            return result
+        result.append(tail)
+    return result
+
+
+def _decode_jsonl_line(path: Path, line_no: int, line: str, kind: str) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"corrupt {kind} log line {line_no}: {path}") from exc
+
+
+def _parse_jsonl_actions(path: Path) -> list[dict[str, Any]]:
+    return [
+        _decode_jsonl_line(path, line_no, line, "action")
+        for line_no, line in enumerate(_read_jsonl_lines(path), start=1)
+    ]
+
+
+def read_override_log(log_path: str | Path) -> list[dict[str, Any]]:
+    """Return the ``force_phase`` records of a log directory; ``[]`` when there are none."""
+
+    path = Path(log_path) / OVERRIDE_FILE
+    if not path.is_file():
+        return []
+    return [
+        _decode_jsonl_line(path, line_no, line, "override")
+        for line_no, line in enumerate(_read_jsonl_lines(path), start=1)
+    ]
+
+
+def read_action_log(log_path: str | Path) -> list[dict[str, Any]]:
+    """Return the action records of a log directory as one list.
+
+    Reads ``action.jsonl`` when present (ignoring a torn trailing line),
+    otherwise the legacy ``action.json`` array; an absent log yields ``[]``.
+    """
+
+    log_dir = Path(log_path)
+    jsonl_path = log_dir / JSONL_ACTION_FILE
+    if jsonl_path.is_file():
+        return _parse_jsonl_actions(jsonl_path)
+    legacy_path = log_dir / LEGACY_ACTION_FILE
+    if legacy_path.is_file():
+        records = GameLogger._read_json(legacy_path)
+        if not isinstance(records, list):
+            raise ValueError(f"legacy action log is not a list: {legacy_path}")
+        return records
+    return []
+
+
+def convert_legacy_action_log(log_path: str | Path, remove_legacy: bool = False) -> Path:
+    """Rewrite a legacy ``action.json`` array as ``action.jsonl`` and return its path."""
+
+    log_dir = Path(log_path)
+    legacy_path = log_dir / LEGACY_ACTION_FILE
+    records = GameLogger._read_json(legacy_path)
+    if not isinstance(records, list):
+        raise ValueError(f"legacy action log is not a list: {legacy_path}")
+    target = log_dir / JSONL_ACTION_FILE
+    temp_path = target.with_name(f"{target.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as stream:
+        for record in records:
+            stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        stream.flush()
+        os.fsync(stream.fileno())
+    temp_path.replace(target)
+    if remove_legacy and legacy_path.is_file():
+        legacy_path.unlink()
+    return target
+
+
+_STATE_LINE_PREFIX = '{"version":'
+
+
+def _state_line_header(line: str) -> tuple[int, bool]:
+    """Return ``(version, is_keyframe)`` by peeking at a line's leading key order."""
+
+    end = line.find(",", len(_STATE_LINE_PREFIX))
+    if not line.startswith(_STATE_LINE_PREFIX) or end < 0:
+        return -1, False
+    try:
+        version = int(line[len(_STATE_LINE_PREFIX) : end])
+    except ValueError:
+        return -1, False
+    return version, line.startswith('"keyframe"', end + 1)
+
+
+def _apply_state_line(path: Path, line_no: int, line: str, snapshot: Any) -> Any:
+    record = _decode_jsonl_line(path, line_no, line, "state")
+    if "keyframe" in record:
+        return record["keyframe"]
+    if snapshot is None:
+        raise ValueError(f"state log line {line_no} has no keyframe before it: {path}")
+    return apply_json_patch(snapshot, record["patch"], in_place=True)
+
+
+def iter_state_snapshots(log_path: str | Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(version, snapshot)`` for every logged version in write order.
+
+    Snapshots are rebuilt from ``states.jsonl`` when present, otherwise read
+    from legacy ``state_v*.json`` files in version order. Yielded snapshots
+    must not be mutated while iterating a delta log.
+    """
+
+    log_dir = Path(log_path)
+    delta_path = log_dir / DELTA_STATE_FILE
+    if delta_path.is_file():
+        snapshot: Any = None
+        for line_no, line in enumerate(_read_jsonl_lines(delta_path), start=1):
+            snapshot = _apply_state_line(delta_path, line_no, line, snapshot)
+            yield _state_line_header(line)[0], snapshot
+        return
+    versions = sorted(int(path.stem[len("state_v") :]) for path in log_dir.glob("state_v*.json"))
+    for version in versions:
+        yield version, GameLogger._read_json(log_dir / f"state_v{version}.json")
+
+
+def _read_indexed_state_lines(delta_path: Path, index_path: Path, version: int) -> tuple[int, list[str]] | None:
+    """Return ``(first_line_no, lines)`` from version's keyframe through version.
+
+    Returns ``None`` when the index is missing or does not cover every
+    complete line of the delta log, so the caller falls back to a scan.
+    """
+
+    if not index_path.is_file():
+        return None
+    try:
+        entries = [json.loads(line) for line in _read_jsonl_lines(index_path)]
+    except json.JSONDecodeError:
+        return None
+    if not entries:
+        return None
+    with delta_path.open("rb") as stream:
+        stream.seek(int(entries[-1]["offset"]))
+        stream.readline()
+        if b"\n" in stream.read():
+            return None
+        target_idx = None
+        for idx in range(len(entries) - 1, -1, -1):
+            if entries[idx]["version"] == version:
+                target_idx = idx
+                break
+        if target_idx is None:
+            raise ValueError(f"state version not logged: {version}")
+        start_idx = target_idx
+        while start_idx > 0 and not entries[start_idx]["keyframe"]:
+            start_idx -= 1
+        start = int(entries[start_idx]["offset"])
+        stream.seek(start)
+        raw = stream.read(int(entries[target_idx]["offset"]) - start) + stream.readline()
+    lines = raw.decode("utf-8").split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    if len(lines) != target_idx - start_idx + 1:
+        return None
+    return start_idx + 1, lines
+
+
+def read_state_snapshot(log_path: str | Path, version: int) -> dict[str, Any]:
+    """Return the logged ``{global, public, private_states}`` snapshot of version.
+
+    For a delta log the ``states.index.jsonl`` sidecar gives the byte offsets
+    of version and its nearest keyframe, so only that span of ``states.jsonl``
+    is read and decoded; the cost is bounded by the keyframe interval. Logs
+    without an up-to-date index fall back to scanning the whole file. When a
+    version was logged more than once (after ``load_state``), the last one wins.
+    """
+
+    log_dir = Path(log_path)
+    delta_path = log_dir / DELTA_STATE_FILE
+    if not delta_path.is_file():
+        legacy_path = log_dir / f"state_v{int(version)}.json"
+        if not legacy_path.is_file():
+            raise ValueError(f"state version not logged: {version}")
+        return GameLogger._read_json(legacy_path)
+
+    indexed = _read_indexed_state_lines(delta_path, log_dir / DELTA_STATE_INDEX_FILE, int(version))
+    if indexed is not None:
+        start_line_no, span = indexed
+        snapshot: Any = None
+        for line_no, line in enumerate(span, start=start_line_no):
+            snapshot = _apply_state_line(delta_path, line_no, line, snapshot)
+        return snapshot
+
+    lines = _read_jsonl_lines(delta_path)
+    target_idx = None
+    for idx in range(len(lines) - 1, -1, -1):
+        if _state_line_header(lines[idx])[0] == int(version):
+            target_idx = idx
+            break
+    if target_idx is None:
+        raise ValueError(f"state version not logged: {version}")
+    start_idx = target_idx
+    while start_idx > 0 and not _state_line_header(lines[start_idx])[1]:
+        start_idx -= 1
+    snapshot = None
+    for idx in range(start_idx, target_idx + 1):
+        snapshot = _apply_state_line(delta_path, idx + 1, lines[idx], snapshot)
+    return snapshot
@@ -0,0 +1,106 @@
+"""Derived per-seat indexes kept next to the live engine state.
+
+``pillar_groups`` and the plays stay the single source of truth. The reducer
+keeps running per-seat pillar counts and covered-card maps under the private
+``state["_index"]`` key so serializer and settlement lookups are O(1);
+``dump_state`` strips the key and ``load_state`` rebuilds it from the groups.
+The index also carries the incremental part of the Zobrist state hash (see
+``engine.zobrist``).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from engine.zobrist import collections_hash, scalar_hash
+
+INDEX_KEY = "_index"
+
+
+def _accumulate_covered(covered: list[dict[str, int]], plays: Any) -> None:
+    if not isinstance(plays, list):
+        return
+    for play in plays:
+        if not isinstance(play, dict):
+            continue
+        if int(play.get("power", 0)) != -1:
+            continue
+        seat = int(play.get("seat", -1))
+        if seat not in (0, 1, 2):
+            continue
+        cards = play.get("cards") or {}
+        if not isinstance(cards, dict):
+            continue
+        add_covered_cards(covered[seat], cards)
+
+
+def add_covered_cards(covered: dict[str, int], cards: dict[str, Any]) -> None:
+    for card_type, raw_count in cards.items():
+        card_type = str(card_type)
+        count = int(raw_count)
+        if not card_type or count <= 0:
+            continue
+        covered[card_type] = int(covered.get(card_type, 0)) + count
+
+
+def build_state_index(state: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the derived index by scanning pillar groups and the current turn."""
+
+    pillar_counts = [0, 0, 0]
+    covered: list[dict[str, int]] = [{}, {}, {}]
+
+    for group in state.get("pillar_groups") or []:
+        if not isinstance(group, dict):
+            continue
+        winner_seat = int(group.get("winner_seat", -1))
+        if 0 <= winner_seat <= 2:
+            pillar_counts[winner_seat] += int(group.get("round_kind", 0))
+        _accumulate_covered(covered, group.get("plays"))
+
+    turn = state.get("turn") or {}
+    if isinstance(turn, dict):
+        _accumulate_covered(covered, turn.get("plays"))
+
+    return {
+        "pillar_counts": pillar_counts,
+        "covered": covered,
+        "zobrist": collections_hash(state, pillar_counts, covered),
+    }
+
+
+def ensure_state_index(state: dict[str, Any]) -> dict[str, Any]:
+    """Return the live index of state, building it for states that lack one."""
+
+    index = state.get(INDEX_KEY)
+    if not isinstance(index, dict):
+        index = build_state_index(state)
+        state[INDEX_KEY] = index
+    return index
+
+
+def read_state_index(state: dict[str, Any]) -> dict[str, Any]:
+    """Return the live index of state without attaching one to foreign states."""
+
+    index = state.get(INDEX_KEY)
+    if isinstance(index, dict):
+        return index
+    return build_state_index(state)
+
+
+def strip_state_index(state: dict[str, Any]) -> dict[str, Any]:
+    state.pop(INDEX_KEY, None)
+    return state
+
+
+def get_pillar_counts(state: dict[str, Any]) -> list[int]:
+    return list(read_state_index(state)["pillar_counts"])
+
+
+def get_covered_cards(state: dict[str, Any], seat: int) -> dict[str, int]:
+    return dict(read_state_index(state)["covered"][int(seat)])
+
+
+def get_state_hash(state: dict[str, Any]) -> int:
+    """Return the 64-bit Zobrist hash of state."""
+
+    return read_state_index(state)["zobrist"] ^ scalar_hash(state)
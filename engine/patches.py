@@ -0,0 +1,98 @@
+"""Structural diffs between JSON-shaped values.
+
+A patch is a list of ops applied in order; ``path`` is a list of dict keys
+and list indexes from the document root:
+
+- ``["s", path, value]``: set path to value (the root when path is empty).
+- ``["d", path]``: delete a dict key.
+- ``["a", path, items]``: extend the list at path with items.
+- ``["t", path, length]``: truncate the list at path to length.
+
+Lists are compared index by index and growth becomes one ``a`` op, which
+matches how ``turn.plays`` and ``pillar_groups`` evolve between versions.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any
+
+Patch = list[list[Any]]
+
+
+def _diff_into(old: Any, new: Any, path: list[Any], ops: Patch) -> None:
+    if old is new:
+        # Shared subtrees (e.g. cached projections of finished pillar groups)
+        # are skipped without a walk.
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append(["d", path + [key]])
+        for key, value in new.items():
+            if key in old:
+                _diff_into(old[key], value, path + [key], ops)
+            else:
+                ops.append(["s", path + [key], value])
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        if len(new) < len(old):
+            ops.append(["t", path, len(new)])
+        for idx in range(common):
+            _diff_into(old[idx], new[idx], path + [idx], ops)
+        if len(new) > len(old):
+            ops.append(["a", path, list(new[common:])])
+        return
+    if type(old) is type(new) and old == new:
+        return
+    ops.append(["s", path, new])
+
+
+def diff_json(old: Any, new: Any) -> Patch:
+    """Return the ops that turn old into new (empty when they are equal)."""
+
+    ops: Patch = []
+    _diff_into(old, new, [], ops)
+    return ops
+
+
+def _resolve_parent(doc: Any, path: list[Any]) -> Any:
+    target = doc
+    for key in path[:-1]:
+        target = target[key]
+    return target
+
+
+def apply_json_patch(doc: Any, ops: Patch, in_place: bool = False) -> Any:
+    """Apply ops to doc and return the result.
+
+    Without in_place, doc and the op values are copied first so neither is
+    aliased by the result. Raises ValueError on an unknown op or a path that
+    does not exist in doc.
+    """
+
+    if not in_place:
+        doc = deepcopy(doc)
+        ops = deepcopy(ops)
+    for op in ops:
+        kind, path = op[0], op[1]
+        try:
+            if kind == "s":
+                if not path:
+                    doc = op[2]
+                    continue
+                _resolve_parent(doc, path)[path[-1]] = op[2]
+            elif kind == "d":
+                del _resolve_parent(doc, path)[path[-1]]
+            elif kind == "a":
+                target = _resolve_parent(doc, path)[path[-1]] if path else doc
+                target.extend(op[2])
+            elif kind == "t":
+                target = _resolve_parent(doc, path)[path[-1]] if path else doc
+                del target[int(op[2]) :]
+            else:
+                raise ValueError(f"unknown patch op: {kind}")
+        except (KeyError, IndexError, TypeError) as exc:
+            raise ValueError(f"patch path not found: {path}") from exc
+    return doc
@@ -3,82 +3,80 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, Callable, TypedDict
+from typing import Any, Callable, NamedTuple, TypedDict
+
+from engine.cards import (
+    CARD_INDEX,
+    EMPTY,
+    MAX_LANE_COUNT,
+    card_count,
+    card_unit,
+    cards_contain,
+    cards_total,
+    pack_cards,
+    unpack_cards,
+)
+from engine.combos import Combo
+from engine.indexes import INDEX_KEY, add_covered_cards, ensure_state_index
+from engine.zobrist import cards_delta_hash, pillar_hash, relation_hash, relation_occurrence
 
 
 class ReducerDeps(TypedDict):
     """External dependencies injected from engine core."""
 
     get_legal_actions: Callable[[int], dict[str, Any]]
-    enumerate_combos: Callable[..., list[dict[str, Any]]]
+    combo_table: Callable[..., tuple[Combo, ...]]
 
 
-def _count_cards(cards: dict[str, int]) -> int:
-    return sum(int(count) for count in cards.values())
-
-
-def _normalize_cards(cards: dict[str, Any] | None) -> dict[str, int]:
+def _pack_cards(cards: dict[str, Any] | None) -> int:
     if cards is None:
-        return {}
+        return EMPTY
     if not isinstance(cards, dict):
         raise ValueError("ENGINE_INVALID_COVER_LIST")
 
-    normalized: dict[str, int] = {}
+    packed = EMPTY
     for raw_type, raw_count in cards.items():
         card_type = str(raw_type).strip()
         try:
             count = int(raw_count)
         except (TypeError, ValueError) as exc:
             raise ValueError("ENGINE_INVALID_COVER_LIST") from exc
-        if not card_type or count <= 0:
+        if card_type not in CARD_INDEX or count <= 0:
             raise ValueError("ENGINE_INVALID_COVER_LIST")
-        normalized[card_type] = int(normalized.get(card_type, 0)) + count
-    return normalized
-
+        if card_count(packed, card_type) + count > MAX_LANE_COUNT:
+            raise ValueError("ENGINE_INVALID_COVER_LIST")
+        packed += count * card_unit(card_type)
+    return packed
 
-def _cards_signature(cards: dict[str, int]) -> tuple[tuple[str, int], ...]:
-    return tuple(sorted((str(card_type), int(count)) for card_type, count in cards.items()))
 
+def _pack_hand(state: dict[str, Any], seat: int) -> int:
+    try:
+        return pack_cards(state["players"][int(seat)]["hand"])
+    except ValueError as exc:
+        raise ValueError("ENGINE_INVALID_COVER_LIST") from exc
 
-def _consume_cards_from_hand(state: dict[str, Any], seat: int, cards: dict[str, int]) -> None:
-    hand = state["players"][int(seat)]["hand"]
-    for card_type, count in cards.items():
-        if int(hand.get(card_type, 0)) < count:
-            raise ValueError("ENGINE_INVALID_COVER_LIST")
 
-    for card_type, count in cards.items():
-        hand[card_type] = int(hand.get(card_type, 0)) - count
-        if hand[card_type] == 0:
-            del hand[card_type]
+def _consume_cards_from_hand(state: dict[str, Any], seat: int, cards: int) -> None:
+    hand = _pack_hand(state, seat)
+    if not cards_contain(hand, cards):
+        raise ValueError("ENGINE_INVALID_COVER_LIST")
+    remaining = hand - cards
+    state["players"][int(seat)]["hand"] = unpack_cards(remaining)
+    ensure_state_index(state)["zobrist"] ^= cards_delta_hash("hand", int(seat), hand, remaining)
 
 
 def _find_combo_power(
     deps: ReducerDeps,
-    hand: dict[str, int],
-    cards: dict[str, int],
+    hand: int,
+    cards: int,
     round_kind: int,
 ) -> int:
-    signature = _cards_signature(cards)
-    enumerate_combos = deps["enumerate_combos"]
-    for combo in enumerate_combos(hand, round_kind=round_kind):
-        combo_cards = combo.get("cards", {})
-        if not isinstance(combo_cards, dict):
-            continue
-        combo_sig = _cards_signature(combo_cards)
-        if combo_sig == signature:
-            return int(combo["power"])
+    for combo in deps["combo_table"](hand, round_kind=round_kind):
+        if combo.packed == cards:
+            return combo.power
     raise ValueError("ENGINE_INVALID_ACTION")
 
 
-def _captured_pillar_count(state: dict[str, Any], seat: int) -> int:
-    count = 0
-    for group in state.get("pillar_groups", []):
-        if int(group.get("winner_seat", -1)) != int(seat):
-            continue
-        count += int(group.get("round_kind", 0))
-    return count
-
-
 def _reset_turn_for_round_start(state: dict[str, Any], seat: int) -> None:
     turn = state.get("turn")
     if not isinstance(turn, dict):
@@ -96,10 +94,12 @@ def _finish_round(state: dict[str, Any]) -> None:
     last_combo = turn.get("last_combo") or {}
     winner_seat = int(last_combo.get("owner_seat", 0))
     reveal = state["reveal"]
+    index = ensure_state_index(state)
+    pillar_counts = index["pillar_counts"]
     active_revealer_raw = reveal.get("active_revealer_seat")
     active_revealer_seat = int(active_revealer_raw) if active_revealer_raw is not None else None
     active_pillars_before = (
-        _captured_pillar_count(state, active_revealer_seat)
+        pillar_counts[active_revealer_seat]
         if active_revealer_seat is not None
         else None
     )
@@ -111,10 +111,13 @@ def _finish_round(state: dict[str, Any]) -> None:
         "plays": plays,
     }
     state.setdefault("pillar_groups", []).append(pillar_group)
-    pillar_counts = [_captured_pillar_count(state, seat) for seat in range(3)]
+    if 0 <= winner_seat <= 2:
+        before = pillar_counts[winner_seat]
+        pillar_counts[winner_seat] = before + round_kind
+        index["zobrist"] ^= pillar_hash(winner_seat, before) ^ pillar_hash(winner_seat, before + round_kind)
 
     if active_revealer_seat is not None and active_pillars_before is not None:
-        active_pillars_after = _captured_pillar_count(state, active_revealer_seat)
+        active_pillars_after = pillar_counts[active_revealer_seat]
         if active_pillars_before < 3 <= active_pillars_after:
             reveal["active_revealer_seat"] = None
 
@@ -132,6 +135,92 @@ def _finish_round(state: dict[str, Any]) -> None:
     reveal["pending_order"] = []
 
 
+class UndoRecord(NamedTuple):
+    """What one ``reduce_apply_action`` call changed, enough to revert it in place.
+
+    The reducer only rebinds hands, turn/reveal fields and the hand dicts,
+    and only appends to plays, pillar groups and relations, so a record
+    keeps references to the old bindings plus list lengths instead of
+    copying the state.
+    """
+
+    version: Any
+    phase: Any
+    hands: tuple[Any, ...]
+    turn: dict[str, Any]
+    plays_len: int
+    groups_len: int | None
+    reveal: dict[str, Any]
+    relations_len: int
+    pillar_counts: tuple[int, ...]
+    covered_seat: int
+    covered: dict[str, int]
+    zobrist: int
+
+
+def _undo_record(state: dict[str, Any]) -> UndoRecord:
+    index = ensure_state_index(state)
+    turn = state["turn"]
+    reveal = state["reveal"]
+    groups = state.get("pillar_groups")
+    seat_raw = turn.get("current_seat")
+    covered_seat = int(seat_raw) if seat_raw is not None else 0
+    return UndoRecord(
+        version=state.get("version"),
+        phase=state.get("phase"),
+        hands=tuple(player.get("hand") for player in state["players"]),
+        turn=dict(turn),
+        plays_len=len(turn.get("plays") or []),
+        groups_len=len(groups) if isinstance(groups, list) else None,
+        reveal=dict(reveal),
+        relations_len=len(reveal.get("relations") or []),
+        pillar_counts=tuple(index["pillar_counts"]),
+        covered_seat=covered_seat,
+        covered=dict(index["covered"][covered_seat]),
+        zobrist=index["zobrist"],
+    )
+
+
+def undo(state: dict[str, Any], record: UndoRecord) -> dict[str, Any]:
+    """Revert the action that produced record and return state.
+
+    Records must be undone in reverse order of application; state is
+    restored in place to a value equal to the one before the action.
+    """
+
+    state["version"] = record.version
+    state["phase"] = record.phase
+    for player, hand in zip(state["players"], record.hands):
+        player["hand"] = hand
+
+    turn = state["turn"]
+    turn.clear()
+    turn.update(record.turn)
+    plays = turn.get("plays")
+    if isinstance(plays, list):
+        del plays[record.plays_len :]
+
+    if record.groups_len is None:
+        state.pop("pillar_groups", None)
+    else:
+        del state["pillar_groups"][record.groups_len :]
+
+    reveal = state["reveal"]
+    reveal.clear()
+    reveal.update(record.reveal)
+    relations = reveal.get("relations")
+    if isinstance(relations, list):
+        del relations[record.relations_len :]
+
+    index = state[INDEX_KEY]
+    index["pillar_counts"][:] = record.pillar_counts
+    covered = index["covered"][record.covered_seat]
+    covered.clear()
+    covered.update(record.covered)
+    index["zobrist"] = record.zobrist
+    return state
+
+
 def reduce_apply_action(
     *,
     state: dict[str, Any],
@@ -139,12 +228,37 @@ def reduce_apply_action(
     cover_list: dict[str, int] | None,
     client_version: int | None,
     deps: ReducerDeps,
+    undo_log: list[UndoRecord] | None = None,
 ) -> dict[str, Any]:
-    """Apply action to state in-place and return the mutated state."""
+    """Apply action to state in-place and return the mutated state.
+
+    When undo_log is given, an ``UndoRecord`` for this action is appended to
+    it, and a rejected action leaves state exactly as it was.
+    """
+
+    if undo_log is None:
+        return _reduce_apply_action(state, action_idx, cover_list, client_version, deps)
+    record = _undo_record(state)
+    try:
+        _reduce_apply_action(state, action_idx, cover_list, client_version, deps)
+    except Exception:
+        undo(state, record)
+        raise
+    undo_log.append(record)
+    return state
 
+
+def _reduce_apply_action(
+    state: dict[str, Any],
+    action_idx: int,
+    cover_list: dict[str, int] | None,
+    client_version: int | None,
+    deps: ReducerDeps,
+) -> dict[str, Any]:
     phase = state.get("phase")
     if phase == "settlement":
         raise ValueError("ENGINE_INVALID_PHASE")
+    index = ensure_state_index(state)
 
     if client_version is not None and int(client_version) != int(state.get("version", 0)):
         raise ValueError("ENGINE_VERSION_CONFLICT")
@@ -165,20 +279,24 @@ def reduce_apply_action(
     target = actions[action_idx]
     action_type = str(target.get("type"))
 
-    normalized_cover = _normalize_cards(cover_list)
-    if action_type != "COVER" and normalized_cover:
+    packed_cover = _pack_cards(cover_list)
+    if action_type != "COVER" and packed_cover:
         raise ValueError("ENGINE_INVALID_COVER_LIST")
 
     if action_type == "PLAY":
-        payload_cards = _normalize_cards(target.get("payload_cards", {}))
-        round_kind = _count_cards(payload_cards)
+        packed_payload = _pack_cards(target.get("payload_cards", {}))
+        round_kind = cards_total(packed_payload)
         if round_kind == 0:
             raise ValueError("ENGINE_INVALID_ACTION")
 
-        hand_before_raw = state["players"][acting_seat]["hand"]
-        hand_before = {str(card_type): int(count) for card_type, count in hand_before_raw.items()}
-        power = int(target.get("power", _find_combo_power(deps, hand_before, payload_cards, round_kind)))
-        _consume_cards_from_hand(state, acting_seat, payload_cards)
+        hand_before = _pack_hand(state, acting_seat)
+        raw_power = target.get("power")
+        if raw_power is None:
+            power = _find_combo_power(deps, hand_before, packed_payload, round_kind)
+        else:
+            power = int(raw_power)
+        _consume_cards_from_hand(state, acting_seat, packed_payload)
+        payload_cards = unpack_cards(packed_payload)
 
         play = {"seat": acting_seat, "power": power, "cards": payload_cards}
 
@@ -222,13 +340,17 @@ def reduce_apply_action(
             raise ValueError("ENGINE_INVALID_PHASE")
 
         required_count = int(target.get("required_count", 0))
-        if _count_cards(normalized_cover) != required_count:
+        if cards_total(packed_cover) != required_count:
             raise ValueError("ENGINE_INVALID_COVER_LIST")
 
-        _consume_cards_from_hand(state, acting_seat, normalized_cover)
+        _consume_cards_from_hand(state, acting_seat, packed_cover)
 
+        covered_cards = unpack_cards(packed_cover)
         plays = turn.setdefault("plays", [])
-        plays.append({"seat": acting_seat, "power": -1, "cards": normalized_cover})
+        plays.append({"seat": acting_seat, "power": -1, "cards": covered_cards})
+        covered_before = pack_cards(index["covered"][acting_seat])
+        add_covered_cards(index["covered"][acting_seat], covered_cards)
+        index["zobrist"] ^= cards_delta_hash("covered", acting_seat, covered_before, covered_before + packed_cover)
 
         if len(plays) >= 3:
             _finish_round(state)
@@ -295,13 +417,13 @@ def reduce_apply_action(
         buckler_seat = int(buckler_raw)
         relations = reveal["relations"]
         if action_type == "REVEAL":
-            relations.append(
-                {
-                    "revealer_seat": acting_seat,
-                    "buckler_seat": buckler_seat,
-                    "revealer_enough_at_time": _captured_pillar_count(state, acting_seat) >= 3,
-                }
-            )
+            relation = {
+                "revealer_seat": acting_seat,
+                "buckler_seat": buckler_seat,
+                "revealer_enough_at_time": index["pillar_counts"][acting_seat] >= 3,
+            }
+            index["zobrist"] ^= relation_hash(relation, relation_occurrence(relations, relation))
+            relations.append(relation)
             reveal["active_revealer_seat"] = acting_seat
             reveal["pending_order"] = []
             reveal["buckler_seat"] = None
@@ -319,3 +441,30 @@ def reduce_apply_action(
 
     state["version"] = int(state.get("version", 0)) + 1
     return state
+
+
+def fork_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of state that ``reduce_apply_action`` can advance independently.
+
+    Only containers the reducer mutates in place are copied; hands, finished
+    plays, pillar groups and relation dicts are shared with the original
+    (the reducer rebinds rather than edits them), so forks for search and
+    rollouts stay cheap.
+    """
+
+    turn = state["turn"]
+    reveal = state["reveal"]
+    index = ensure_state_index(state)
+    return {
+        **state,
+        "players": [{**player} for player in state["players"]],
+        "turn": {**turn, "plays": list(turn.get("plays") or [])},
+        "pillar_groups": list(state.get("pillar_groups") or []),
+        "reveal": {**reveal, "relations": list(reveal.get("relations") or [])},
+        INDEX_KEY: {
+            "pillar_counts": list(index["pillar_counts"]),
+            "covered": [dict(cards) for cards in index["covered"]],
+            "zobrist": index["zobrist"],
+        },
+    }
+
@@ -0,0 +1,440 @@
+"""Compact binary replay codec (``.xqr``).
+
+A game is fully determined by its initial deal plus the sequence of actions,
+so a replay stores exactly that::
+
+    magic  b"XQR" | format u8 | flags u8 | engine_version (varint len + utf-8)
+    [seed zigzag varint]            when flags & FLAG_SEED
+    first_seat u8 | 3 hands x 3 bytes (2 bits per CARD_TYPES lane)
+    action count varint
+    per action: canonical action id varint (``engine.action_space``),
+                COVER ids followed by a lane bitmask varint + one count byte per set lane
+    [override count varint, then per override: actions-before varint,
+     phase u8 (index into ``core.PHASES``), reason (varint len+1, 0 = none)
+     + utf-8]                       when flags & FLAG_OVERRIDES
+    [final state digest, 8 bytes]   when flags & FLAG_DIGEST
+    [per-version digests, 4 bytes each, versions 1..N+1]
+                                    when flags & FLAG_VERSION_DIGESTS
+
+Overrides are ``XianqiGameEngine.force_phase`` calls read from the log's
+``override.jsonl``; each takes a version of its own, so a replay has
+``N + 1`` versions for ``N`` actions plus overrides.
+
+Actions use canonical ids rather than ``action_idx`` so a replay does not
+depend on the order of ``get_legal_actions``. A typical game is well under
+100 bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from engine import __version__ as ENGINE_VERSION
+from engine.action_space import COVER, action_id_for, describe_action
+from engine.cards import CARD_TYPES
+from engine.core import PHASES, XianqiGameEngine, build_initial_state
+from engine.game_logger import iter_state_snapshots, read_action_log, read_override_log, read_state_snapshot
+
+REPLAY_MAGIC = b"XQR"
+REPLAY_FORMAT_VERSION = 1
+REPLAY_SUFFIX = ".xqr"
+FLAG_SEED = 0x01
+FLAG_DIGEST = 0x02
+FLAG_VERSION_DIGESTS = 0x04
+FLAG_OVERRIDES = 0x08
+DIGEST_SIZE = 8
+VERSION_DIGEST_SIZE = 4
+_HAND_LANE_BITS = 2
+_HAND_BYTES = 3
+
+
+class ReplayAction(NamedTuple):
+    action_id: int
+    cover_list: dict[str, int] | None
+
+
+class ReplayOverride(NamedTuple):
+    after_actions: int
+    phase: str
+    reason: str | None
+
+
+class Replay(NamedTuple):
+    engine_version: str
+    seed: int | None
+    first_seat: int
+    hands: list[dict[str, int]]
+    actions: list[ReplayAction]
+    final_digest: bytes | None
+    version_digests: list[bytes] | None = None
+    overrides: list[ReplayOverride] | None = None
+
+
+def replay_version_count(replay: Replay) -> int:
+    """Return the number of versions replay rebuilds (its last version number)."""
+
+    return len(replay.actions) + len(replay.overrides or ()) + 1
+
+
+def replay_steps(replay: Replay) -> list[ReplayAction | ReplayOverride]:
+    """Return actions and overrides in the order they were applied."""
+
+    steps: list[ReplayAction | ReplayOverride] = []
+    overrides = list(replay.overrides or ())
+    for idx, action in enumerate(replay.actions):
+        while overrides and overrides[0].after_actions == idx:
+            steps.append(overrides.pop(0))
+        steps.append(action)
+    steps.extend(overrides)
+    return steps
+
+
+def state_digest(state: dict[str, Any]) -> bytes:
+    """Return a short digest of a dumped state for end-of-replay verification."""
+
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varint must be non-negative")
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def byte(self) -> int:
+        if self._pos >= len(self._data):
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        value = self._data[self._pos]
+        self._pos += 1
+        return value
+
+    def take(self, size: int) -> bytes:
+        if self._pos + size > len(self._data):
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        chunk = self._data[self._pos : self._pos + size]
+        self._pos += size
+        return chunk
+
+    def varint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def at_end(self) -> bool:
+        return self._pos == len(self._data)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _encode_hand(hand: dict[str, int]) -> bytes:
+    packed = 0
+    for idx, card_type in enumerate(CARD_TYPES):
+        count = int(hand.get(card_type, 0))
+        if not 0 <= count < 1 << _HAND_LANE_BITS:
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        packed |= count << (idx * _HAND_LANE_BITS)
+    return packed.to_bytes(_HAND_BYTES, "little")
+
+
+def _decode_hand(raw: bytes) -> dict[str, int]:
+    packed = int.from_bytes(raw, "little")
+    lane_mask = (1 << _HAND_LANE_BITS) - 1
+    hand: dict[str, int] = {}
+    for idx, card_type in enumerate(CARD_TYPES):
+        count = (packed >> (idx * _HAND_LANE_BITS)) & lane_mask
+        if count:
+            hand[card_type] = count
+    return hand
+
+
+def _encode_cover(out: bytearray, cover_list: dict[str, int]) -> None:
+    mask = 0
+    counts: list[int] = []
+    for idx, card_type in enumerate(CARD_TYPES):
+        count = int(cover_list.get(card_type, 0))
+        if count:
+            if not 0 < count < 256:
+                raise ValueError("ENGINE_INVALID_REPLAY")
+            mask |= 1 << idx
+            counts.append(count)
+    if set(cover_list) - set(CARD_TYPES):
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    _write_varint(out, mask)
+    out.extend(counts)
+
+
+def _decode_cover(reader: _Reader) -> dict[str, int]:
+    mask = reader.varint()
+    if mask >> len(CARD_TYPES):
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    return {card_type: reader.byte() for idx, card_type in enumerate(CARD_TYPES) if mask >> idx & 1}
+
+
+def _encode_override(out: bytearray, override: ReplayOverride) -> None:
+    if override.phase not in PHASES:
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    _write_varint(out, int(override.after_actions))
+    out.append(PHASES.index(override.phase))
+    if override.reason is None:
+        _write_varint(out, 0)
+        return
+    reason_bytes = override.reason.encode("utf-8")
+    _write_varint(out, len(reason_bytes) + 1)
+    out.extend(reason_bytes)
+
+
+def _decode_override(reader: _Reader) -> ReplayOverride:
+    after_actions = reader.varint()
+    phase_idx = reader.byte()
+    if phase_idx >= len(PHASES):
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    reason_size = reader.varint()
+    reason = reader.take(reason_size - 1).decode("utf-8") if reason_size else None
+    return ReplayOverride(after_actions, PHASES[phase_idx], reason)
+
+
+def _check_overrides(overrides: list[ReplayOverride], action_count: int) -> None:
+    previous = 0
+    for override in overrides:
+        if not previous <= override.after_actions <= action_count:
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        previous = override.after_actions
+
+
+def encode_replay(replay: Replay) -> bytes:
+    flags = (
+        (FLAG_SEED if replay.seed is not None else 0)
+        | (FLAG_DIGEST if replay.final_digest is not None else 0)
+        | (FLAG_VERSION_DIGESTS if replay.version_digests is not None else 0)
+        | (FLAG_OVERRIDES if replay.overrides else 0)
+    )
+    out = bytearray(REPLAY_MAGIC)
+    out.append(REPLAY_FORMAT_VERSION)
+    out.append(flags)
+    version_bytes = replay.engine_version.encode("utf-8")
+    _write_varint(out, len(version_bytes))
+    out.extend(version_bytes)
+    if replay.seed is not None:
+        _write_varint(out, _zigzag(int(replay.seed)))
+    out.append(int(replay.first_seat))
+    if len(replay.hands) != 3:
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    for hand in replay.hands:
+        out.extend(_encode_hand(hand))
+    _write_varint(out, len(replay.actions))
+    for action in replay.actions:
+        _write_varint(out, int(action.action_id))
+        if action.action_id == COVER:
+            _encode_cover(out, action.cover_list or {})
+    if replay.overrides:
+        _check_overrides(replay.overrides, len(replay.actions))
+        _write_varint(out, len(replay.overrides))
+        for override in replay.overrides:
+            _encode_override(out, override)
+    if replay.final_digest is not None:
+        if len(replay.final_digest) != DIGEST_SIZE:
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        out.extend(replay.final_digest)
+    if replay.version_digests is not None:
+        if len(replay.version_digests) != replay_version_count(replay):
+            raise ValueError("ENGINE_INVALID_REPLAY")
+        for digest in replay.version_digests:
+            if len(digest) != VERSION_DIGEST_SIZE:
+                raise ValueError("ENGINE_INVALID_REPLAY")
+            out.extend(digest)
+    return bytes(out)
+
+
+def decode_replay(data: bytes) -> Replay:
+    """Parse ``.xqr`` bytes; malformed input raises ValueError("ENGINE_INVALID_REPLAY")."""
+
+    reader = _Reader(data)
+    if reader.take(len(REPLAY_MAGIC)) != REPLAY_MAGIC or reader.byte() != REPLAY_FORMAT_VERSION:
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    flags = reader.byte()
+    engine_version = reader.take(reader.varint()).decode("utf-8")
+    seed = _unzigzag(reader.varint()) if flags & FLAG_SEED else None
+    first_seat = reader.byte()
+    if first_seat not in (0, 1, 2):
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    hands = [_decode_hand(reader.take(_HAND_BYTES)) for _ in range(3)]
+    actions: list[ReplayAction] = []
+    for _ in range(reader.varint()):
+        action_id = reader.varint()
+        describe_action(action_id)
+        actions.append(ReplayAction(action_id, _decode_cover(reader) if action_id == COVER else None))
+    overrides = None
+    if flags & FLAG_OVERRIDES:
+        overrides = [_decode_override(reader) for _ in range(reader.varint())]
+        _check_overrides(overrides, len(actions))
+    final_digest = reader.take(DIGEST_SIZE) if flags & FLAG_DIGEST else None
+    version_digests = None
+    if flags & FLAG_VERSION_DIGESTS:
+        version_count = len(actions) + len(overrides or ()) + 1
+        version_digests = [reader.take(VERSION_DIGEST_SIZE) for _ in range(version_count)]
+    if not reader.at_end():
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    return Replay(engine_version, seed, first_seat, hands, actions, final_digest, version_digests, overrides)
+
+
+def write_replay(path: str | Path, replay: Replay) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(encode_replay(replay))
+
+
+def read_replay(path: str | Path) -> Replay:
+    return decode_replay(Path(path).read_bytes())
+
+
+def new_game_engine(replay: Replay, config: dict[str, Any] | None = None) -> XianqiGameEngine:
+    """Return an engine at version 1 of replay, checking the seed reproduces its deal."""
+
+    engine = XianqiGameEngine()
+    initial_state = build_initial_state(replay.hands, replay.first_seat)
+    if replay.seed is None:
+        if config and config.get("log_path") is not None:
+            raise ValueError("ENGINE_REPLAY_SEED_REQUIRED")
+        engine.load_state(initial_state)
+        return engine
+    engine.init_game({"player_count": 3, **(config or {})}, rng_seed=replay.seed)
+    state = engine.dump_state()
+    if [player["hand"] for player in state["players"]] != replay.hands or int(state["turn"]["current_seat"]) != replay.first_seat:
+        raise ValueError("ENGINE_REPLAY_MISMATCH")
+    return engine
+
+
+def run_replay(
+    replay: Replay,
+    config: dict[str, Any] | None = None,
+    on_version: Callable[[int, dict[str, Any], ReplayAction | ReplayOverride | None], None] | None = None,
+    verify: bool = True,
+) -> XianqiGameEngine:
+    """Re-apply every action and override of replay; return the engine at its final version.
+
+    on_version sees ``(version, state, step)`` for version 1 (step None) and
+    after every action or ``force_phase`` override. With verify, each step
+    must advance the version by one, and every recorded digest must match;
+    failures raise ValueError("ENGINE_REPLAY_MISMATCH"). Illegal actions
+    surface as the engine's own errors.
+    """
+
+    engine = new_game_engine(replay, config)
+    state = engine.dump_state()
+    expected_digests = iter(replay.version_digests or ())
+    if verify and replay.version_digests is not None and state_digest(state)[:VERSION_DIGEST_SIZE] != next(expected_digests):
+        raise ValueError("ENGINE_REPLAY_MISMATCH")
+    if on_version is not None:
+        on_version(int(state["version"]), state, None)
+    for step in replay_steps(replay):
+        version = int(state["version"])
+        if isinstance(step, ReplayOverride):
+            engine.force_phase(step.phase, reason=step.reason)
+            state = engine.dump_state()
+        else:
+            state = engine.apply_canonical_action(step.action_id, cover_list=step.cover_list, client_version=version)[
+                "new_state"
+            ]
+        if verify and int(state["version"]) != version + 1:
+            raise ValueError("ENGINE_REPLAY_MISMATCH")
+        if (
+            verify
+            and replay.version_digests is not None
+            and state_digest(state)[:VERSION_DIGEST_SIZE] != next(expected_digests)
+        ):
+            raise ValueError("ENGINE_REPLAY_MISMATCH")
+        if on_version is not None:
+            on_version(int(state["version"]), state, step)
+    if verify and replay.final_digest is not None and state_digest(state) != replay.final_digest:
+        raise ValueError("ENGINE_REPLAY_MISMATCH")
+    return engine
+
+
+def logged_state_digests(log_path: str | Path) -> dict[int, bytes]:
+    """Return ``state_digest`` of the logged global state of every version (last write wins)."""
+
+    return {version: state_digest(snapshot["global"]) for version, snapshot in iter_state_snapshots(log_path)}
+
+
+def replay_from_log_dir(
+    log_path: str | Path,
+    seed: int | None = None,
+    version_digests: bool = False,
+    digests: dict[int, bytes] | None = None,
+) -> Replay:
+    """Build a replay from a ``log_path`` directory (state snapshots + action log).
+
+    Logs do not record the seed; pass it to make the replay importable again.
+    ``force_phase`` records in ``override.jsonl`` are kept as overrides at
+    their position among the actions. With version_digests, every logged
+    version's digest is kept so replays can be checked version by version
+    (4 extra bytes per version). Callers that already hold
+    ``logged_state_digests(log_path)`` pass it as digests so the state log
+    is not decoded twice.
+    """
+
+    initial = read_state_snapshot(log_path, 1)["global"]
+    actions: list[ReplayAction] = []
+    action_versions: list[int] = []
+    for record in read_action_log(log_path):
+        taken = record["taken_action"]
+        chosen = record["legal_actions"][int(taken["action_idx"])]
+        actions.append(ReplayAction(action_id_for(chosen), taken.get("cover_list")))
+        action_versions.append(int(record["version"]))
+    overrides = [
+        ReplayOverride(
+            sum(1 for version in action_versions if version < int(record["from_version"])),
+            str(record["to_phase"]),
+            record.get("reason"),
+        )
+        for record in read_override_log(log_path)
+    ]
+    if digests is None:
+        digests = logged_state_digests(log_path)
+    versions = range(1, len(actions) + len(overrides) + 2)
+    if any(version not in digests for version in versions):
+        raise ValueError("ENGINE_INVALID_REPLAY")
+    return Replay(
+        engine_version=ENGINE_VERSION,
+        seed=seed,
+        first_seat=int(initial["turn"]["current_seat"]),
+        hands=[dict(player["hand"]) for player in initial["players"]],
+        actions=actions,
+        final_digest=digests[versions[-1]],
+        version_digests=[digests[version][:VERSION_DIGEST_SIZE] for version in versions] if version_digests else None,
+        overrides=overrides or None,
+    )
+
+
+def replay_to_log_dir(replay: Replay, log_path: str | Path, config: dict[str, Any] | None = None) -> XianqiGameEngine:
+    """Re-run a seeded replay with logging on, recreating its log directory."""
+
+    return run_replay(replay, config={**(config or {}), "log_path": str(log_path)})
+
@@ -0,0 +1,121 @@
+"""Hidden-card sampling from one seat's point of view.
+
+A seated player sees its own hand and covered cards plus every face-up play.
+The remaining deck cards (opponent hands and opponent covers) are hidden;
+``sample_state`` deals them uniformly at random into the slots the public
+state reveals (``hand_count`` per seat, ``covered_count`` per cover play) and
+returns a complete state that ``XianqiGameEngine.load_state`` accepts.
+Search bots and equity estimates use it to determinize imperfect
+information.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from engine.cards import CARD_POWER, DECK_PACKED, cards_contain, pack_cards, unpack_cards
+from engine.indexes import INDEX_KEY, build_state_index
+
+
+def _public_plays(public_state: dict[str, Any]) -> list[dict[str, Any]]:
+    plays: list[dict[str, Any]] = []
+    for group in public_state.get("pillar_groups") or []:
+        plays.extend(group.get("plays") or [])
+    plays.extend((public_state.get("turn") or {}).get("plays") or [])
+    return plays
+
+
+def known_cards(public_state: dict[str, Any], private_state: dict[str, Any]) -> int:
+    """Return the packed cards seat can see: own hand, own covers and face-up plays."""
+
+    known = pack_cards(private_state.get("hand") or {}) + pack_cards(private_state.get("covered") or {})
+    for play in _public_plays(public_state):
+        if int(play.get("power", 0)) != -1:
+            known += pack_cards(play.get("cards") or {})
+    return known
+
+
+def hidden_cards(public_state: dict[str, Any], private_state: dict[str, Any]) -> dict[str, int]:
+    """Return the CardCountMap of deck cards seat cannot see."""
+
+    known = known_cards(public_state, private_state)
+    if not cards_contain(DECK_PACKED, known):
+        raise ValueError("ENGINE_INVALID_STATE")
+    return unpack_cards(DECK_PACKED - known)
+
+
+def _expand(cards: dict[str, int]) -> list[str]:
+    return [card_type for card_type, count in cards.items() for _ in range(int(count))]
+
+
+def _take(cards: list[str], count: int) -> dict[str, int]:
+    if count > len(cards):
+        raise ValueError("ENGINE_INVALID_STATE")
+    taken: dict[str, int] = {}
+    for _ in range(count):
+        card_type = cards.pop()
+        taken[card_type] = taken.get(card_type, 0) + 1
+    return taken
+
+
+def sample_state(
+    public_state: dict[str, Any],
+    private_state: dict[str, Any],
+    seat: int,
+    rng: random.Random,
+) -> dict[str, Any]:
+    """Deal the hidden cards of seat's view at random into a complete state.
+
+    Sampling is uniform over deals consistent with the visible card counts;
+    it does not infer anything from opponents' past choices. Seat's own
+    covered cards are split across its cover plays weakest-first, which
+    never affects legality or settlement.
+    """
+
+    seat = int(seat)
+    pool = _expand(hidden_cards(public_state, private_state))
+    rng.shuffle(pool)
+    own_covered = sorted(_expand(private_state.get("covered") or {}), key=lambda card: -CARD_POWER[card])
+
+    def fill(play: dict[str, Any]) -> dict[str, Any]:
+        if int(play.get("power", 0)) != -1:
+            return play
+        filled = {key: value for key, value in play.items() if key != "covered_count"}
+        source = own_covered if int(play["seat"]) == seat else pool
+        filled["cards"] = _take(source, int(play.get("covered_count", 0)))
+        return filled
+
+    players: list[dict[str, Any]] = []
+    for player in public_state["players"]:
+        player_seat = int(player["seat"])
+        if player_seat == seat:
+            hand = dict(private_state["hand"])
+        else:
+            hand = _take(pool, int(player["hand_count"]))
+        players.append({"seat": player_seat, "hand": hand})
+
+    # Face-up plays, last_combo and relations are shared with the projection;
+    # the reducer replaces rather than mutates them.
+    turn = public_state["turn"]
+    reveal = public_state["reveal"]
+    state: dict[str, Any] = {
+        "version": public_state["version"],
+        "phase": public_state["phase"],
+        "players": players,
+        "turn": {**turn, "plays": [fill(play) for play in turn.get("plays") or []]},
+        "pillar_groups": [
+            {**group, "plays": [fill(play) for play in group.get("plays") or []]}
+            for group in public_state.get("pillar_groups") or []
+        ],
+        "reveal": {
+            **reveal,
+            "pending_order": list(reveal.get("pending_order") or []),
+            "relations": list(reveal.get("relations") or []),
+        },
+    }
+
+    if pool or own_covered:
+        raise ValueError("ENGINE_INVALID_STATE")
+    state[INDEX_KEY] = build_state_index(state)
+    return state
@@ -0,0 +1,237 @@
+"""Declarative schema of the complete engine state and its compiled validator.
+
+``STATE_SCHEMA`` describes what ``serializer.load_state`` accepts as nested
+plain dicts. ``compile_schema`` turns a schema node into a closure once, so
+validating a state is a straight walk with no per-call dispatch on the
+schema. Validators never copy or mutate their input; they append one
+``SchemaViolation`` per problem found, each carrying the dotted path of the
+offending value (``state.turn.plays[3].cards``).
+
+Node keys:
+
+- ``type``: ``object``, ``list``, ``card_map``, ``seat`` or ``bool``. A
+  ``card_map`` maps known card types (``engine.cards``) to counts in
+  ``0..MAX_LANE_COUNT``, the range a packed card lane can hold.
+- ``nullable``: also accept ``None``.
+- ``object``: ``properties`` (child schemas, checked when present),
+  ``required`` (keys that must exist) and ``forbidden`` (keys that must not).
+- ``list``: ``items``, ``length``, ``max_items``, ``unique`` and
+  ``seat_indexed`` (``items[i]["seat"] == i``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+from engine.cards import CARD_INDEX, MAX_LANE_COUNT
+
+Schema = dict[str, Any]
+
+
+class SchemaViolation(NamedTuple):
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path} {self.message}"
+
+
+Validator = Callable[[Any, str, list[SchemaViolation]], None]
+
+SEAT_SCHEMA: Schema = {"type": "seat"}
+CARD_MAP_SCHEMA: Schema = {"type": "card_map"}
+PLAY_SCHEMA: Schema = {"type": "object", "properties": {"cards": CARD_MAP_SCHEMA}}
+PLAYS_SCHEMA: Schema = {"type": "list", "nullable": True, "items": PLAY_SCHEMA}
+
+STATE_SCHEMA: Schema = {
+    "type": "object",
+    "required": ("players", "reveal"),
+    "properties": {
+        "players": {
+            "type": "list",
+            "length": 3,
+            "seat_indexed": True,
+            "items": {
+                "type": "object",
+                "required": ("seat",),
+                "properties": {"hand": CARD_MAP_SCHEMA},
+            },
+        },
+        "turn": {
+            "type": "object",
+            "nullable": True,
+            "properties": {
+                "last_combo": {"type": "object", "nullable": True, "properties": {"cards": CARD_MAP_SCHEMA}},
+                "plays": PLAYS_SCHEMA,
+            },
+        },
+        "pillar_groups": {
+            "type": "list",
+            "nullable": True,
+            "items": {
+                "type": "object",
+                "forbidden": ("pillars",),
+                "properties": {"plays": PLAYS_SCHEMA},
+            },
+        },
+        "reveal": {
+            "type": "object",
+            "required": ("buckler_seat", "active_revealer_seat", "pending_order", "relations"),
+            "properties": {
+                "buckler_seat": {"type": "seat", "nullable": True},
+                "active_revealer_seat": {"type": "seat", "nullable": True},
+                "pending_order": {"type": "list", "max_items": 2, "unique": True, "items": SEAT_SCHEMA},
+                "relations": {
+                    "type": "list",
+                    "items": {
+                        "type": "object",
+                        "required": ("revealer_seat", "buckler_seat", "revealer_enough_at_time"),
+                        "properties": {
+                            "revealer_seat": SEAT_SCHEMA,
+                            "buckler_seat": SEAT_SCHEMA,
+                            "revealer_enough_at_time": {"type": "bool"},
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+def _nullable(schema: Schema, check: Validator) -> Validator:
+    if not schema.get("nullable"):
+        return check
+
+    def validate(value: Any, path: str, out: list[SchemaViolation]) -> None:
+        if value is not None:
+            check(value, path, out)
+
+    return validate
+
+
+def _compile_object(schema: Schema) -> Validator:
+    properties = tuple((key, compile_schema(child)) for key, child in (schema.get("properties") or {}).items())
+    required = tuple(schema.get("required") or ())
+    forbidden = tuple(schema.get("forbidden") or ())
+
+    def validate(value: Any, path: str, out: list[SchemaViolation]) -> None:
+        if not isinstance(value, dict):
+            out.append(SchemaViolation(path, "must be object"))
+            return
+        for key in required:
+            if key not in value:
+                out.append(SchemaViolation(f"{path}.{key}", "is required"))
+        for key in forbidden:
+            if key in value:
+                out.append(SchemaViolation(f"{path}.{key}", "is no longer supported"))
+        for key, check in properties:
+            if key in value:
+                check(value[key], f"{path}.{key}", out)
+
+    return validate
+
+
+def _compile_list(schema: Schema) -> Validator:
+    item_schema = schema.get("items")
+    check_item = compile_schema(item_schema) if item_schema is not None else None
+    length = schema.get("length")
+    max_items = schema.get("max_items")
+    unique = bool(schema.get("unique"))
+    seat_indexed = bool(schema.get("seat_indexed"))
+
+    def validate(value: Any, path: str, out: list[SchemaViolation]) -> None:
+        if not isinstance(value, list):
+            out.append(SchemaViolation(path, "must be list"))
+            return
+        if length is not None and len(value) != length:
+            out.append(SchemaViolation(path, f"must contain exactly {length} items"))
+        if max_items is not None and len(value) > max_items:
+            out.append(SchemaViolation(path, f"must contain at most {max_items} items"))
+        if unique:
+            seen: list[Any] = []
+            for item in value:
+                if item in seen:
+                    out.append(SchemaViolation(path, "must not contain duplicates"))
+                    break
+                seen.append(item)
+        for idx, item in enumerate(value):
+            item_path = f"{path}[{idx}]"
+            if check_item is not None:
+                check_item(item, item_path, out)
+            if seat_indexed and isinstance(item, dict) and "seat" in item and not _seat_matches(item["seat"], idx):
+                out.append(SchemaViolation(f"{item_path}.seat", "must match its index in seat order"))
+
+    return validate
+
+
+def _seat_matches(raw_seat: Any, idx: int) -> bool:
+    try:
+        return int(raw_seat) == idx
+    except (TypeError, ValueError):
+        return False
+
+
+def _check_card_map(value: Any, path: str, out: list[SchemaViolation]) -> None:
+    if not isinstance(value, dict):
+        out.append(SchemaViolation(path, "must be CardCountMap object"))
+        return
+    for card_type, raw_count in value.items():
+        if not str(card_type).strip():
+            out.append(SchemaViolation(path, "contains empty card type"))
+            continue
+        if str(card_type) not in CARD_INDEX:
+            out.append(SchemaViolation(f"{path}.{card_type}", "is not a known card type"))
+            continue
+        try:
+            count = int(raw_count)
+        except (TypeError, ValueError):
+            out.append(SchemaViolation(f"{path}.{card_type}", "must be integer card count"))
+            continue
+        if count < 0:
+            out.append(SchemaViolation(f"{path}.{card_type}", "must not be negative"))
+        elif count > MAX_LANE_COUNT:
+            out.append(SchemaViolation(f"{path}.{card_type}", f"must be at most {MAX_LANE_COUNT}"))
+
+
+def _check_seat(value: Any, path: str, out: list[SchemaViolation]) -> None:
+    if type(value) is not int or value not in (0, 1, 2):
+        out.append(SchemaViolation(path, "must be seat index(0/1/2)"))
+
+
+def _check_bool(value: Any, path: str, out: list[SchemaViolation]) -> None:
+    if type(value) is not bool:
+        out.append(SchemaViolation(path, "must be bool"))
+
+
+_LEAF_VALIDATORS: dict[str, Validator] = {
+    "card_map": _check_card_map,
+    "seat": _check_seat,
+    "bool": _check_bool,
+}
+
+
+def compile_schema(schema: Schema) -> Validator:
+    """Return a validator ``(value, path, violations)`` for one schema node."""
+
+    kind = schema.get("type")
+    if kind == "object":
+        check = _compile_object(schema)
+    elif kind == "list":
+        check = _compile_list(schema)
+    elif kind in _LEAF_VALIDATORS:
+        check = _LEAF_VALIDATORS[kind]
+    else:
+        raise ValueError(f"unknown schema type: {kind!r}")
+    return _nullable(schema, check)
+
+
+_validate_state = compile_schema(STATE_SCHEMA)
+
+
+def state_violations(state: Any) -> list[SchemaViolation]:
+    """Return every schema violation in state, in schema order; empty when valid."""
+
+    violations: list[SchemaViolation] = []
+    _validate_state(state, "state", violations)
+    return violations
@@ -3,140 +3,106 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+from engine.indexes import INDEX_KEY, build_state_index, get_covered_cards
+from engine.patches import Patch, apply_json_patch, diff_json
+from engine.schema import SchemaViolation, state_violations
 
-def _assert_players_canonical(players: Any) -> None:
-    if not isinstance(players, list):
-        raise AssertionError("state.players must be list")
-    if len(players) != 3:
-        raise AssertionError("state.players must contain exactly 3 players")
 
-    for seat, player in enumerate(players):
-        if not isinstance(player, dict):
-            raise AssertionError("state.players item must be object")
-        if int(player["seat"]) != seat:
-            raise AssertionError("state.players must be indexed by seat order")
-
-
-def _assert_card_count_map(value: Any, path: str) -> None:
-    if not isinstance(value, dict):
-        raise AssertionError(f"{path} must be CardCountMap object")
-
-    for card_type, raw_count in value.items():
-        key = str(card_type).strip()
-        if not key:
-            raise AssertionError(f"{path} contains empty card type")
-        try:
-            count = int(raw_count)
-        except (TypeError, ValueError) as exc:
-            raise AssertionError(f"{path} contains invalid card count") from exc
-        if count < 0:
-            raise AssertionError(f"{path} contains negative card count")
-
-
-def _assert_card_maps_canonical(state: dict[str, Any]) -> None:
-    players = state.get("players") or []
-    for seat, player in enumerate(players):
-        if not isinstance(player, dict):
-            continue
-        _assert_card_count_map(player.get("hand", {}), f"state.players[{seat}].hand")
+def _raise_read_only(*_args: Any, **_kwargs: Any) -> None:
+    raise TypeError("engine projection is read-only")
 
-    turn = state.get("turn") or {}
-    if isinstance(turn, dict):
-        last_combo = turn.get("last_combo")
-        if isinstance(last_combo, dict) and "cards" in last_combo:
-            _assert_card_count_map(last_combo.get("cards"), "state.turn.last_combo.cards")
 
-        plays = turn.get("plays") or []
-        if isinstance(plays, list):
-            for idx, play in enumerate(plays):
-                if not isinstance(play, dict):
-                    continue
-                _assert_card_count_map(play.get("cards", {}), f"state.turn.plays[{idx}].cards")
-
-    groups = state.get("pillar_groups") or []
-    if isinstance(groups, list):
-        for group_idx, group in enumerate(groups):
-            if not isinstance(group, dict):
-                continue
-            if "pillars" in group:
-                raise AssertionError("state.pillar_groups[*].pillars is no longer supported")
-            plays = group.get("plays") or []
-            if not isinstance(plays, list):
-                continue
-            for play_idx, play in enumerate(plays):
-                if not isinstance(play, dict):
-                    continue
-                _assert_card_count_map(
-                    play.get("cards", {}),
-                    f"state.pillar_groups[{group_idx}].plays[{play_idx}].cards",
-                )
-
-
-def _assert_seat_or_none(value: Any, path: str) -> None:
-    if value is None:
-        return
-    if type(value) is not int or value not in (0, 1, 2):
-        raise AssertionError(f"{path} must be null or seat index(0/1/2)")
-
-
-def _assert_seat_index(value: Any, path: str) -> None:
-    if type(value) is not int or value not in (0, 1, 2):
-        raise AssertionError(f"{path} must be seat index(0/1/2)")
-
-
-def _assert_reveal_canonical(state: dict[str, Any]) -> None:
-    reveal = state.get("reveal")
-    if not isinstance(reveal, dict):
-        raise AssertionError("state.reveal must be object")
-
-    required_fields = ("buckler_seat", "active_revealer_seat", "pending_order", "relations")
-    for field in required_fields:
-        if field not in reveal:
-            raise AssertionError(f"state.reveal.{field} is required")
-
-    _assert_seat_or_none(reveal.get("buckler_seat"), "state.reveal.buckler_seat")
-    _assert_seat_or_none(reveal.get("active_revealer_seat"), "state.reveal.active_revealer_seat")
-
-    pending_order = reveal.get("pending_order")
-    if not isinstance(pending_order, list):
-        raise AssertionError("state.reveal.pending_order must be list")
-    if len(pending_order) > 2:
-        raise AssertionError("state.reveal.pending_order must contain at most 2 seats")
-    pending_seen: set[int] = set()
-    for idx, seat in enumerate(pending_order):
-        if type(seat) is not int or seat not in (0, 1, 2):
-            raise AssertionError(f"state.reveal.pending_order[{idx}] must be seat index(0/1/2)")
-        if seat in pending_seen:
-            raise AssertionError("state.reveal.pending_order must not contain duplicates")
-        pending_seen.add(seat)
-
-    relations = reveal.get("relations")
-    if not isinstance(relations, list):
-        raise AssertionError("state.reveal.relations must be list")
-    required_relation_fields = ("revealer_seat", "buckler_seat", "revealer_enough_at_time")
-    for idx, relation in enumerate(relations):
-        if not isinstance(relation, dict):
-            raise AssertionError(f"state.reveal.relations[{idx}] must be object")
-        for field in required_relation_fields:
-            if field not in relation:
-                raise AssertionError(f"state.reveal.relations[{idx}].{field} is required")
-        _assert_seat_index(relation.get("revealer_seat"), f"state.reveal.relations[{idx}].revealer_seat")
-        _assert_seat_index(relation.get("buckler_seat"), f"state.reveal.relations[{idx}].buckler_seat")
-        if type(relation.get("revealer_enough_at_time")) is not bool:
-            raise AssertionError(
-                f"state.reveal.relations[{idx}].revealer_enough_at_time must be bool"
-            )
+class FrozenDict(dict):
+    """Read-only dict handed out for cached projections.
+
+    Still a ``dict`` for JSON encoding and equality checks; ``deepcopy``
+    returns a plain mutable copy for callers that need to edit it.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _raise_read_only
+    clear = pop = popitem = setdefault = update = _raise_read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list counterpart of ``FrozenDict``."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _raise_read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def freeze_projection(value: Any) -> Any:
+    """Return a read-only view tree of a freshly built projection."""
+
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        frozen = FrozenDict()
+        for key, item in value.items():
+            dict.__setitem__(frozen, key, freeze_projection(item))
+        return frozen
+    if isinstance(value, list):
+        return FrozenList(freeze_projection(item) for item in value)
+    return value
+
+
+def validate_state(state: Any) -> list[SchemaViolation]:
+    """Return the schema violations of a complete state without copying it."""
+
+    return state_violations(state)
+
+
+def validate_states(states: Iterable[Any]) -> Iterator[list[SchemaViolation]]:
+    """Validate states one at a time, yielding each one's violations in input order.
+
+    Nothing is cloned or retained, so arbitrarily long streams (archive
+    imports, restarts) run in constant memory.
+    """
+
+    for state in states:
+        yield state_violations(state)
+
+
+def _copy_tree(value: Any) -> Any:
+    # JSON-shaped states only hold dicts, lists and immutable scalars.
+    if isinstance(value, dict):
+        return {key: _copy_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return deepcopy(value)
 
 
 def load_state(state: dict[str, Any]) -> dict[str, Any]:
-    """Clone and return internal complete state for engine restore."""
+    """Validate, clone and return internal complete state for engine restore."""
 
-    cloned = deepcopy(state)
-    _assert_players_canonical(cloned["players"])
-    _assert_card_maps_canonical(cloned)
-    _assert_reveal_canonical(cloned)
+    violations = state_violations(state)
+    if violations:
+        raise AssertionError(str(violations[0]))
+    cloned = {key: _copy_tree(value) for key, value in state.items() if key != INDEX_KEY}
+    cloned[INDEX_KEY] = build_state_index(cloned)
     return cloned
 
 
@@ -145,7 +111,7 @@ def dump_state(state: dict[str, Any] | None) -> dict[str, Any]:
 
     if state is None:
         return {}
-    return deepcopy(state)
+    return {key: deepcopy(value) for key, value in state.items() if key != INDEX_KEY}
 
 
 def _count_cards(cards: dict[str, Any]) -> int:
@@ -170,8 +136,40 @@ def _project_public_play(play: dict[str, Any]) -> dict[str, Any]:
     return projected
 
 
-def get_public_state(state: dict[str, Any] | None) -> dict[str, Any]:
-    """Project complete internal state to public view."""
+ProjectionCache = dict[int, tuple[Any, Any]]
+
+
+def _project_shared(cache: ProjectionCache | None, source: dict[str, Any], project: Any) -> dict[str, Any]:
+    # Plays and pillar groups are never edited once created and are shared
+    # between versions (see ``reducer.fork_state``), so their frozen
+    # projections can be reused by identity.
+    if cache is None:
+        return project(source)
+    entry = cache.get(id(source))
+    if entry is not None and entry[0] is source:
+        return entry[1]
+    projected = freeze_projection(project(source))
+    cache[id(source)] = (source, projected)
+    return projected
+
+
+def _project_public_group(group: dict[str, Any]) -> dict[str, Any]:
+    projected_group = {key: deepcopy(value) for key, value in group.items() if key != "plays"}
+    plays = group.get("plays") or []
+    if isinstance(plays, list):
+        projected_group["plays"] = [_project_public_play(play) for play in plays if isinstance(play, dict)]
+    else:
+        projected_group["plays"] = deepcopy(plays)
+    return projected_group
+
+
+def get_public_state(state: dict[str, Any] | None, cache: ProjectionCache | None = None) -> dict[str, Any]:
+    """Project complete internal state to public view.
+
+    With cache (one dict per game), projections of plays and pillar groups
+    already seen in an earlier version are reused as frozen views instead of
+    being rebuilt, so projecting a new version costs only what changed.
+    """
 
     if state is None:
         return {}
@@ -202,7 +200,9 @@ def get_public_state(state: dict[str, Any] | None) -> dict[str, Any]:
         }
         plays = turn.get("plays") or []
         if isinstance(plays, list):
-            public_turn["plays"] = [_project_public_play(play) for play in plays if isinstance(play, dict)]
+            public_turn["plays"] = [
+                _project_shared(cache, play, _project_public_play) for play in plays if isinstance(play, dict)
+            ]
         public_state["turn"] = public_turn
 
     pillar_groups = state.get("pillar_groups") or []
@@ -210,11 +210,7 @@ def get_public_state(state: dict[str, Any] | None) -> dict[str, Any]:
     for group in pillar_groups:
         if not isinstance(group, dict):
             continue
-        projected_group = deepcopy(group)
-        plays = projected_group.get("plays") or []
-        if isinstance(plays, list):
-            projected_group["plays"] = [_project_public_play(play) for play in plays if isinstance(play, dict)]
-        public_pillar_groups.append(projected_group)
+        public_pillar_groups.append(_project_shared(cache, group, _project_public_group))
     public_state["pillar_groups"] = public_pillar_groups
 
     reveal = state.get("reveal")
@@ -224,21 +220,37 @@ def get_public_state(state: dict[str, Any] | None) -> dict[str, Any]:
     return public_state
 
 
-def _accumulate_covered_cards(covered: dict[str, int], plays: list[dict[str, Any]], seat: int) -> None:
-    for play in plays:
-        if int(play.get("seat", -1)) != int(seat):
-            continue
-        if int(play.get("power", 0)) != -1:
-            continue
-        cards = play.get("cards") or {}
-        if not isinstance(cards, dict):
-            continue
-        for card_type, raw_count in cards.items():
-            card_type = str(card_type)
-            count = int(raw_count)
-            if not card_type or count <= 0:
-                continue
-            covered[card_type] = int(covered.get(card_type, 0)) + count
+def diff_public_state(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Return a patch turning public state old into new.
+
+    The patch is ``{"from_version", "to_version", "ops"}`` with ``ops`` in
+    ``engine.patches`` format. Pillar groups and turn plays only grow, so they
+    diff to a single append; subtrees shared between the two projections
+    (the engine reuses finished groups and plays across versions) are not
+    walked at all.
+    """
+
+    return {
+        "from_version": old.get("version"),
+        "to_version": new.get("version"),
+        "ops": diff_json(old, new),
+    }
+
+
+def apply_patch(public_state: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """Apply a ``diff_public_state`` patch to a copy of public_state and return it.
+
+    Raises ``ENGINE_VERSION_CONFLICT`` when public_state is not the patch's
+    base version or the result does not land on its target version.
+    """
+
+    if public_state.get("version") != patch.get("from_version"):
+        raise ValueError("ENGINE_VERSION_CONFLICT")
+    ops: Patch = patch.get("ops") or []
+    patched = apply_json_patch(public_state, ops)
+    if patched.get("version") != patch.get("to_version"):
+        raise ValueError("ENGINE_VERSION_CONFLICT")
+    return patched
 
 
 def get_private_state(state: dict[str, Any] | None, seat: int) -> dict[str, Any]:
@@ -248,18 +260,5 @@ def get_private_state(state: dict[str, Any] | None, seat: int) -> dict[str, Any]
         raise RuntimeError("engine state is not initialized")
 
     target_seat = int(seat)
-    covered: dict[str, int] = {}
-
-    turn = state.get("turn") or {}
-    turn_plays = turn.get("plays") or []
-    if isinstance(turn_plays, list):
-        _accumulate_covered_cards(covered, turn_plays, target_seat)
-
-    for group in state.get("pillar_groups", []):
-        if not isinstance(group, dict):
-            continue
-        group_plays = group.get("plays") or []
-        if isinstance(group_plays, list):
-            _accumulate_covered_cards(covered, group_plays, target_seat)
-
-    return {"hand": deepcopy(state["players"][target_seat]["hand"]), "covered": covered}
+    hand = deepcopy(state["players"][target_seat]["hand"])
+    return {"hand": hand, "covered": get_covered_cards(state, target_seat)}
@@ -5,16 +5,7 @@ from __future__ import annotations
 from copy import deepcopy
 from typing import Any
 
-
-def _get_pillar_counts(state: dict[str, Any]) -> list[int]:
-    counts = [0, 0, 0]
-    for group in state.get("pillar_groups", []):
-        if not isinstance(group, dict):
-            continue
-        winner_seat = int(group.get("winner_seat", -1))
-        if 0 <= winner_seat <= 2:
-            counts[winner_seat] += int(group.get("round_kind", 0))
-    return counts
+from engine.indexes import get_pillar_counts, strip_state_index
 
 
 def _has_enough_reveal_flag(relations: list[dict[str, Any]], seat: int) -> bool:
@@ -28,16 +19,13 @@ def _has_enough_reveal_flag(relations: list[dict[str, Any]], seat: int) -> bool:
     return False
 
 
-def settle_state(state: dict[str, Any] | None) -> dict[str, Any]:
-    """Settle the current game state and return state + settlement payload."""
-
-    if state is None:
-        raise RuntimeError("engine state is not initialized")
+def settlement_deltas(state: dict[str, Any]) -> list[dict[str, int]]:
+    """Return the ``chip_delta_by_seat`` rows of a settlement-phase state without copying it."""
 
     if state.get("phase") != "settlement":
         raise ValueError("ENGINE_INVALID_PHASE")
 
-    pillar_counts = _get_pillar_counts(state)
+    pillar_counts = get_pillar_counts(state)
     reveal = state.get("reveal", {})
     relations = reveal.get("relations", []) if isinstance(reveal, dict) else []
     if not isinstance(relations, list):
@@ -102,14 +90,35 @@ def settle_state(state: dict[str, Any] | None) -> dict[str, Any]:
                 "delta_ceramic": seat_delta_ceramic,
             }
         )
+    return chip_delta_by_seat
+
+
+def forced_settlement_deltas(state: dict[str, Any]) -> list[dict[str, int]]:
+    """Return the settlement rows of state as if it were forced into settlement.
+
+    A game can stop with no legal action before reaching settlement (e.g. all
+    hands empty in ``in_round``). The backend then calls
+    ``force_phase("settlement")`` and settles, so simulations score such dead
+    ends with these rows rather than as a draw.
+    """
+
+    return settlement_deltas({**state, "phase": "settlement"})
+
+
+def settle_state(state: dict[str, Any] | None) -> dict[str, Any]:
+    """Settle the current game state and return state + settlement payload."""
+
+    if state is None:
+        raise RuntimeError("engine state is not initialized")
 
+    chip_delta_by_seat = settlement_deltas(state)
     final_state = deepcopy(state)
     final_state["phase"] = "settlement"
 
     return {
         "new_state": final_state,
         "settlement": {
-            "final_state": deepcopy(final_state),
+            "final_state": strip_state_index(deepcopy(final_state)),
             "chip_delta_by_seat": chip_delta_by_seat,
         },
     }
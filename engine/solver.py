@@ -0,0 +1,191 @@
+"""Perfect-information endgame solver.
+
+Given a full state (``dump_state`` output), ``solve`` searches every legal
+action and every distinct cover choice depth-first and returns the chip
+outcome each seat gets under max^n play: the seat to move always picks the
+child that maximizes its own ``delta``, ties going to the earlier move in
+search order (PLAY by descending power, covers weakest-first). Covers come
+from ``combos.enumerate_covers``; ``prune_covers`` drops dominated ones, which
+shrinks the tree but is only exact under that dominance assumption. A seat
+left with no legal action is scored by ``settlements.forced_settlement_deltas``,
+since the backend force-settles such games.
+
+Results are memoized in a transposition table keyed on the Zobrist state
+hash (``engine.zobrist``) with covered-card terms removed, since which cards
+were covered never changes the outcome. Search states drop the play history
+of finished pillar groups, so each node clone copies only live fields.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from engine.actions import get_legal_actions
+from engine.cards import pack_cards
+from engine.combos import combo_table_packed, enumerate_covers
+from engine.indexes import INDEX_KEY, get_state_hash
+from engine.reducer import ReducerDeps, fork_state, reduce_apply_action
+from engine.serializer import load_state
+from engine.settlements import forced_settlement_deltas, settlement_deltas
+from engine.zobrist import cards_hash
+
+Move = tuple[int, dict[str, Any], "dict[str, int] | None"]
+Outcome = tuple[int, int, int]
+
+DEFAULT_MAX_TT_ENTRIES = 2_000_000
+_TIME_CHECK_INTERVAL = 1024
+
+
+class SolverTimeout(Exception):
+    """Raised inside the search when the time budget is exhausted."""
+
+
+def _search_state(state: dict[str, Any]) -> dict[str, Any]:
+    search_state = load_state(state)
+    search_state["pillar_groups"] = [{**group, "plays": []} for group in search_state.get("pillar_groups") or []]
+    return search_state
+
+
+def transposition_key(state: dict[str, Any]) -> int:
+    """Return the state hash without covered-card terms."""
+
+    key = get_state_hash(state)
+    for seat, cards in enumerate(state[INDEX_KEY]["covered"]):
+        key ^= cards_hash("covered", seat, pack_cards(cards))
+    return key
+
+
+class Solver:
+    """Reusable max^n solver; the transposition table persists across ``solve`` calls."""
+
+    def __init__(
+        self,
+        time_budget: float | None = None,
+        max_tt_entries: int = DEFAULT_MAX_TT_ENTRIES,
+        prune_covers: bool = False,
+    ) -> None:
+        self.time_budget = time_budget
+        self.prune_covers = prune_covers
+        self.max_tt_entries = int(max_tt_entries)
+        self.table: dict[int, tuple[Outcome, int]] = {}
+        self.nodes = 0
+        self.leaves = 0
+        self.stuck = 0
+        self.tt_hits = 0
+        self._deadline: float | None = None
+
+    def clear(self) -> None:
+        self.table.clear()
+
+    def _moves(self, state: dict[str, Any], seat: int) -> tuple[dict[str, Any], list[Move]]:
+        legal = get_legal_actions(state, seat)
+        moves: list[Move] = []
+        for action_idx, action in enumerate(legal["actions"]):
+            if action["type"] == "COVER":
+                hand = state["players"][seat]["hand"]
+                covers = enumerate_covers(hand, int(action["required_count"]), self.prune_covers)
+                moves.extend((action_idx, action, cover) for cover in covers)
+            else:
+                moves.append((action_idx, action, None))
+        moves.sort(key=lambda move: -int(move[1].get("power", -1)) if move[1]["type"] == "PLAY" else 0)
+        return legal, moves
+
+    def _child(self, state: dict[str, Any], legal: dict[str, Any], move: Move) -> dict[str, Any]:
+        child = fork_state(state)
+        deps: ReducerDeps = {"get_legal_actions": lambda _seat: legal, "combo_table": combo_table_packed}
+        return reduce_apply_action(state=child, action_idx=move[0], cover_list=move[2], client_version=None, deps=deps)
+
+    def _search(self, state: dict[str, Any]) -> tuple[Outcome, int]:
+        self.nodes += 1
+        if self._deadline is not None and self.nodes % _TIME_CHECK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise SolverTimeout
+
+        if state["phase"] == "settlement":
+            self.leaves += 1
+            rows = settlement_deltas(state)
+            return tuple(int(row["delta"]) for row in rows), -1  # type: ignore[return-value]
+
+        key = transposition_key(state)
+        cached = self.table.get(key)
+        if cached is not None:
+            self.tt_hits += 1
+            return cached
+
+        seat = int(state["turn"]["current_seat"])
+        legal, moves = self._moves(state, seat)
+        if not moves:
+            # The backend force-settles a seat with no legal action; score it the same way.
+            self.stuck += 1
+            return tuple(int(row["delta"]) for row in forced_settlement_deltas(state)), -1  # type: ignore[return-value]
+
+        best: tuple[Outcome, int] | None = None
+        for move_no, move in enumerate(moves):
+            outcome, _ = self._search(self._child(state, legal, move))
+            if best is None or outcome[seat] > best[0][seat]:
+                best = (outcome, move_no)
+        assert best is not None
+        if len(self.table) < self.max_tt_entries:
+            self.table[key] = best
+        return best
+
+    def solve(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Solve state and return outcome, best move, principal variation and counters.
+
+        When the time budget runs out first, ``complete`` is False and the
+        outcome fields are None; the table keeps what was already solved.
+        """
+
+        root = _search_state(state)
+        self.nodes = self.leaves = self.stuck = self.tt_hits = 0
+        started = time.perf_counter()
+        self._deadline = started + self.time_budget if self.time_budget is not None else None
+        result: dict[str, Any] = {"complete": False, "chip_delta_by_seat": None, "best_action": None, "principal_variation": None}
+        try:
+            outcome, _ = self._search(root)
+            result.update(
+                {
+                    "complete": True,
+                    "chip_delta_by_seat": list(outcome),
+                    "principal_variation": self._principal_variation(root),
+                }
+            )
+            if result["principal_variation"]:
+                result["best_action"] = result["principal_variation"][0]
+        except SolverTimeout:
+            pass
+        finally:
+            self._deadline = None
+        elapsed = time.perf_counter() - started
+        result.update(
+            {
+                "nodes": self.nodes,
+                "leaves": self.leaves,
+                "stuck": self.stuck,
+                "tt_hits": self.tt_hits,
+                "tt_size": len(self.table),
+                "elapsed": elapsed,
+                "nodes_per_sec": self.nodes / elapsed if elapsed > 0 else 0.0,
+            }
+        )
+        return result
+
+    def _principal_variation(self, root: dict[str, Any]) -> list[dict[str, Any]]:
+        line: list[dict[str, Any]] = []
+        state = root
+        while state["phase"] != "settlement":
+            seat = int(state["turn"]["current_seat"])
+            legal, moves = self._moves(state, seat)
+            if not moves:
+                break
+            _, move_no = self._search(state)
+            move = moves[move_no]
+            line.append({"seat": seat, "action_idx": move[0], "action": dict(move[1]), "cover_list": move[2]})
+            state = self._child(state, legal, move)
+        return line
+
+
+def solve(state: dict[str, Any], time_budget: float | None = None, prune_covers: bool = False) -> dict[str, Any]:
+    """Solve one state with a fresh transposition table; see ``Solver.solve``."""
+
+    return Solver(time_budget=time_budget, prune_covers=prune_covers).solve(state)
@@ -0,0 +1,52 @@
+"""PERF-01 tests: memoized combo table behind enumerate_combos."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_01_combo_table_hits_on_repeated_hand() -> None:
+    """PERF-01-01: the same packed hand/round_kind should be served from the table."""
+
+    from engine.combos import clear_combo_table, combo_table, combo_table_info
+
+    clear_combo_table()
+    hand = {"R_SHI": 2, "R_GOU": 1, "B_GOU": 1, "B_NIU": 3}
+
+    first = combo_table(hand, round_kind=2)
+    second = combo_table(dict(reversed(list(hand.items()))), round_kind=2)
+
+    assert first is second
+    info = combo_table_info()
+    assert info["misses"] == 1
+    assert info["hits"] == 1
+    assert info["size"] == 1
+
+
+def test_perf_01_combo_table_clamps_counts_above_three() -> None:
+    """PERF-01-02: counts above the triple threshold share one table entry."""
+
+    from engine.combos import combo_table
+
+    assert combo_table({"R_NIU": 5}) is combo_table({"R_NIU": 3})
+    assert combo_table({"R_NIU": 0, "B_MA": 1}) is combo_table({"B_MA": 1})
+
+
+def test_perf_01_enumerate_combos_returns_fresh_dicts() -> None:
+    """PERF-01-03: callers mutating enumerate_combos output must not corrupt the table."""
+
+    from engine.combos import enumerate_combos
+
+    hand = {"R_SHI": 2, "B_MA": 1}
+    combos = enumerate_combos(hand)
+    combos[0]["cards"]["R_SHI"] = 99
+    combos.clear()
+
+    again = enumerate_combos(hand)
+    assert again[0] == {"kind": 1, "power": 9, "cards": {"R_SHI": 1}}
+    assert len(again) == 3
@@ -0,0 +1,79 @@
+"""PERF-02 tests: packed integer card-count encoding."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_02_pack_unpack_round_trip_and_total() -> None:
+    """PERF-02-01: packing keeps counts, drops zeros and totals by arithmetic."""
+
+    from engine.cards import DECK_PACKED, DECK_TEMPLATE, cards_total, pack_cards, unpack_cards
+
+    packed = pack_cards({"B_NIU": 3, "R_SHI": 1, "B_MA": 0})
+    assert unpack_cards(packed) == {"R_SHI": 1, "B_NIU": 3}
+    assert cards_total(packed) == 4
+    assert unpack_cards(DECK_PACKED) == DECK_TEMPLATE
+    assert cards_total(DECK_PACKED) == 24
+
+
+def test_perf_02_contain_and_subtract_are_lane_wise() -> None:
+    """PERF-02-02: containment must fail when any single lane would go negative."""
+
+    from engine.cards import cards_contain, cards_subtract, pack_cards, unpack_cards
+
+    hand = pack_cards({"R_SHI": 2, "B_NIU": 1})
+    assert cards_contain(hand, pack_cards({"R_SHI": 2}))
+    assert not cards_contain(hand, pack_cards({"B_NIU": 2}))
+    assert not cards_contain(hand, pack_cards({"R_MA": 1}))
+    assert unpack_cards(cards_subtract(hand, pack_cards({"R_SHI": 1, "B_NIU": 1}))) == {"R_SHI": 1}
+    with pytest.raises(ValueError):
+        cards_subtract(hand, pack_cards({"B_SHI": 1}))
+
+
+def test_perf_02_pack_rejects_unknown_card_type() -> None:
+    """PERF-02-03: unknown card types are rejected at the packing boundary."""
+
+    from engine.cards import pack_cards
+
+    with pytest.raises(ValueError):
+        pack_cards({"X_UNKNOWN": 1})
+
+
+def test_perf_02_cover_list_with_unknown_card_is_invalid() -> None:
+    """PERF-02-04: reducer maps bad cover cards to ENGINE_INVALID_COVER_LIST."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.load_state(
+        {
+            "version": 3,
+            "phase": "in_round",
+            "players": [
+                {"seat": 0, "hand": {"B_NIU": 1}},
+                {"seat": 1, "hand": {}},
+                {"seat": 2, "hand": {}},
+            ],
+            "turn": {
+                "current_seat": 0,
+                "round_index": 0,
+                "round_kind": 1,
+                "last_combo": {"power": 9, "cards": {"R_SHI": 1}, "owner_seat": 1},
+                "plays": [{"seat": 1, "power": 9, "cards": {"R_SHI": 1}}],
+            },
+            "pillar_groups": [],
+            "reveal": {"buckler_seat": None, "active_revealer_seat": None, "pending_order": [], "relations": []},
+        }
+    )
+
+    with pytest.raises(ValueError, match="ENGINE_INVALID_COVER_LIST"):
+        engine.apply_action(action_idx=0, cover_list={"X_UNKNOWN": 1}, client_version=3)
+    assert engine.dump_state()["players"][0]["hand"] == {"B_NIU": 1}
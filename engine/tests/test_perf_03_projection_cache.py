@@ -0,0 +1,86 @@
+"""PERF-03 tests: version-keyed public/private projection cache."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _make_settlement_state(version: int) -> dict[str, object]:
+    return {
+        "version": version,
+        "phase": "settlement",
+        "players": [
+            {"seat": 0, "hand": {"R_SHI": 1}},
+            {"seat": 1, "hand": {}},
+            {"seat": 2, "hand": {}},
+        ],
+        "turn": {"current_seat": 0, "round_index": 0, "round_kind": 0, "last_combo": None, "plays": []},
+        "pillar_groups": [],
+        "reveal": {"buckler_seat": None, "active_revealer_seat": None, "pending_order": [], "relations": []},
+    }
+
+
+def test_perf_03_repeated_reads_reuse_projection() -> None:
+    """PERF-03-01: unchanged versions should return the same cached projection objects."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=20260219)
+
+    assert engine.get_public_state() is engine.get_public_state()
+    assert engine.get_private_state(1) is engine.get_private_state(1)
+    assert engine.get_private_state(0) is not engine.get_private_state(1)
+
+
+def test_perf_03_projection_is_read_only_but_serializable() -> None:
+    """PERF-03-02: cached projections reject mutation, still encode as JSON and deepcopy to plain dicts."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=20260219)
+    public_state = engine.get_public_state()
+
+    with pytest.raises(TypeError):
+        public_state["phase"] = "in_round"
+    with pytest.raises(TypeError):
+        public_state["players"].append({})
+
+    assert json.loads(json.dumps(public_state)) == public_state
+    editable = deepcopy(public_state)
+    editable["phase"] = "in_round"
+    assert type(editable["players"]) is list
+    assert engine.get_public_state()["phase"] == "buckle_flow"
+
+
+def test_perf_03_apply_action_load_state_and_settle_invalidate() -> None:
+    """PERF-03-03: every state transition must drop cached projections."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=20260219)
+    before = engine.get_public_state()
+    engine.apply_action(action_idx=0, cover_list=None, client_version=int(before["version"]))
+    after = engine.get_public_state()
+    assert after is not before
+    assert after["version"] == before["version"] + 1
+
+    state = _make_settlement_state(version=int(after["version"]))
+    engine.load_state(state)
+    loaded_private = engine.get_private_state(0)
+    assert loaded_private["hand"] == {"R_SHI": 1}
+
+    engine.settle()
+    assert engine.get_private_state(0) is not loaded_private
+    assert engine.get_public_state()["phase"] == "settlement"
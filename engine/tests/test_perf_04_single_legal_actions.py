@@ -0,0 +1,71 @@
+"""PERF-04 tests: one legal-action computation shared per state version."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _make_in_round_state(version: int = 9) -> dict[str, object]:
+    return {
+        "version": version,
+        "phase": "in_round",
+        "players": [
+            {"seat": 0, "hand": {"R_SHI": 2, "B_MA": 1}},
+            {"seat": 1, "hand": {"B_NIU": 1}},
+            {"seat": 2, "hand": {"R_NIU": 1}},
+        ],
+        "turn": {"current_seat": 0, "round_index": 0, "round_kind": 0, "last_combo": None, "plays": []},
+        "pillar_groups": [],
+        "reveal": {"buckler_seat": None, "active_revealer_seat": None, "pending_order": [], "relations": []},
+    }
+
+
+def test_perf_04_apply_action_computes_legal_actions_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-04-01: core, reducer and follow-up reads share one legal-action computation."""
+
+    import engine.core as core_module
+
+    calls: list[int] = []
+    original = core_module.actions_get_legal_actions
+
+    def counting_get_legal_actions(state, seat):  # noqa: ANN001
+        calls.append(int(seat))
+        return original(state, seat)
+
+    monkeypatch.setattr(core_module, "actions_get_legal_actions", counting_get_legal_actions)
+
+    engine = core_module.XianqiGameEngine()
+    engine.load_state(_make_in_round_state())
+    served = engine.get_legal_actions(0)
+    engine.apply_action(action_idx=0, cover_list=None, client_version=9)
+
+    assert calls == [0]
+    assert served["actions"][0]["payload_cards"] == {"R_SHI": 1}
+
+    engine.get_legal_actions(1)
+    engine.get_legal_actions(1)
+    assert calls == [0, 1]
+
+
+def test_perf_04_play_with_power_skips_combo_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-04-02: PLAY actions carrying power must not re-enumerate combos in the reducer."""
+
+    import engine.core as core_module
+
+    def failing_combo_table(*_args, **_kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("combo table should not be consulted by the reducer")
+
+    monkeypatch.setattr(core_module, "combo_table_packed", failing_combo_table)
+
+    engine = core_module.XianqiGameEngine()
+    engine.load_state(_make_in_round_state())
+    output = engine.apply_action(action_idx=0, cover_list=None, client_version=9)
+
+    assert output["new_state"]["turn"]["last_combo"]["power"] == 9
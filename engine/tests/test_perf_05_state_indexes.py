@@ -0,0 +1,89 @@
+"""PERF-05 tests: reducer-maintained pillar-count and covered-card indexes."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play_random_game(engine, rng: random.Random) -> None:  # noqa: ANN001
+    while True:
+        state = engine.dump_state()
+        if state["phase"] == "settlement":
+            return
+        seat = int(state["turn"]["current_seat"])
+        actions = engine.get_legal_actions(seat)["actions"]
+        if not actions:
+            return
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx]["type"] == "COVER":
+            cards = [card for card, count in sorted(state["players"][seat]["hand"].items()) for _ in range(count)]
+            cover_list = {}
+            for card in rng.sample(cards, int(actions[action_idx]["required_count"])):
+                cover_list[card] = cover_list.get(card, 0) + 1
+        engine.apply_action(action_idx=action_idx, cover_list=cover_list, client_version=int(state["version"]))
+
+        from engine.indexes import INDEX_KEY, build_state_index
+
+        assert engine._state[INDEX_KEY] == build_state_index(engine._state)
+
+
+def test_perf_05_incremental_index_matches_full_rescan() -> None:
+    """PERF-05-01: running indexes must equal a full rescan after every action."""
+
+    from engine.core import XianqiGameEngine
+
+    for seed in range(20):
+        engine = XianqiGameEngine()
+        engine.init_game({"player_count": 3}, rng_seed=seed)
+        _play_random_game(engine, random.Random(seed))
+
+
+def test_perf_05_index_is_internal_and_rebuilt_on_load() -> None:
+    """PERF-05-02: dumps/settlements never expose the index and load_state ignores a stale one."""
+
+    from engine.core import XianqiGameEngine
+    from engine.indexes import INDEX_KEY
+
+    engine = XianqiGameEngine()
+    engine.load_state(
+        {
+            "version": 5,
+            "phase": "settlement",
+            "players": [
+                {"seat": 0, "hand": {}},
+                {"seat": 1, "hand": {}},
+                {"seat": 2, "hand": {}},
+            ],
+            "turn": {"current_seat": 0, "round_index": 1, "round_kind": 0, "last_combo": None, "plays": []},
+            "pillar_groups": [
+                {
+                    "round_index": 0,
+                    "winner_seat": 2,
+                    "round_kind": 3,
+                    "plays": [
+                        {"seat": 2, "power": 11, "cards": {"R_NIU": 3}},
+                        {"seat": 0, "power": -1, "cards": {"B_MA": 2, "R_CHE": 1}},
+                        {"seat": 1, "power": -1, "cards": {"B_NIU": 3}},
+                    ],
+                }
+            ],
+            "reveal": {"buckler_seat": None, "active_revealer_seat": None, "pending_order": [], "relations": []},
+            INDEX_KEY: {"pillar_counts": [9, 9, 9], "covered": [{}, {}, {}]},
+        }
+    )
+
+    assert INDEX_KEY not in engine.dump_state()
+    assert engine.get_private_state(0)["covered"] == {"B_MA": 2, "R_CHE": 1}
+
+    output = engine.settle()
+    assert INDEX_KEY not in output["new_state"]
+    assert INDEX_KEY not in output["settlement"]["final_state"]
+    deltas = {row["seat"]: row["delta"] for row in output["settlement"]["chip_delta_by_seat"]}
+    assert deltas == {0: -1, 1: -1, 2: 2}
@@ -0,0 +1,77 @@
+"""PERF-06 tests: NumPy batched engine conformance with the dict reducer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+np = pytest.importorskip("numpy")
+
+
+def _random_cover(engine, actions, rng):  # noqa: ANN001, ANN202
+    from engine.batch import COVER
+
+    cover = np.zeros((engine.n_games, 12), dtype=np.int8)
+    for game in np.nonzero(actions == COVER)[0]:
+        hand = engine.hands[game, engine.current_seat[game]]
+        cards = np.repeat(np.arange(12), hand)
+        for card in rng.choice(cards, size=int(engine.round_kind[game]), replace=False):
+            cover[game, card] += 1
+    return cover
+
+
+def test_perf_06_batch_trajectories_conform_to_reducer() -> None:
+    """PERF-06-01: sampled batch games must match reduce_apply_action step by step."""
+
+    from engine.batch import BatchXianqiEngine
+
+    rng = np.random.default_rng(7)
+    engine = BatchXianqiEngine(128, seed=7, conformance_samples=32)
+    steps = 0
+    while True:
+        mask = engine.legal_action_mask()
+        if not mask.any():
+            break
+        actions = engine.sample_actions(mask)
+        engine.step(actions, _random_cover(engine, actions, rng), mask=mask)
+        steps += 1
+        assert steps < 200
+
+    deltas = engine.settle()
+    assert engine.done().all()
+    assert (deltas.sum(axis=1) == 0).all()
+
+
+def test_perf_06_illegal_action_is_rejected() -> None:
+    """PERF-06-02: actions outside the legal mask raise without mutating games."""
+
+    from engine.batch import BatchXianqiEngine, COVER
+
+    engine = BatchXianqiEngine(4, seed=1)
+    version_before = engine.version.copy()
+
+    with pytest.raises(ValueError, match="ENGINE_INVALID_ACTION"):
+        engine.step(np.full(4, COVER))
+    assert (engine.version == version_before).all()
+
+
+def test_perf_06_exported_state_loads_into_dict_engine() -> None:
+    """PERF-06-03: to_state produces a state the dict engine accepts with equal legal actions."""
+
+    from engine.batch import BatchXianqiEngine, batch_action_mask
+    from engine.core import XianqiGameEngine
+
+    batch = BatchXianqiEngine(3, seed=11)
+    mask = batch.legal_action_mask()
+    for game in range(3):
+        engine = XianqiGameEngine()
+        engine.load_state(batch.to_state(game))
+        seat = int(batch.current_seat[game])
+        assert sum(sum(player["hand"].values()) for player in engine.dump_state()["players"]) == 24
+        assert (batch_action_mask(engine.get_legal_actions(seat)) == mask[game]).all()
@@ -0,0 +1,72 @@
+"""PERF-07 tests: canonical action space, legal-action mask and canonical apply."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_07_action_space_is_fixed_and_complete() -> None:
+    """PERF-07-01: every combo the deck allows plus the five non-play actions has one id."""
+
+    from engine.action_space import ACTION_TYPES, NUM_ACTIONS, NUM_PLAY_ACTIONS, action_id_for, describe_action
+
+    assert NUM_PLAY_ACTIONS == 25
+    assert ACTION_TYPES[NUM_PLAY_ACTIONS:] == ("BUCKLE", "PASS_BUCKLE", "REVEAL", "PASS_REVEAL", "COVER")
+    for action_id in range(NUM_ACTIONS):
+        assert action_id_for(describe_action(action_id)) == action_id
+    assert action_id_for({"type": "PLAY", "payload_cards": {"B_GOU": 1, "R_GOU": 1}}) == 22
+
+
+def test_perf_07_mask_matches_legal_actions_on_random_games() -> None:
+    """PERF-07-02: get_legal_action_mask equals the mask of get_legal_actions in every visited state."""
+
+    from engine.action_space import COVER, mask_from_legal_actions, mask_to_action_ids
+    from engine.core import XianqiGameEngine
+
+    for seed in range(15):
+        rng = random.Random(seed)
+        engine = XianqiGameEngine()
+        engine.init_game({"player_count": 3}, rng_seed=seed)
+        while True:
+            state = engine.dump_state()
+            if state["phase"] == "settlement":
+                break
+            seat = int(state["turn"]["current_seat"])
+            for probe_seat in range(3):
+                expected = mask_from_legal_actions(engine.get_legal_actions(probe_seat))
+                assert engine.get_legal_action_mask(probe_seat) == expected
+            action_ids = mask_to_action_ids(engine.get_legal_action_mask(seat))
+            if not action_ids:
+                break
+            action_id = rng.choice(action_ids)
+            cover_list = None
+            if action_id == COVER:
+                cards = [card for card, count in sorted(state["players"][seat]["hand"].items()) for _ in range(count)]
+                cover_list = {}
+                for card in rng.sample(cards, int(state["turn"]["round_kind"])):
+                    cover_list[card] = cover_list.get(card, 0) + 1
+            engine.apply_canonical_action(action_id, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def test_perf_07_apply_canonical_action_rejects_illegal_id() -> None:
+    """PERF-07-03: illegal canonical ids raise ENGINE_INVALID_ACTION without state change."""
+
+    from engine.action_space import BUCKLE, REVEAL
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=3)
+    with pytest.raises(ValueError, match="ENGINE_INVALID_ACTION"):
+        engine.apply_canonical_action(REVEAL)
+    assert engine.dump_state()["version"] == 1
+
+    output = engine.apply_canonical_action(BUCKLE, client_version=1)
+    assert output["new_state"]["reveal"]["buckler_seat"] is not None
@@ -0,0 +1,90 @@
+"""PERF-08 tests: benchmark suite results, baseline comparison and CLI exit codes."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_08_run_benchmarks_reports_every_metric() -> None:
+    """PERF-08-01: a tiny run times every benchmark with positive ops/s."""
+
+    from engine.bench import BENCHMARKS, run_benchmarks
+
+    results = run_benchmarks(games=2, repeat=1, seed=5)
+
+    assert set(results["results"]) == set(BENCHMARKS)
+    for metric in results["results"].values():
+        assert metric["ops"] > 0
+        assert metric["ops_per_sec"] > 0
+    json.dumps(results)
+
+
+def test_perf_08_compare_results_flags_only_drops_beyond_tolerance() -> None:
+    """PERF-08-02: slower-than-tolerance metrics are regressions; small noise is not."""
+
+    from engine.bench import compare_results
+
+    baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}, "c": {"ops_per_sec": 100.0}}}
+    current = {"results": {"a": {"ops_per_sec": 90.0}, "b": {"ops_per_sec": 60.0}, "d": {"ops_per_sec": 1.0}}}
+
+    regressions = compare_results(current, baseline, tolerance=0.25)
+
+    assert [item["name"] for item in regressions] == ["b"]
+    assert regressions[0]["ratio"] == 0.6
+
+
+def test_perf_08_cli_writes_json_and_fails_on_regression(tmp_path: Path) -> None:
+    """PERF-08-03: CLI writes results and exits 1 against an unreachable baseline."""
+
+    from engine.bench.__main__ import main
+
+    output_path = tmp_path / "results.json"
+    baseline_path = tmp_path / "baseline.json"
+    params = {"games": 2, "repeat": 1, "seed": 0, "playout_games": 2}
+    baseline_path.write_text(json.dumps({"params": params, "results": {"settle": {"ops_per_sec": 1e12}}}), encoding="utf-8")
+    lines: list[str] = []
+
+    code = main(
+        ["--games", "2", "--repeat", "1", "--only", "settle", "--output", str(output_path), "--baseline", str(baseline_path)],
+        output_fn=lines.append,
+    )
+
+    assert code == 1
+    assert "settle" in json.loads(output_path.read_text(encoding="utf-8"))["results"]
+    assert any(line.startswith("REGRESSION settle") for line in lines)
+
+    saved_path = tmp_path / "saved.json"
+    assert main(["--games", "2", "--repeat", "1", "--only", "settle", "--baseline", str(saved_path), "--save-baseline"], output_fn=lines.append) == 0
+    assert main(["--games", "2", "--repeat", "1", "--only", "settle", "--baseline", str(saved_path), "--tolerance", "0.99"], output_fn=lines.append) == 0
+
+
+def test_perf_08_baseline_with_other_params_is_rejected(tmp_path: Path) -> None:
+    """PERF-08-04: comparing runs built from different corpora is refused, not scored."""
+
+    from engine.bench import compare_results, params_mismatch
+    from engine.bench.__main__ import main
+
+    baseline = {"params": {"games": 30, "repeat": 3, "seed": 0}, "results": {"a": {"ops_per_sec": 1e12}}}
+    current = {"params": {"games": 2, "repeat": 3, "seed": 0}, "results": {"a": {"ops_per_sec": 1.0}}}
+
+    assert params_mismatch(current, baseline) == {"games": (2, 30)}
+    with pytest.raises(ValueError, match="games=2 \\(baseline 30\\)"):
+        compare_results(current, baseline)
+
+    baseline_path = tmp_path / "baseline.json"
+    assert main(["--games", "3", "--repeat", "1", "--only", "settle", "--baseline", str(baseline_path), "--save-baseline"], output_fn=[].append) == 0
+    lines: list[str] = []
+    code = main(["--games", "2", "--repeat", "1", "--only", "settle", "--baseline", str(baseline_path)], output_fn=lines.append)
+
+    assert code == 2
+    assert "PARAMS MISMATCH games: 2 vs baseline 3" in lines
+    assert "PARAMS MISMATCH playout_games: 2 vs baseline 3" in lines
+    assert not any(line.startswith("REGRESSION") for line in lines)
@@ -0,0 +1,90 @@
+"""PERF-09 tests: bot plugin interface and seeded tournament runner."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_09_builtin_bots_and_plugin_spec() -> None:
+    """PERF-09-01: built-in names resolve, module:attr specs load plugins, unknown specs raise."""
+
+    from engine.bots import AlwaysBuckleBot, GreedyBot, RandomBot, available_bots, create_bot
+
+    assert {"random", "greedy", "always-buckle"} <= set(available_bots())
+    assert isinstance(create_bot("random"), RandomBot)
+    assert isinstance(create_bot("engine.bots:GreedyBot"), GreedyBot)
+    assert isinstance(create_bot("always-buckle"), AlwaysBuckleBot)
+    with pytest.raises(ValueError):
+        create_bot("no-such-bot")
+
+
+def test_perf_09_greedy_bot_picks_highest_power_and_weakest_cover() -> None:
+    """PERF-09-02: greedy plays its strongest combo and covers with its weakest cards."""
+
+    from engine.bots import GreedyBot
+
+    bot = GreedyBot()
+    play_observation = {
+        "legal_actions": {
+            "actions": [
+                {"type": "PLAY", "payload_cards": {"B_NIU": 1}, "power": 0},
+                {"type": "PLAY", "payload_cards": {"R_SHI": 1}, "power": 9},
+                {"type": "PLAY", "payload_cards": {"R_MA": 1}, "power": 5},
+            ]
+        },
+        "private_state": {"hand": {"B_NIU": 1, "R_SHI": 1, "R_MA": 1}},
+    }
+    assert bot.choose_action(play_observation) == (1, None)
+
+    cover_observation = {
+        "legal_actions": {"actions": [{"type": "COVER", "required_count": 2}]},
+        "private_state": {"hand": {"R_SHI": 1, "B_NIU": 1, "R_CHE": 2}},
+    }
+    assert bot.choose_action(cover_observation) == (0, {"B_NIU": 1, "R_CHE": 1})
+
+
+def test_perf_09_tournament_is_zero_sum_and_worker_independent() -> None:
+    """PERF-09-03: results depend only on seeds; chip deltas sum to zero per game."""
+
+    from engine.tournament import iter_games, run_tournament
+
+    entrants = ["random", "greedy", "always-buckle"]
+    streamed: list[dict] = []
+    summary = run_tournament(entrants, 9, seed=40, workers=1, on_result=streamed.append)
+
+    assert summary["games"] == 9
+    assert sorted(item["game_index"] for item in streamed) == list(range(9))
+    for result in streamed:
+        assert sum(result["chip_delta_by_seat"]) == 0
+        assert sorted(result["lineup"]) == [0, 1, 2]
+    assert sum(item["chip_total"] for item in summary["entrants"]) == 0
+    for item in summary["entrants"]:
+        low, high = item["win_rate_ci95"]
+        assert 0.0 <= low <= item["win_rate"] <= high <= 1.0
+
+    pooled = sorted(iter_games(entrants, 9, seed=40, workers=2, chunksize=2), key=lambda item: item["game_index"])
+    assert pooled == sorted(streamed, key=lambda item: item["game_index"])
+
+
+def test_perf_09_stuck_games_are_force_settled_and_counted() -> None:
+    """PERF-09-04: a game with no legal action is force-settled like the backend and enters win rate and EV."""
+
+    from engine.tournament import TournamentStats, play_game
+
+    result = play_game(["random", "random", "random"], seed=11)
+    assert result["forced"] is True and result["settled"] is True
+    assert result["chip_delta_by_seat"] == [3, -1, -2]
+
+    stats = TournamentStats(["random", "random", "random"])
+    stats.add(result)
+    summary = stats.summary()
+    assert (summary["settled"], summary["forced"], summary["unsettled"]) == (1, 1, 0)
+    assert [item["chip_ev"] for item in summary["entrants"]] == [3.0, -1.0, -2.0]
+    assert [item["wins"] for item in summary["entrants"]] == [1, 0, 0]
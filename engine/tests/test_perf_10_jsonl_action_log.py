@@ -0,0 +1,109 @@
+"""PERF-10 tests: append-only JSONL action log, reader and legacy converter."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play(engine, steps: int) -> None:
+    from engine.bots import weakest_cover
+
+    for _ in range(steps):
+        state = engine.dump_state()
+        seat = int(state["turn"]["current_seat"])
+        action = engine.get_legal_actions(seat)["actions"][0]
+        cover_list = None
+        if action["type"] == "COVER":
+            cover_list = weakest_cover(state["players"][seat]["hand"], int(action["required_count"]))
+        engine.apply_action(action_idx=0, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def test_perf_10_jsonl_mode_matches_legacy_records(tmp_path: Path) -> None:
+    """PERF-10-01: jsonl mode writes action.jsonl only, with the same records as legacy action.json."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import read_action_log
+
+    legacy_dir = tmp_path / "legacy"
+    jsonl_dir = tmp_path / "jsonl"
+    legacy = XianqiGameEngine()
+    legacy.init_game({"player_count": 3, "log_path": str(legacy_dir)}, rng_seed=20260219)
+    streamed = XianqiGameEngine()
+    streamed.init_game({"player_count": 3, "log_path": str(jsonl_dir), "action_log_format": "jsonl"}, rng_seed=20260219)
+
+    _play(legacy, 6)
+    _play(streamed, 6)
+
+    assert not (jsonl_dir / "action.json").exists()
+    assert (jsonl_dir / "action.jsonl").is_file()
+    legacy_records = read_action_log(legacy_dir)
+    assert len(legacy_records) == 6
+    assert read_action_log(jsonl_dir) == legacy_records
+
+
+def test_perf_10_fsync_is_batched_and_forced_on_settlement(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-10-02: fsync runs once per fsync_every records and again on settlement."""
+
+    import engine.game_logger as game_logger
+
+    calls: list[int] = []
+    monkeypatch.setattr(game_logger.os, "fsync", lambda fd: calls.append(fd))
+
+    logger = game_logger.GameLogger(tmp_path, action_format="jsonl", fsync_every=3)
+    logger.reset()
+    for version in range(7):
+        logger.append_action({"version": version})
+    assert len(calls) == 2
+
+    logger.write_settlement({"from_version": 7, "to_version": 8, "settlement": {}})
+    assert len(calls) == 3
+    logger.close()
+    assert len(calls) == 3
+    assert [record["version"] for record in game_logger.read_action_log(tmp_path)] == list(range(7))
+
+
+def test_perf_10_reader_tolerates_torn_tail_but_not_corrupt_lines(tmp_path: Path) -> None:
+    """PERF-10-03: a torn final line is dropped; a corrupt complete line raises."""
+
+    from engine.game_logger import read_action_log
+
+    path = tmp_path / "action.jsonl"
+    path.write_text('{"version": 1}\n{"version": 2}\n{"vers', encoding="utf-8")
+    assert read_action_log(tmp_path) == [{"version": 1}, {"version": 2}]
+
+    path.write_text('{"version": 1}\nnot-json\n{"version": 3}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="corrupt action log line 2"):
+        read_action_log(tmp_path)
+
+
+def test_perf_10_convert_legacy_action_log(tmp_path: Path) -> None:
+    """PERF-10-04: legacy action.json converts to an equivalent action.jsonl."""
+
+    from engine.game_logger import convert_legacy_action_log, read_action_log
+
+    records = [{"version": 1, "seat": 0}, {"version": 2, "seat": 1}]
+    (tmp_path / "action.json").write_text(json.dumps(records), encoding="utf-8")
+
+    target = convert_legacy_action_log(tmp_path, remove_legacy=True)
+
+    assert target == tmp_path / "action.jsonl"
+    assert not (tmp_path / "action.json").exists()
+    assert read_action_log(tmp_path) == records
+
+
+def test_perf_10_invalid_action_log_format_is_rejected(tmp_path: Path) -> None:
+    """PERF-10-05: unknown action_log_format is an ENGINE_INVALID_CONFIG."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    with pytest.raises(ValueError, match="ENGINE_INVALID_CONFIG"):
+        engine.init_game({"player_count": 3, "log_path": str(tmp_path), "action_log_format": "xml"}, rng_seed=1)
@@ -0,0 +1,191 @@
+"""PERF-11 tests: background buffered writer for GameLogger."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play(engine, steps: int) -> None:
+    from engine.bots import weakest_cover
+
+    for _ in range(steps):
+        state = engine.dump_state()
+        seat = int(state["turn"]["current_seat"])
+        action = engine.get_legal_actions(seat)["actions"][0]
+        cover_list = None
+        if action["type"] == "COVER":
+            cover_list = weakest_cover(state["players"][seat]["hand"], int(action["required_count"]))
+        engine.apply_action(action_idx=0, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def _read_dir(log_dir: Path) -> dict[str, object]:
+    return {path.name: json.loads(path.read_text(encoding="utf-8")) for path in sorted(log_dir.glob("*.json"))}
+
+
+def test_perf_11_async_writer_produces_same_files_as_sync(tmp_path: Path) -> None:
+    """PERF-11-01: after flush_logs, async mode leaves the same files as sync mode."""
+
+    from engine.core import XianqiGameEngine
+
+    sync_dir = tmp_path / "sync"
+    async_dir = tmp_path / "async"
+    sync_engine = XianqiGameEngine()
+    sync_engine.init_game({"player_count": 3, "log_path": str(sync_dir)}, rng_seed=20260219)
+    async_engine = XianqiGameEngine()
+    async_engine.init_game(
+        {"player_count": 3, "log_path": str(async_dir), "log_writer": "async", "log_queue_size": 2},
+        rng_seed=20260219,
+    )
+
+    _play(sync_engine, 8)
+    _play(async_engine, 8)
+    async_engine.flush_logs()
+
+    assert len(_read_dir(sync_dir)) == 10
+    assert _read_dir(async_dir) == _read_dir(sync_dir)
+
+
+def test_perf_11_drop_policy_never_blocks_engine_on_slow_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-11-02: with a stalled writer and overflow=drop, appends return and are counted as dropped."""
+
+    from engine.game_logger import AsyncGameLogger, GameLogger
+
+    release = threading.Event()
+    original_append = GameLogger.append_action
+
+    def stalled_append(self, record):  # noqa: ANN001
+        release.wait(timeout=5)
+        original_append(self, record)
+
+    monkeypatch.setattr(GameLogger, "append_action", stalled_append)
+    logger = AsyncGameLogger(tmp_path, action_format="jsonl", queue_size=2, overflow="drop")
+    logger.reset()
+    for version in range(20):
+        logger.append_action({"version": version})
+
+    assert logger.dropped >= 17
+    release.set()
+    logger.close()
+
+    from engine.game_logger import read_action_log
+
+    assert len(read_action_log(tmp_path)) == 20 - logger.dropped
+
+
+def test_perf_11_block_policy_keeps_every_record_and_settle_flushes(tmp_path: Path) -> None:
+    """PERF-11-03: overflow=block applies backpressure without losing records; settle flushes to disk."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import read_action_log
+
+    engine = XianqiGameEngine()
+    engine.init_game(
+        {
+            "player_count": 3,
+            "log_path": str(tmp_path),
+            "log_writer": "async",
+            "log_queue_size": 1,
+            "action_log_format": "jsonl",
+        },
+        rng_seed=7,
+    )
+    _play(engine, 5)
+    settlement_state = engine.dump_state()
+    settlement_state["phase"] = "settlement"
+    engine.load_state(settlement_state)
+
+    output = engine.settle()
+
+    assert json.loads((tmp_path / "settle.json").read_text(encoding="utf-8"))["settlement"] == output["settlement"]
+    assert [record["version"] for record in read_action_log(tmp_path)] == [1, 2, 3, 4, 5]
+    assert engine._logger.dropped == 0  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [{"log_writer": "thread"}, {"log_writer": "async", "log_overflow": "spill"}, {"log_writer": "async", "log_queue_size": 0}],
+)
+def test_perf_11_invalid_async_logger_config_is_rejected(tmp_path: Path, extra: dict[str, object]) -> None:
+    """PERF-11-04: bad writer/overflow/queue settings are ENGINE_INVALID_CONFIG."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    with pytest.raises(ValueError, match="ENGINE_INVALID_CONFIG"):
+        engine.init_game({"player_count": 3, "log_path": str(tmp_path), **extra}, rng_seed=1)
+
+
+def test_perf_11_close_joins_writer_and_context_manager_flushes(tmp_path: Path) -> None:
+    """PERF-11-05: leaving the engine context flushes every record and stops the writer thread."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import read_action_log
+
+    with XianqiGameEngine() as engine:
+        engine.init_game(
+            {"player_count": 3, "log_path": str(tmp_path), "log_writer": "async", "action_log_format": "jsonl"},
+            rng_seed=7,
+        )
+        logger = engine._logger  # pylint: disable=protected-access
+        _play(engine, 4)
+
+    assert not logger._thread.is_alive()  # pylint: disable=protected-access
+    assert engine._logger is None  # pylint: disable=protected-access
+    assert [record["version"] for record in read_action_log(tmp_path)] == [1, 2, 3, 4]
+    assert engine.get_public_state()["version"] == 5
+    engine.close()
+
+
+def test_perf_11_writer_error_is_raised_on_next_flush(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-11-06: a failed background write is re-raised by flush_logs, then cleared."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import GameLogger
+
+    def failing_append(self, record):  # noqa: ANN001
+        raise OSError("disk full")
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "log_path": str(tmp_path), "log_writer": "async"}, rng_seed=7)
+    monkeypatch.setattr(GameLogger, "append_action", failing_append)
+    _play(engine, 1)
+
+    with pytest.raises(OSError, match="disk full"):
+        engine.flush_logs()
+    engine.flush_logs()
+    engine.close()
+
+
+def test_perf_11_pending_writer_error_does_not_escape_settle(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-11-07: with flush_on_settle, settle returns normally and a pending error is left for flush_logs."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import GameLogger
+
+    def failing_append(self, record):  # noqa: ANN001
+        raise OSError("disk full")
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "log_path": str(tmp_path), "log_writer": "async"}, rng_seed=7)
+    monkeypatch.setattr(GameLogger, "append_action", failing_append)
+    _play(engine, 1)
+    settlement_state = engine.dump_state()
+    settlement_state["phase"] = "settlement"
+    engine.load_state(settlement_state)
+
+    output = engine.settle()
+
+    assert engine.dump_state() == output["new_state"]
+    assert json.loads((tmp_path / "settle.json").read_text(encoding="utf-8"))["settlement"] == output["settlement"]
+    with pytest.raises(OSError, match="disk full"):
+        engine.flush_logs()
+    engine.close()
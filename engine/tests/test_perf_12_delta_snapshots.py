@@ -0,0 +1,141 @@
+"""PERF-12 tests: structural patches and keyframe + delta state snapshot log."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play(engine, steps: int) -> None:
+    from engine.bots import weakest_cover
+
+    for _ in range(steps):
+        state = engine.dump_state()
+        if state["phase"] == "settlement":
+            return
+        seat = int(state["turn"]["current_seat"])
+        action = engine.get_legal_actions(seat)["actions"][0]
+        cover_list = None
+        if action["type"] == "COVER":
+            cover_list = weakest_cover(state["players"][seat]["hand"], int(action["required_count"]))
+        engine.apply_action(action_idx=0, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def test_perf_12_diff_and_apply_round_trip() -> None:
+    """PERF-12-01: diff_json/apply_json_patch round-trip sets, deletes, appends and truncations."""
+
+    from engine.patches import apply_json_patch, diff_json
+
+    old = {"a": 1, "b": {"x": [1, 2, 3], "y": True}, "c": [{"k": 1}], "gone": None}
+    new = {"a": 1, "b": {"x": [1, 5], "y": 1}, "c": [{"k": 2}, {"k": 3}], "added": {"z": []}}
+    snapshot = deepcopy(old)
+
+    patch = diff_json(old, new)
+
+    assert apply_json_patch(old, patch) == new
+    assert old == snapshot
+    assert apply_json_patch(old, json.loads(json.dumps(patch))) == new
+    assert diff_json(new, new) == []
+    assert apply_json_patch([1, 2], diff_json([1, 2], {"root": 1})) == {"root": 1}
+    with pytest.raises(ValueError):
+        apply_json_patch({}, [["d", ["missing"]]])
+
+
+def test_perf_12_delta_log_rebuilds_every_version(tmp_path: Path) -> None:
+    """PERF-12-02: states.jsonl reproduces the legacy per-version snapshots with keyframes every N lines."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import iter_state_snapshots, read_state_snapshot
+
+    files_dir = tmp_path / "files"
+    delta_dir = tmp_path / "delta"
+    legacy = XianqiGameEngine()
+    legacy.init_game({"player_count": 3, "log_path": str(files_dir)}, rng_seed=11)
+    delta = XianqiGameEngine()
+    delta.init_game(
+        {"player_count": 3, "log_path": str(delta_dir), "state_log_format": "delta", "state_keyframe_interval": 4},
+        rng_seed=11,
+    )
+    _play(legacy, 12)
+    _play(delta, 12)
+    delta.flush_logs()
+
+    expected = list(iter_state_snapshots(files_dir))
+    assert len(expected) == 13
+    assert [(version, deepcopy(snapshot)) for version, snapshot in iter_state_snapshots(delta_dir)] == expected
+    for version, snapshot in expected:
+        assert read_state_snapshot(delta_dir, version) == snapshot
+
+    assert not list(delta_dir.glob("state_v*.json"))
+    lines = (delta_dir / "states.jsonl").read_text(encoding="utf-8").splitlines()
+    assert ["keyframe" in json.loads(line) for line in lines] == [idx % 4 == 0 for idx in range(13)]
+
+
+def test_perf_12_read_decodes_only_from_nearest_keyframe(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-12-03: reconstructing one version decodes at most keyframe_interval lines."""
+
+    import engine.game_logger as game_logger
+
+    logger = game_logger.GameLogger(tmp_path, state_format="delta", keyframe_interval=5)
+    logger.reset()
+    for version in range(1, 24):
+        logger.write_state(version, {"global": {"version": version, "plays": list(range(version))}})
+    logger.close()
+
+    decoded: list[int] = []
+    original = game_logger._apply_state_line  # pylint: disable=protected-access
+
+    def counting(path, line_no, line, snapshot):  # noqa: ANN001
+        decoded.append(line_no)
+        return original(path, line_no, line, snapshot)
+
+    monkeypatch.setattr(game_logger, "_apply_state_line", counting)
+
+    assert game_logger.read_state_snapshot(tmp_path, 19)["global"] == {"version": 19, "plays": list(range(19))}
+    assert decoded == [16, 17, 18, 19]
+    with pytest.raises(ValueError, match="state version not logged"):
+        game_logger.read_state_snapshot(tmp_path, 99)
+
+
+def test_perf_12_read_seeks_through_index_and_falls_back_when_stale(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """PERF-12-04: read_state_snapshot seeks via states.index.jsonl and scans only when the index lags."""
+
+    import engine.game_logger as game_logger
+
+    logger = game_logger.GameLogger(tmp_path, state_format="delta", keyframe_interval=5)
+    logger.reset()
+    for version in range(1, 24):
+        logger.write_state(version, {"global": {"version": version, "text": "象棋" * version}})
+    logger.write_state(7, {"global": {"version": 7, "text": "reloaded"}})
+    logger.close()
+
+    scanned: list[str] = []
+    original = game_logger._read_jsonl_lines  # pylint: disable=protected-access
+
+    def tracking(path):  # noqa: ANN001
+        scanned.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(game_logger, "_read_jsonl_lines", tracking)
+
+    assert game_logger.read_state_snapshot(tmp_path, 19)["global"]["text"] == "象棋" * 19
+    assert game_logger.read_state_snapshot(tmp_path, 7)["global"]["text"] == "reloaded"
+    assert scanned == ["states.index.jsonl", "states.index.jsonl"]
+
+    index_path = tmp_path / "states.index.jsonl"
+    index_lines = index_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    index_path.write_text("".join(index_lines[:-1]), encoding="utf-8")
+    scanned.clear()
+
+    assert game_logger.read_state_snapshot(tmp_path, 7)["global"]["text"] == "reloaded"
+    assert scanned == ["states.index.jsonl", "states.jsonl"]
@@ -0,0 +1,109 @@
+"""PERF-13 tests: .xqr replay codec, log-directory import/export and CLI --replay."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play_logged_game(log_dir: Path, seed: int) -> None:
+    from engine.bots import GreedyBot
+    from engine.core import XianqiGameEngine
+
+    bot = GreedyBot()
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "log_path": str(log_dir)}, rng_seed=seed)
+    while engine.get_public_state()["phase"] != "settlement":
+        seat = int(engine.get_public_state()["turn"]["current_seat"])
+        action_idx, cover_list = bot.choose_action(
+            {"legal_actions": engine.get_legal_actions(seat), "private_state": engine.get_private_state(seat)}
+        )
+        engine.apply_action(action_idx, cover_list=cover_list, client_version=int(engine.dump_state()["version"]))
+    engine.settle()
+
+
+def test_perf_13_codec_round_trip_and_rejects_malformed_bytes() -> None:
+    """PERF-13-01: encode/decode round-trips seeded and seedless replays; bad bytes raise."""
+
+    from engine.action_space import BUCKLE, COVER, PASS_BUCKLE
+    from engine.replay import Replay, ReplayAction, decode_replay, encode_replay
+
+    replay = Replay(
+        engine_version="0.1.0",
+        seed=-(1 << 62),
+        first_seat=2,
+        hands=[{"R_SHI": 2, "B_NIU": 3}, {"R_GOU": 1}, {}],
+        actions=[ReplayAction(BUCKLE, None), ReplayAction(PASS_BUCKLE, None), ReplayAction(COVER, {"B_NIU": 2, "R_SHI": 1})],
+        final_digest=b"12345678",
+    )
+    data = encode_replay(replay)
+
+    assert decode_replay(data) == replay
+    assert len(data) < 64
+    seedless = replay._replace(seed=None, final_digest=None)
+    assert decode_replay(encode_replay(seedless)) == seedless
+    for bad in (data[:-1], b"XQX" + data[3:], data + b"\x00"):
+        with pytest.raises(ValueError, match="ENGINE_INVALID_REPLAY"):
+            decode_replay(bad)
+
+
+def test_perf_13_log_dir_export_and_import_reproduce_logs(tmp_path: Path) -> None:
+    """PERF-13-02: exporting a log dir and re-importing the replay recreates the same snapshots and actions."""
+
+    from engine.game_logger import iter_state_snapshots, read_action_log
+    from engine.replay import read_replay, replay_from_log_dir, replay_to_log_dir, write_replay
+
+    source = tmp_path / "source"
+    _play_logged_game(source, seed=42)
+    replay_path = tmp_path / "game.xqr"
+    write_replay(replay_path, replay_from_log_dir(source, seed=42))
+
+    replay = read_replay(replay_path)
+    engine = replay_to_log_dir(replay, tmp_path / "rebuilt")
+    engine.settle()
+
+    assert replay_path.stat().st_size * 100 < sum(path.stat().st_size for path in source.iterdir())
+    assert read_action_log(tmp_path / "rebuilt") == read_action_log(source)
+    assert list(iter_state_snapshots(tmp_path / "rebuilt")) == list(iter_state_snapshots(source))
+
+
+def test_perf_13_verification_failures(tmp_path: Path) -> None:
+    """PERF-13-03: wrong digest or seed/deal mismatch fail verify; seedless replays cannot rebuild logs."""
+
+    from engine.replay import replay_from_log_dir, run_replay
+
+    source = tmp_path / "source"
+    _play_logged_game(source, seed=7)
+    replay = replay_from_log_dir(source, seed=7)
+
+    assert run_replay(replay).dump_state()["phase"] == "settlement"
+    assert run_replay(replay._replace(seed=None)).dump_state()["phase"] == "settlement"
+    with pytest.raises(ValueError, match="ENGINE_REPLAY_MISMATCH"):
+        run_replay(replay._replace(final_digest=b"\x00" * 8))
+    with pytest.raises(ValueError, match="ENGINE_REPLAY_MISMATCH"):
+        run_replay(replay._replace(first_seat=(replay.first_seat + 1) % 3))
+    with pytest.raises(ValueError, match="ENGINE_REPLAY_SEED_REQUIRED"):
+        run_replay(replay._replace(seed=None), config={"log_path": str(tmp_path / "x")})
+
+
+def test_perf_13_cli_replay_and_export(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """PERF-13-04: engine.cli --export-replay then --replay --verify succeed."""
+
+    from engine.cli import main
+
+    source = tmp_path / "source"
+    _play_logged_game(source, seed=3)
+    replay_path = tmp_path / "game.xqr"
+
+    assert main(["--log-path", str(source), "--export-replay", str(replay_path), "--seed", "3"]) == 0
+    assert main(["--replay", str(replay_path), "--verify"]) == 0
+    output = capsys.readouterr().out
+    assert "verify: ok" in output
+    assert "=== Settlement ===" in output
+    assert main(["--replay", str(tmp_path / "missing.xqr")]) == 1
@@ -0,0 +1,132 @@
+"""PERF-14 tests: parallel determinism verifier over log directories and replays."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play_logged_game(log_dir: Path, seed: int, extra_config: dict | None = None) -> None:
+    from engine.bots import GreedyBot
+    from engine.core import XianqiGameEngine
+
+    bot = GreedyBot()
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "log_path": str(log_dir), **(extra_config or {})}, rng_seed=seed)
+    while engine.get_public_state()["phase"] != "settlement":
+        seat = int(engine.get_public_state()["turn"]["current_seat"])
+        action_idx, cover_list = bot.choose_action(
+            {"legal_actions": engine.get_legal_actions(seat), "private_state": engine.get_private_state(seat)}
+        )
+        engine.apply_action(action_idx, cover_list=cover_list, client_version=int(engine.dump_state()["version"]))
+    engine.settle()
+
+
+def _build_corpus(root: Path) -> None:
+    from engine.replay import replay_from_log_dir, write_replay
+
+    _play_logged_game(root / "logs" / "g1", seed=1)
+    _play_logged_game(root / "logs" / "g2", seed=4, extra_config={"state_log_format": "delta", "state_keyframe_interval": 3})
+    _play_logged_game(root / "src" / "g3", seed=3)
+    write_replay(root / "replays" / "g3_full.xqr", replay_from_log_dir(root / "src" / "g3", seed=3, version_digests=True))
+    write_replay(root / "replays" / "g3_final.xqr", replay_from_log_dir(root / "src" / "g3"))
+
+
+def test_perf_14_clean_corpus_verifies_every_version(tmp_path: Path) -> None:
+    """PERF-14-01: all games pass; log dirs and full-digest replays check every version."""
+
+    from engine.verify import discover_games, verify_games
+
+    _build_corpus(tmp_path)
+    games = discover_games(tmp_path)
+    assert [path.name for path in games] == ["g1", "g2", "g3_final.xqr", "g3_full.xqr", "g3"]
+
+    seen: list[dict] = []
+    summary = verify_games(tmp_path, workers=1, on_result=seen.append)
+
+    assert summary["games"] == 5
+    assert summary["ok"] == 5
+    by_name = {Path(item["path"]).name: item for item in seen}
+    assert by_name["g3_final.xqr"]["versions_checked"] == 1
+    assert by_name["g3_full.xqr"]["versions_checked"] == by_name["g3"]["versions_checked"] > 10
+
+
+def test_perf_14_reports_first_divergence_and_errors_in_pool(tmp_path: Path) -> None:
+    """PERF-14-02: a tampered snapshot diverges at its version; corrupt replays are errors; pool == in-process."""
+
+    from engine.verify import main, verify_games
+
+    _build_corpus(tmp_path)
+    tampered = tmp_path / "logs" / "g1" / "state_v5.json"
+    snapshot = json.loads(tampered.read_text(encoding="utf-8"))
+    snapshot["global"]["turn"]["round_index"] += 7
+    tampered.write_text(json.dumps(snapshot), encoding="utf-8")
+    (tmp_path / "replays" / "broken.xqr").write_bytes(b"XQR\x01")
+
+    summary = verify_games(tmp_path, workers=1)
+    pooled = verify_games(tmp_path, workers=2, chunksize=1)
+
+    assert pooled == summary
+    assert (summary["ok"], summary["diverged"], summary["errors"]) == (4, 1, 1)
+    diverged = next(item for item in summary["failures"] if item["divergence"] is not None)
+    assert Path(diverged["path"]).name == "g1"
+    assert diverged["divergence"]["version"] == 5
+    broken = next(item for item in summary["failures"] if item["error"] is not None)
+    assert broken["error"] == "ENGINE_INVALID_REPLAY"
+
+    lines: list[str] = []
+    assert main([str(tmp_path), "--workers", "1"], output_fn=lines.append) == 1
+    assert any(line.startswith("DIVERGED") and "at v5" in line for line in lines)
+
+
+def test_perf_14_log_dir_state_log_is_decoded_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-14-03: verifying a log directory reuses one logged_state_digests pass."""
+
+    import engine.replay as replay_module
+    import engine.verify as verify_module
+
+    _play_logged_game(tmp_path / "g1", seed=1)
+    calls: list[Path] = []
+    original = replay_module.logged_state_digests
+
+    def counting(log_path):  # noqa: ANN001
+        calls.append(Path(log_path))
+        return original(log_path)
+
+    monkeypatch.setattr(replay_module, "logged_state_digests", counting)
+    monkeypatch.setattr(verify_module, "logged_state_digests", counting)
+
+    result = verify_module.verify_game(tmp_path / "g1")
+
+    assert result["ok"] is True
+    assert calls == [tmp_path / "g1"]
+
+
+def test_perf_14_corrupt_state_log_fails_only_its_game(tmp_path: Path) -> None:
+    """PERF-14-04: an unexpected exception from a corrupt states.jsonl is reported per game, not raised."""
+
+    from engine.verify import verify_game, verify_games
+
+    _play_logged_game(tmp_path / "good", seed=1)
+    _play_logged_game(tmp_path / "bad", seed=4, extra_config={"state_log_format": "delta"})
+    states_path = tmp_path / "bad" / "states.jsonl"
+    lines = states_path.read_text(encoding="utf-8").splitlines()
+    first = json.loads(lines[0])
+    first["keyframe"]["global"]["turn"]["current_seat"] = None
+    lines[0] = json.dumps(first, separators=(",", ":"))
+    states_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    result = verify_game(tmp_path / "bad")
+    assert result["ok"] is False
+    assert result["error"].startswith("TypeError: ")
+
+    summary = verify_games(tmp_path, workers=2, chunksize=1)
+    assert (summary["ok"], summary["diverged"], summary["errors"]) == (1, 0, 1)
+    assert Path(summary["failures"][0]["path"]).name == "bad"
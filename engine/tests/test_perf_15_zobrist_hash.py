@@ -0,0 +1,85 @@
+"""PERF-15 tests: incremental Zobrist state hash."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _fresh_hash(state: dict) -> int:
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    return engine.state_hash()
+
+
+def test_perf_15_incremental_hash_matches_full_rebuild() -> None:
+    """PERF-15-01: after every action the incremental hash equals a from-scratch rebuild."""
+
+    from engine.bots import random_cover
+    from engine.core import XianqiGameEngine
+
+    hashes: dict[int, tuple] = {}
+    for seed in range(25):
+        rng = random.Random(seed)
+        engine = XianqiGameEngine()
+        engine.init_game({"player_count": 3}, rng_seed=seed)
+        while True:
+            state = engine.dump_state()
+            value = engine.state_hash()
+            assert 0 <= value < 1 << 64
+            assert value == _fresh_hash(state)
+            signature = (
+                state["phase"],
+                [player["hand"] for player in state["players"]],
+                [engine.get_private_state(seat)["covered"] for seat in range(3)],
+                state["turn"]["current_seat"],
+                state["turn"]["round_index"],
+                state["turn"]["round_kind"],
+                len(state["turn"]["plays"]),
+                state["reveal"],
+                [group["winner_seat"] for group in state["pillar_groups"]],
+            )
+            assert hashes.setdefault(value, repr(signature)) == repr(signature)
+            if state["phase"] == "settlement":
+                break
+            seat = int(state["turn"]["current_seat"])
+            actions = engine.get_legal_actions(seat)["actions"]
+            if not actions:
+                break
+            action_idx = rng.randrange(len(actions))
+            cover_list = None
+            if actions[action_idx]["type"] == "COVER":
+                cover_list = random_cover(state["players"][seat]["hand"], int(actions[action_idx]["required_count"]), rng)
+            engine.apply_action(action_idx, cover_list=cover_list, client_version=int(state["version"]))
+
+
+def test_perf_15_hash_ignores_version_and_play_history_but_not_hands() -> None:
+    """PERF-15-02: transpositions share a hash; any hand change alters it; values are process-stable."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=20260219)
+    state = engine.dump_state()
+    base = engine.state_hash()
+    assert base == 0xDA5F974A1D547185
+
+    bumped = dict(state, version=99)
+    assert _fresh_hash(bumped) == base
+
+    moved = engine.dump_state()
+    hand0 = moved["players"][0]["hand"]
+    hand1 = moved["players"][1]["hand"]
+    card_type = next(iter(hand0))
+    hand0[card_type] -= 1
+    if hand0[card_type] == 0:
+        del hand0[card_type]
+    hand1[card_type] = hand1.get(card_type, 0) + 1
+    assert _fresh_hash(moved) != base
@@ -0,0 +1,126 @@
+"""PERF-16 tests: perfect-information endgame solver."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _recorded_states(seed: int) -> list[dict]:
+    from engine.bench import random_playout
+
+    record: list[dict] = []
+    random_playout(seed, record=record)
+    return [entry["state"] for entry in record]
+
+
+def _naive_outcome(state: dict) -> tuple:
+    """Plain max^n without memoization, over every cover the rules accept."""
+
+    from engine.core import XianqiGameEngine
+    from engine.combos import enumerate_covers
+
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    if state["phase"] == "settlement":
+        return tuple(row["delta"] for row in engine.settle()["settlement"]["chip_delta_by_seat"])
+    seat = state["turn"]["current_seat"]
+    legal = engine.get_legal_actions(seat)["actions"]
+    if not legal:
+        engine.force_phase("settlement")
+        return tuple(row["delta"] for row in engine.settle()["settlement"]["chip_delta_by_seat"])
+    best = None
+    for action_idx, action in enumerate(legal):
+        covers = [None]
+        if action["type"] == "COVER":
+            covers = enumerate_covers(state["players"][seat]["hand"], action["required_count"])
+        for cover in covers:
+            child = XianqiGameEngine()
+            child.load_state(state)
+            child.apply_action(action_idx, cover_list=cover)
+            outcome = _naive_outcome(child.dump_state())
+            if best is None or outcome[seat] > best[seat]:
+                best = outcome
+    return best
+
+
+def test_perf_16_solver_matches_naive_search_on_endgames() -> None:
+    """PERF-16-01: memoized, ordered search returns the same outcome as a naive max^n search."""
+
+    from engine.solver import solve
+
+    checked = 0
+    for seed in (2, 5, 11):
+        states = _recorded_states(seed)
+        for state in states[-9:]:
+            result = solve(state)
+            assert result["complete"] is True
+            assert tuple(result["chip_delta_by_seat"]) == _naive_outcome(state)
+            assert sum(result["chip_delta_by_seat"]) == 0
+            checked += 1
+    assert checked == 27
+
+
+def test_perf_16_principal_variation_reaches_the_solved_outcome() -> None:
+    """PERF-16-02: replaying the principal variation settles with the solved chip deltas."""
+
+    from engine.core import XianqiGameEngine
+    from engine.solver import solve
+
+    state = _recorded_states(5)[-14]
+    result = solve(state)
+    assert result["best_action"] == result["principal_variation"][0]
+
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    for step in result["principal_variation"]:
+        assert engine.get_public_state()["turn"]["current_seat"] == step["seat"]
+        engine.apply_action(step["action_idx"], cover_list=step["cover_list"])
+    deltas = [row["delta"] for row in engine.settle()["settlement"]["chip_delta_by_seat"]]
+    assert deltas == result["chip_delta_by_seat"]
+
+
+def test_perf_16_solver_reports_counters_and_respects_time_budget() -> None:
+    """PERF-16-03: counters are filled in and an exhausted budget yields an incomplete result."""
+
+    from engine.solver import Solver, solve
+
+    states = _recorded_states(5)
+    result = solve(states[-10])
+    assert result["nodes"] > result["leaves"] > 0
+    assert result["tt_size"] > 0
+    assert result["nodes_per_sec"] > 0
+
+    partial = Solver(time_budget=0.0).solve(states[0])
+    assert partial["complete"] is False
+    assert partial["chip_delta_by_seat"] is None
+    assert partial["best_action"] is None
+    assert partial["nodes"] >= 1024
+
+
+def test_perf_16_dead_ends_score_as_forced_settlement() -> None:
+    """PERF-16-04: a line that ends with no legal action is worth the backend's forced settlement, not a draw."""
+
+    from engine.bench import random_playout
+    from engine.core import XianqiGameEngine
+    from engine.solver import solve
+
+    record: list[dict] = []
+    final = random_playout(11, record=record).dump_state()
+    assert final["phase"] == "in_round"
+    assert all(not player["hand"] for player in final["players"])
+
+    engine = XianqiGameEngine()
+    engine.load_state(final)
+    engine.force_phase("settlement", reason="no_legal_actions")
+    forced = [row["delta"] for row in engine.settle()["settlement"]["chip_delta_by_seat"]]
+    assert forced == [4, -1, -3]
+
+    result = solve(record[-1]["state"])
+    assert result["stuck"] > 0
+    assert result["chip_delta_by_seat"] == forced
+    assert solve(final)["chip_delta_by_seat"] == forced
@@ -0,0 +1,185 @@
+"""PERF-17 tests: hidden-hand sampler and ISMCTS bot."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _recorded_states(seed: int) -> list[dict]:
+    from engine.bench import random_playout
+
+    record: list[dict] = []
+    random_playout(seed, record=record)
+    return [entry["state"] for entry in record]
+
+
+def _observation(state: dict, rng: random.Random) -> dict:
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    seat = int(state["turn"]["current_seat"])
+    return {
+        "seat": seat,
+        "public_state": engine.get_public_state(),
+        "private_state": engine.get_private_state(seat),
+        "legal_actions": engine.get_legal_actions(seat),
+        "rng": rng,
+    }
+
+
+def _play(seed: int, ismcts_seat: int, iterations: int) -> int | None:
+    from engine.bots import RandomBot
+    from engine.bots.ismcts import ISMCTSBot
+    from engine.core import XianqiGameEngine
+
+    bots = [RandomBot(), RandomBot(), RandomBot()]
+    bots[ismcts_seat] = ISMCTSBot(seed, budget_ms=None, max_iterations=iterations)
+    rngs = [random.Random(seed * 3 + seat) for seat in range(3)]
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=seed)
+    while engine.get_public_state()["phase"] != "settlement":
+        public_state = engine.get_public_state()
+        seat = int(public_state["turn"]["current_seat"])
+        legal_actions = engine.get_legal_actions(seat)
+        if not legal_actions["actions"]:
+            return None
+        observation = {
+            "seat": seat,
+            "public_state": public_state,
+            "private_state": engine.get_private_state(seat),
+            "legal_actions": legal_actions,
+            "rng": rngs[seat],
+        }
+        action_idx, cover_list = bots[seat].choose_action(observation)
+        engine.apply_action(action_idx, cover_list=cover_list)
+    return engine.settle()["settlement"]["chip_delta_by_seat"][ismcts_seat]["delta"]
+
+
+def test_perf_17_sampled_state_matches_the_seat_view() -> None:
+    """PERF-17-01: every sampled deal reproduces the seat's public/private view and legal actions."""
+
+    from engine.core import XianqiGameEngine
+    from engine.sampling import hidden_cards, sample_state
+
+    varied = 0
+    for seed in (2, 5):
+        for state in _recorded_states(seed):
+            observation = _observation(state, random.Random(0))
+            seat = observation["seat"]
+            hidden = hidden_cards(observation["public_state"], observation["private_state"])
+            deals = set()
+            for sample_seed in range(4):
+                sampled = sample_state(
+                    observation["public_state"], observation["private_state"], seat, random.Random(sample_seed)
+                )
+                engine = XianqiGameEngine()
+                engine.load_state(sampled)
+                assert engine.get_public_state() == observation["public_state"]
+                assert engine.get_private_state(seat) == observation["private_state"]
+                assert engine.get_legal_actions(seat) == observation["legal_actions"]
+                other_cards: dict[str, int] = {}
+                for other in range(3):
+                    if other == seat:
+                        continue
+                    for cards in (sampled["players"][other]["hand"], engine.get_private_state(other)["covered"]):
+                        for card_type, count in cards.items():
+                            other_cards[card_type] = other_cards.get(card_type, 0) + count
+                assert other_cards == hidden
+                deals.add(repr([sampled["players"][other]["hand"] for other in range(3)]))
+            varied += len(deals) > 1
+    assert varied > 30
+
+
+def test_perf_17_batch_engine_loads_recorded_states() -> None:
+    """PERF-17-02: BatchXianqiEngine.from_states continues exactly where the dict states are."""
+
+    from engine.batch import BatchXianqiEngine, _conformance_view, _pillar_view
+    from engine.bench import random_playout
+    from engine.settlements import settlement_deltas
+
+    states: list[dict] = []
+    finals: list[dict] = []
+    for seed in range(8):
+        states.extend(_recorded_states(seed))
+        final = random_playout(seed).dump_state()
+        if final["phase"] == "settlement":
+            finals.append(final)
+
+    batch = BatchXianqiEngine.from_states(states)
+    for game, state in enumerate(states):
+        assert _conformance_view(batch.to_state(game)) == _conformance_view(state)
+        assert batch._pillar_view(game) == _pillar_view(state)
+
+    deltas = BatchXianqiEngine.from_states(finals).settle()
+    for game, state in enumerate(finals):
+        assert [row["delta"] for row in settlement_deltas(state)] == [int(value) for value in deltas[game]]
+
+
+def test_perf_17_ismcts_is_reproducible_and_reports_playouts() -> None:
+    """PERF-17-03: a fixed iteration count and rng give the same legal choice on both playout paths."""
+
+    from engine.bots.ismcts import ISMCTSBot
+
+    state = _recorded_states(5)[4]
+    for batched in (True, False):
+        choices = []
+        for _ in range(2):
+            bot = ISMCTSBot(0, budget_ms=None, max_iterations=40, batch_size=8, batched=batched)
+            observation = _observation(state, random.Random(11))
+            choices.append(bot.choose_action(observation))
+            assert bot.last_report["iterations"] == 40
+            assert bot.report()["playouts"] == 40
+            assert bot.report()["batched"] is batched
+        assert choices[0] == choices[1]
+        assert 0 <= choices[0][0] < len(observation["legal_actions"]["actions"])
+
+
+def test_perf_17_ismcts_respects_time_budget() -> None:
+    """PERF-17-04: move latency stays near the millisecond budget."""
+
+    import time
+
+    from engine.bots import create_bot
+    from engine.bots.ismcts import ISMCTSBot
+
+    assert isinstance(create_bot("ismcts"), ISMCTSBot)
+    bot = ISMCTSBot(0, budget_ms=30, batch_size=4)
+    state = _recorded_states(5)[0]
+    started = time.perf_counter()
+    bot.choose_action(_observation(state, random.Random(3)))
+    assert time.perf_counter() - started < 0.5
+    assert bot.last_report["iterations"] >= 4
+    assert bot.report()["playouts_per_sec"] > 0
+
+
+def test_perf_17_ismcts_beats_random_players() -> None:
+    """PERF-17-05: a small search already wins chips from random opponents."""
+
+    results = [_play(seed, seed % 3, 48) for seed in range(9)]
+    settled = [delta for delta in results if delta is not None]
+    assert len(settled) >= 6
+    assert sum(settled) > 0
+
+
+def test_perf_17_stuck_playouts_score_forced_settlement() -> None:
+    """PERF-17-06: playouts ending with no legal action back up the forced settlement, not zeros."""
+
+    from engine.bench import random_playout
+    from engine.bots.ismcts import batch_rollout, rollout
+    from engine.serializer import load_state
+
+    final = random_playout(11).dump_state()
+    assert final["phase"] == "in_round"
+
+    assert rollout(load_state(final), random.Random(0)) == [4, -1, -3]
+    pytest.importorskip("numpy")
+    assert batch_rollout([load_state(final), load_state(final)], random.Random(0)) == [[4, -1, -3], [4, -1, -3]]
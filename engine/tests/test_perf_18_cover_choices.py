@@ -0,0 +1,141 @@
+"""PERF-18 tests: distinct cover-choice enumeration with dominance pruning."""
+
+from __future__ import annotations
+
+from itertools import combinations
+from pathlib import Path
+import random
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _random_hands(count: int, seed: int) -> list[dict[str, int]]:
+    from engine.cards import DECK_TEMPLATE
+
+    deck = [card_type for card_type, copies in DECK_TEMPLATE.items() for _ in range(copies)]
+    rng = random.Random(seed)
+    hands = []
+    for _ in range(count):
+        hand: dict[str, int] = {}
+        for card_type in rng.sample(deck, rng.randint(1, 8)):
+            hand[card_type] = hand.get(card_type, 0) + 1
+        hands.append(hand)
+    return hands
+
+
+def _key(cover: dict[str, int]) -> tuple:
+    return tuple(sorted(cover.items()))
+
+
+def test_perf_18_covers_are_the_distinct_k_subsets() -> None:
+    """PERF-18-01: enumerate_covers yields every distinct multiset once, weakest total power first."""
+
+    from engine.bots import expand_hand
+    from engine.cards import CARD_POWER
+    from engine.combos import enumerate_covers
+
+    for hand in _random_hands(300, 0):
+        for required_count in (1, 2, 3):
+            covers = enumerate_covers(hand, required_count)
+            expected = set()
+            for picked in combinations(expand_hand(hand), required_count):
+                cover: dict[str, int] = {}
+                for card_type in picked:
+                    cover[card_type] = cover.get(card_type, 0) + 1
+                expected.add(_key(cover))
+            keys = [_key(cover) for cover in covers]
+            assert len(keys) == len(set(keys))
+            assert set(keys) == expected
+            powers = [sum(CARD_POWER[card_type] * count for card_type, count in cover.items()) for cover in covers]
+            assert powers == sorted(powers)
+
+    covers = enumerate_covers({"R_SHI": 1, "B_NIU": 3, "R_MA": 1}, 2)
+    assert len(covers) == 4
+    assert covers[0] == {"B_NIU": 2}
+    assert covers[-1] == {"R_SHI": 1, "R_MA": 1}
+    assert enumerate_covers({"R_SHI": 1}, 2) == []
+
+
+def test_perf_18_pruning_only_drops_stronger_loose_cards() -> None:
+    """PERF-18-02: pruned covers are a non-empty subset that never breaks up a possible combo choice."""
+
+    from engine.combos import enumerate_covers
+
+    full_total = 0
+    pruned_total = 0
+    for hand in _random_hands(300, 1):
+        for required_count in (1, 2, 3):
+            full = enumerate_covers(hand, required_count)
+            pruned = enumerate_covers(hand, required_count, prune_dominated=True)
+            assert bool(pruned) == bool(full)
+            assert all(cover in full for cover in pruned)
+            full_total += len(full)
+            pruned_total += len(pruned)
+    assert pruned_total * 2 < full_total
+
+    hand = {"R_SHI": 1, "B_NIU": 3, "R_MA": 1, "B_CHE": 1}
+    assert enumerate_covers(hand, 2, prune_dominated=True) == [
+        {"B_NIU": 2},
+        {"B_CHE": 1, "B_NIU": 1},
+        {"B_CHE": 1, "R_MA": 1},
+    ]
+    # A dog pair and a same-type pair stay intact choices; equal powers are not strict dominance.
+    assert enumerate_covers({"R_GOU": 1, "B_GOU": 1, "R_CHE": 1, "B_MA": 1}, 1, prune_dominated=True) == [
+        {"B_GOU": 1},
+        {"R_CHE": 1},
+        {"R_GOU": 1},
+    ]
+    assert {"R_SHI": 1} in enumerate_covers({"R_SHI": 2, "R_MA": 1}, 1, prune_dominated=True)
+
+
+def test_perf_18_engine_cover_choices_are_accepted_by_apply_action() -> None:
+    """PERF-18-03: XianqiGameEngine.get_cover_choices lists covers only when COVER is legal."""
+
+    from engine.bench import random_playout
+    from engine.core import XianqiGameEngine
+
+    seen_cover = 0
+    for seed in range(6):
+        record: list[dict] = []
+        random_playout(seed, record=record)
+        for entry in record:
+            state = entry["state"]
+            engine = XianqiGameEngine()
+            engine.load_state(state)
+            seat = int(state["turn"]["current_seat"])
+            actions = engine.get_legal_actions(seat)["actions"]
+            choices = engine.get_cover_choices(seat)
+            assert engine.get_cover_choices((seat + 1) % 3) == []
+            if [action["type"] for action in actions] != ["COVER"]:
+                assert choices == []
+                continue
+            seen_cover += 1
+            assert engine.get_cover_choices(seat, prune_dominated=True)
+            for cover_list in choices:
+                candidate = XianqiGameEngine()
+                candidate.load_state(state)
+                candidate.apply_action(0, cover_list=cover_list)
+    assert seen_cover > 10
+
+
+def test_perf_18_pruned_solver_searches_fewer_nodes() -> None:
+    """PERF-18-04: solving with pruned covers shrinks the search tree."""
+
+    from engine.bench import random_playout
+    from engine.solver import solve
+
+    full_nodes = 0
+    pruned_nodes = 0
+    for seed in (2, 5, 11):
+        record: list[dict] = []
+        random_playout(seed, record=record)
+        for entry in record[-8:]:
+            full = solve(entry["state"])
+            pruned = solve(entry["state"], prune_covers=True)
+            assert full["complete"] and pruned["complete"]
+            full_nodes += full["nodes"]
+            pruned_nodes += pruned["nodes"]
+    assert pruned_nodes < full_nodes
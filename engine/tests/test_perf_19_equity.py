@@ -0,0 +1,148 @@
+"""PERF-19 tests: parallel equity estimator."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _views(seed: int, step: int) -> tuple[dict, dict, dict]:
+    from engine.bench import random_playout
+    from engine.core import XianqiGameEngine
+
+    record: list[dict] = []
+    random_playout(seed, record=record)
+    state = record[step]["state"]
+    engine = XianqiGameEngine()
+    engine.load_state(state)
+    seat = int(state["turn"]["current_seat"])
+    return state, engine.get_private_state(seat), engine.get_public_state()
+
+
+def test_perf_19_equity_is_seeded_and_independent_of_worker_count() -> None:
+    """PERF-19-01: the same seed gives identical estimates in-process and on a pool."""
+
+    from engine.analysis import equity
+
+    _, private_state, public_state = _views(5, 20)
+    single = equity(private_state, public_state, 200, seed=3, workers=1)
+    pooled = equity(private_state, public_state, 200, seed=3, workers=2)
+    assert single["actions"] == pooled["actions"]
+    assert single["samples"] == 200
+    assert single["samples_per_sec"] > 0
+    assert single["playouts_per_sec"] >= single["samples_per_sec"]
+
+    other = equity(private_state, public_state, 200, seed=4, workers=1)
+    assert [action["mean"] for action in other["actions"]] != [action["mean"] for action in single["actions"]]
+
+
+def test_perf_19_equity_lists_every_move_with_standard_error() -> None:
+    """PERF-19-02: each legal move gets a mean and a standard error that shrinks with samples."""
+
+    from engine.actions import get_legal_actions
+    from engine.analysis import equity
+
+    state, private_state, public_state = _views(5, 20)
+    small = equity(private_state, public_state, 64, workers=1)
+    large = equity(private_state, public_state, 512, workers=1)
+    seat = int(state["turn"]["current_seat"])
+    legal_count = len(get_legal_actions(state, seat)["actions"])
+    assert [action["action_idx"] for action in large["actions"]] == list(range(legal_count))
+    assert sum(action["samples"] for action in large["actions"]) + large["unsettled"] == 512 * legal_count
+    for small_action, large_action in zip(small["actions"], large["actions"]):
+        assert 0 < large_action["stderr"] < small_action["stderr"]
+
+
+def test_perf_19_equity_is_exact_one_move_before_settlement() -> None:
+    """PERF-19-03: when the move ends the game every sample agrees with the real settlement."""
+
+    from engine.analysis import equity
+    from engine.core import XianqiGameEngine
+
+    state, private_state, public_state = _views(5, -1)
+    seat = int(state["turn"]["current_seat"])
+    result = equity(private_state, public_state, 32, workers=1)
+    for action in result["actions"]:
+        engine = XianqiGameEngine()
+        engine.load_state(state)
+        engine.apply_action(action["action_idx"], cover_list=action["cover_list"])
+        expected = engine.settle()["settlement"]["chip_delta_by_seat"][seat]["delta"]
+        assert action["mean"] == expected
+        assert action["stderr"] == 0.0
+
+
+def test_perf_19_equity_splits_covers_and_accepts_bot_policies() -> None:
+    """PERF-19-04: COVER is scored per undominated cover list; policies are bot specs."""
+
+    from engine.analysis import equity
+    from engine.bench import random_playout
+    from engine.core import XianqiGameEngine
+
+    cover_views = None
+    for seed in range(10):
+        record: list[dict] = []
+        random_playout(seed, record=record)
+        for entry in record:
+            state = entry["state"]
+            engine = XianqiGameEngine()
+            engine.load_state(state)
+            seat = int(state["turn"]["current_seat"])
+            if len(engine.get_cover_choices(seat, prune_dominated=True)) > 1:
+                cover_views = (engine, seat)
+                break
+        if cover_views is not None:
+            break
+    assert cover_views is not None
+    engine, seat = cover_views
+    result = equity(engine.get_private_state(seat), engine.get_public_state(), 16, policy="greedy", workers=1)
+    assert [action["cover_list"] for action in result["actions"]] == engine.get_cover_choices(
+        seat, prune_dominated=True
+    )
+
+    with pytest.raises(ValueError):
+        equity(engine.get_private_state(seat), engine.get_public_state(), 16, policy="no-such-bot", workers=1)
+    with pytest.raises(ValueError, match="ENGINE_INVALID_CONFIG"):
+        equity(engine.get_private_state(seat), engine.get_public_state(), 0, workers=1)
+
+
+def test_perf_19_equity_defaults_to_in_process_weakest_cover_rollouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PERF-19-05: equity() starts no pool by default; "random" is the RandomBot policy, not the fast path."""
+
+    import engine.analysis as analysis
+
+    _, private_state, public_state = _views(seed=2, step=6)
+
+    def no_pool(*_args, **_kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("equity() must not start a process pool by default")
+
+    monkeypatch.setattr(analysis, "get_context", no_pool)
+
+    assert analysis.DEFAULT_POLICY == "random_weakest_cover"
+    default = analysis.equity(private_state, public_state, 32, seed=5)
+    explicit = analysis.equity(private_state, public_state, 32, policy="random_weakest_cover", seed=5)
+    assert explicit["actions"] == default["actions"]
+    bot = analysis.equity(private_state, public_state, 32, policy="random", seed=5)
+    assert [action["action_idx"] for action in bot["actions"]] == [
+        action["action_idx"] for action in default["actions"]
+    ]
+
+
+def test_perf_19_dead_end_playouts_count_as_forced_settlement() -> None:
+    """PERF-19-06: playouts stuck with no legal action are scored as the forced settlement, not dropped."""
+
+    from engine.analysis import equity
+
+    state, private_state, public_state = _views(seed=11, step=-1)
+    assert state["turn"]["current_seat"] == 0
+
+    for policy in ("random_weakest_cover", "random"):
+        result = equity(private_state, public_state, 16, policy=policy, seed=1)
+        assert result["unsettled"] == 0
+        assert [action["samples"] for action in result["actions"]] == [16, 16]
+        assert all(action["mean"] >= 4.0 for action in result["actions"])
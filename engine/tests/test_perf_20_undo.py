@@ -0,0 +1,110 @@
+"""PERF-20 tests: reversible undo records from the reducer."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _deps(legal: dict) -> dict:
+    from engine.combos import combo_table_packed
+
+    return {"get_legal_actions": lambda _seat: legal, "combo_table": combo_table_packed}
+
+
+def _fresh_state(seed: int) -> dict:
+    from engine.core import XianqiGameEngine
+    from engine.serializer import load_state
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=seed)
+    return load_state(engine.dump_state())
+
+
+def test_perf_20_01_undo_restores_every_step_in_reverse() -> None:
+    """PERF-20-01: undoing a random game step by step reproduces each earlier state and index."""
+
+    from engine.actions import get_legal_actions
+    from engine.bots import random_cover
+    from engine.indexes import INDEX_KEY, build_state_index, get_state_hash
+    from engine.reducer import reduce_apply_action, undo
+
+    for seed in range(12):
+        rng = random.Random(seed)
+        state = _fresh_state(seed)
+        snapshots: list[tuple[dict, int]] = []
+        undo_log: list = []
+        while state["phase"] != "settlement":
+            seat = state["turn"]["current_seat"]
+            legal = get_legal_actions(state, seat)
+            if not legal["actions"]:
+                break
+            action_idx = rng.randrange(len(legal["actions"]))
+            action = legal["actions"][action_idx]
+            cover_list = None
+            if action["type"] == "COVER":
+                cover_list = random_cover(state["players"][seat]["hand"], action["required_count"], rng)
+            snapshots.append((copy.deepcopy(state), get_state_hash(state)))
+            reduce_apply_action(
+                state=state,
+                action_idx=action_idx,
+                cover_list=cover_list,
+                client_version=None,
+                deps=_deps(legal),
+                undo_log=undo_log,
+            )
+
+        assert len(undo_log) == len(snapshots) > 0
+        while undo_log:
+            undo(state, undo_log.pop())
+            expected, expected_hash = snapshots.pop()
+            assert state == expected
+            assert state[INDEX_KEY] == build_state_index(state)
+            assert get_state_hash(state) == expected_hash
+
+
+def test_perf_20_02_rejected_action_leaves_state_untouched() -> None:
+    """PERF-20-02: a rejected action with an undo log changes neither state nor log."""
+
+    from engine.actions import get_legal_actions
+    from engine.reducer import reduce_apply_action
+
+    state = _fresh_state(3)
+    before = copy.deepcopy(state)
+    legal = get_legal_actions(state, state["turn"]["current_seat"])
+    undo_log: list = []
+    with pytest.raises(ValueError):
+        reduce_apply_action(
+            state=state,
+            action_idx=len(legal["actions"]),
+            cover_list=None,
+            client_version=None,
+            deps=_deps(legal),
+            undo_log=undo_log,
+        )
+    assert state == before
+    assert undo_log == []
+
+
+def test_perf_20_03_records_are_optional() -> None:
+    """PERF-20-03: without undo_log the reducer behaves exactly as before."""
+
+    from engine.actions import get_legal_actions
+    from engine.reducer import reduce_apply_action
+
+    plain = _fresh_state(5)
+    logged = _fresh_state(5)
+    undo_log: list = []
+    for state, log in ((plain, None), (logged, undo_log)):
+        legal = get_legal_actions(state, state["turn"]["current_seat"])
+        reduce_apply_action(state=state, action_idx=0, cover_list=None, client_version=None, deps=_deps(legal), undo_log=log)
+    assert plain == logged
+    assert len(undo_log) == 1
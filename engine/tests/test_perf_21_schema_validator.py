@@ -0,0 +1,112 @@
+"""PERF-21 tests: compiled state schema validator and bulk validation."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _recorded_states(seeds: range) -> list[dict]:
+    from engine.bench import random_playout
+
+    states: list[dict] = []
+    for seed in seeds:
+        record: list[dict] = []
+        random_playout(seed, record=record)
+        states.extend(entry["state"] for entry in record)
+    return states
+
+
+def test_perf_21_01_recorded_states_are_valid() -> None:
+    """PERF-21-01: every state of recorded games passes validation and loads."""
+
+    from engine.serializer import load_state, validate_states
+
+    states = _recorded_states(range(4))
+    assert all(violations == [] for violations in validate_states(states))
+    for state in states:
+        assert load_state(state) is not state
+
+
+def test_perf_21_02_violations_carry_paths() -> None:
+    """PERF-21-02: each broken field is reported once with its dotted path."""
+
+    from engine.serializer import validate_state
+
+    state = copy.deepcopy(_recorded_states(range(2, 3))[-2])
+    state["players"][1]["hand"] = {"R_SHI": -1}
+    state["turn"]["plays"] = [{"seat": 0, "power": 9, "cards": [{"type": "R_SHI", "count": 1}]}]
+    state["reveal"]["pending_order"] = [1, 1]
+    del state["reveal"]["relations"]
+
+    assert [str(violation) for violation in validate_state(state)] == [
+        "state.players[1].hand.R_SHI must not be negative",
+        "state.turn.plays[0].cards must be CardCountMap object",
+        "state.reveal.relations is required",
+        "state.reveal.pending_order must not contain duplicates",
+    ]
+
+
+def test_perf_21_03_bulk_validation_streams_without_copying() -> None:
+    """PERF-21-03: validate_states is lazy, keeps input order and leaves states untouched."""
+
+    from engine.serializer import validate_states
+
+    states = _recorded_states(range(1))
+    broken = copy.deepcopy(states[0])
+    broken["players"].reverse()
+    before = copy.deepcopy(states)
+    consumed: list[int] = []
+
+    def stream():
+        for idx, state in enumerate([*states, broken]):
+            consumed.append(idx)
+            yield state
+
+    results = validate_states(stream())
+    assert consumed == []
+    first = next(results)
+    assert first == [] and consumed == [0]
+    rest = list(results)
+    assert all(violations == [] for violations in rest[:-1])
+    assert [violation.path for violation in rest[-1]] == ["state.players[0].seat", "state.players[2].seat"]
+    assert states == before
+
+
+def test_perf_21_04_load_state_raises_first_violation() -> None:
+    """PERF-21-04: load_state keeps failing fast with AssertionError naming the path."""
+
+    from engine.schema import compile_schema
+    from engine.serializer import load_state
+
+    state = copy.deepcopy(_recorded_states(range(1))[0])
+    state["pillar_groups"] = [{"round_index": 0, "winner_seat": 1, "round_kind": 1, "plays": [], "pillars": []}]
+    with pytest.raises(AssertionError, match=r"state\.pillar_groups\[0\]\.pillars"):
+        load_state(state)
+    with pytest.raises(ValueError):
+        compile_schema({"type": "tuple"})
+
+
+def test_perf_21_05_card_maps_reject_unknown_types_and_overflowing_counts() -> None:
+    """PERF-21-05: card maps only accept engine card types with counts that fit a packed lane."""
+
+    from engine.cards import MAX_LANE_COUNT
+    from engine.serializer import load_state, validate_state
+
+    state = copy.deepcopy(_recorded_states(range(1))[0])
+    state["players"][0]["hand"] = {"X_FOO": 1, "R_SHI": MAX_LANE_COUNT}
+    state["players"][2]["hand"] = {"B_NIU": MAX_LANE_COUNT + 1}
+
+    assert [str(violation) for violation in validate_state(state)] == [
+        "state.players[0].hand.X_FOO is not a known card type",
+        f"state.players[2].hand.B_NIU must be at most {MAX_LANE_COUNT}",
+    ]
+    with pytest.raises(AssertionError, match=r"state\.players\[0\]\.hand\.X_FOO"):
+        load_state(state)
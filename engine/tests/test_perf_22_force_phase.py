@@ -0,0 +1,150 @@
+"""PERF-22 tests: phase override with version bump, log record and replay."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_perf_22_01_force_phase_bumps_version_and_refreshes_views() -> None:
+    """PERF-22-01: force_phase flips only phase/version and cached projections follow."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=7)
+    before = engine.dump_state()
+    seat = before["turn"]["current_seat"]
+    assert engine.get_legal_actions(seat)["actions"]
+    old_hash = engine.state_hash()
+
+    assert engine.force_phase("settlement") == before["version"] + 1
+
+    after = engine.dump_state()
+    assert after == {**before, "phase": "settlement", "version": before["version"] + 1}
+    assert engine.get_public_state()["phase"] == "settlement"
+    assert engine.get_legal_actions(seat)["actions"] == []
+    assert engine.state_hash() != old_hash
+    assert engine.settle()["settlement"]["chip_delta_by_seat"]
+
+
+def test_perf_22_02_force_phase_rejects_unknown_phase() -> None:
+    """PERF-22-02: unknown phases and uninitialized engines are rejected without changes."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    with pytest.raises(RuntimeError):
+        engine.force_phase("settlement")
+    engine.init_game({"player_count": 3}, rng_seed=7)
+    before = engine.dump_state()
+    with pytest.raises(ValueError, match="ENGINE_INVALID_PHASE"):
+        engine.force_phase("finished")
+    assert engine.dump_state() == before
+
+
+@pytest.mark.parametrize("writer", ["sync", "async"])
+def test_perf_22_03_force_phase_is_logged(tmp_path: Path, writer: str) -> None:
+    """PERF-22-03: the override lands in override.jsonl next to the new version's snapshot."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import read_override_log, read_state_snapshot
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "log_path": str(tmp_path), "log_writer": writer}, rng_seed=7)
+    version = engine.force_phase("settlement", reason="no_legal_actions")
+    engine.flush_logs()
+
+    assert read_override_log(tmp_path) == [
+        {
+            "from_version": 1,
+            "to_version": version,
+            "from_phase": "buckle_flow",
+            "to_phase": "settlement",
+            "reason": "no_legal_actions",
+        }
+    ]
+    assert read_state_snapshot(tmp_path, version)["global"]["phase"] == "settlement"
+
+    engine.init_game({"player_count": 3, "log_path": str(tmp_path), "log_writer": writer}, rng_seed=8)
+    engine.flush_logs()
+    assert read_override_log(tmp_path) == []
+
+
+def _play_with_override(log_dir: Path, seed: int, override_after: int, phases: tuple[str | None, ...]) -> None:
+    """Play with GreedyBot, forcing phases in turn after override_after actions (None restores the prior phase)."""
+
+    from engine.bots import GreedyBot
+    from engine.core import XianqiGameEngine
+
+    bot = GreedyBot()
+    with XianqiGameEngine() as engine:
+        engine.init_game({"player_count": 3, "log_path": str(log_dir)}, rng_seed=seed)
+        steps = 0
+        while engine.get_public_state()["phase"] != "settlement":
+            if steps == override_after:
+                original = engine.get_public_state()["phase"]
+                for phase in phases:
+                    engine.force_phase(phase or original, reason="host_override")
+                override_after = -1
+                continue
+            seat = int(engine.get_public_state()["turn"]["current_seat"])
+            action_idx, cover_list = bot.choose_action(
+                {"legal_actions": engine.get_legal_actions(seat), "private_state": engine.get_private_state(seat)}
+            )
+            engine.apply_action(action_idx, cover_list=cover_list, client_version=int(engine.dump_state()["version"]))
+            steps += 1
+        engine.settle()
+
+
+@pytest.mark.parametrize(("override_after", "phases"), [(4, ("settlement",)), (3, ("settlement", None))])
+def test_perf_22_04_overrides_survive_export_replay_and_verify(
+    tmp_path: Path, override_after: int, phases: tuple[str | None, ...]
+) -> None:
+    """PERF-22-04: forced settlement and mid-game overrides are exported to .xqr and verify cleanly."""
+
+    from engine.game_logger import read_override_log
+    from engine.replay import read_replay, replay_from_log_dir, replay_to_log_dir, run_replay, write_replay
+    from engine.verify import verify_game
+
+    log_dir = tmp_path / "log"
+    _play_with_override(log_dir, seed=5, override_after=override_after, phases=phases)
+    replay = replay_from_log_dir(log_dir, seed=5, version_digests=True)
+    expected_overrides = [(override_after, "host_override")] * len(phases)
+    assert [(item.after_actions, item.reason) for item in replay.overrides] == expected_overrides
+    write_replay(tmp_path / "game.xqr", replay)
+    assert read_replay(tmp_path / "game.xqr") == replay
+
+    for path in (log_dir, tmp_path / "game.xqr"):
+        result = verify_game(path)
+        assert result["ok"] is True, result
+        assert result["versions_checked"] == len(replay.actions) + len(phases) + 1
+
+    engine = run_replay(replay)
+    assert engine.get_public_state()["phase"] == "settlement"
+    replay_to_log_dir(replay, tmp_path / "again").close()
+    assert read_override_log(tmp_path / "again") == read_override_log(log_dir)
+
+
+def test_perf_22_05_forcing_the_current_phase_is_a_no_op(tmp_path: Path) -> None:
+    """PERF-22-05: force_phase to the phase already in effect keeps the version and logs nothing."""
+
+    from engine.core import XianqiGameEngine
+    from engine.game_logger import read_override_log
+
+    with XianqiGameEngine() as engine:
+        engine.init_game({"player_count": 3, "log_path": str(tmp_path), "state_log_format": "delta"}, rng_seed=7)
+        before = engine.dump_state()
+
+        assert engine.force_phase(before["phase"], reason="noop") == before["version"]
+        assert engine.dump_state() == before
+        assert engine.history_versions() == [before["version"]]
+        engine.flush_logs()
+        assert read_override_log(tmp_path) == []
+        assert len((tmp_path / "states.jsonl").read_text(encoding="utf-8").splitlines()) == 1
@@ -0,0 +1,95 @@
+"""PERF-23 tests: versions that share unchanged subtrees with their predecessor."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import random
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play_step(engine, rng: random.Random) -> bool:
+    from engine.bots import weakest_cover
+
+    state = engine._state
+    if state["phase"] == "settlement":
+        return False
+    seat = state["turn"]["current_seat"]
+    actions = engine.get_legal_actions(seat)["actions"]
+    if not actions:
+        return False
+    action_idx = rng.randrange(len(actions))
+    cover_list = None
+    if actions[action_idx]["type"] == "COVER":
+        cover_list = weakest_cover(state["players"][seat]["hand"], actions[action_idx]["required_count"])
+    engine.apply_action(action_idx=action_idx, cover_list=cover_list)
+    return True
+
+
+def test_perf_23_01_apply_action_keeps_previous_version_intact() -> None:
+    """PERF-23-01: every earlier version object stays unchanged and shares untouched subtrees."""
+
+    from engine.core import XianqiGameEngine
+
+    for seed in range(6):
+        rng = random.Random(seed)
+        engine = XianqiGameEngine()
+        engine.init_game({"player_count": 3}, rng_seed=seed)
+        versions: list[tuple[dict, dict]] = []
+        while True:
+            previous = engine._state
+            versions.append((previous, copy.deepcopy(previous)))
+            if not _play_step(engine, rng):
+                break
+            current = engine._state
+            assert current is not previous
+            acting_seat = previous["turn"]["current_seat"]
+            for seat in range(3):
+                if seat != acting_seat:
+                    assert current["players"][seat]["hand"] is previous["players"][seat]["hand"]
+            for old_group, new_group in zip(previous["pillar_groups"], current["pillar_groups"]):
+                assert new_group is old_group
+
+        for live, snapshot in versions:
+            assert live == snapshot
+
+
+def test_perf_23_02_cached_public_projection_matches_fresh_projection() -> None:
+    """PERF-23-02: reused play/group projections give the same public state as a full rebuild."""
+
+    from engine.core import XianqiGameEngine
+    from engine.serializer import get_public_state
+
+    rng = random.Random(4)
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=4)
+    previous_groups: list = []
+    while _play_step(engine, rng):
+        public_state = engine.get_public_state()
+        assert public_state == get_public_state(engine._state)
+        groups = list(public_state["pillar_groups"])
+        for old_group, new_group in zip(previous_groups, groups):
+            assert new_group is old_group
+        previous_groups = groups
+    assert previous_groups
+
+
+def test_perf_23_03_forks_share_hands_with_their_source() -> None:
+    """PERF-23-03: fork_state copies only what the reducer edits in place."""
+
+    from engine.core import XianqiGameEngine
+    from engine.reducer import fork_state
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=9)
+    state = engine._state
+    fork = fork_state(state)
+    assert fork == state
+    assert all(fork["players"][seat]["hand"] is state["players"][seat]["hand"] for seat in range(3))
+    assert fork["players"][0] is not state["players"][0]
+    assert fork["turn"]["plays"] is not state["turn"]["plays"]
+    assert fork["reveal"]["relations"] is not state["reveal"]["relations"]
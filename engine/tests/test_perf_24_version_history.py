@@ -0,0 +1,100 @@
+"""PERF-24 tests: bounded version history and catch-up queries."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _play(engine, steps: int, seed: int) -> list[tuple[int, dict, list[dict]]]:
+    """Play random moves and return (version, public, privates) seen before each one."""
+
+    from engine.bots import weakest_cover
+
+    rng = random.Random(seed)
+    seen = []
+    for _ in range(steps):
+        public_state = engine.get_public_state()
+        privates = [copy.deepcopy(engine.get_private_state(seat)) for seat in range(3)]
+        seen.append((public_state["version"], copy.deepcopy(public_state), privates))
+        if public_state["phase"] == "settlement":
+            break
+        seat = public_state["turn"]["current_seat"]
+        actions = engine.get_legal_actions(seat)["actions"]
+        if not actions:
+            break
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx]["type"] == "COVER":
+            hand = engine.get_private_state(seat)["hand"]
+            cover_list = weakest_cover(dict(hand), actions[action_idx]["required_count"])
+        engine.apply_action(action_idx=action_idx, cover_list=cover_list)
+    return seen
+
+
+def test_perf_24_01_past_versions_match_what_was_served() -> None:
+    """PERF-24-01: get_*_state(version=N) returns exactly what version N served live."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=11)
+    seen = _play(engine, 40, seed=11)
+    assert len(seen) > 10
+    for version, public_state, privates in seen:
+        assert engine.get_public_state(version=version) == public_state
+        for seat in range(3):
+            assert engine.get_private_state(seat, version=version) == privates[seat]
+
+
+def test_perf_24_02_history_is_bounded_by_history_size() -> None:
+    """PERF-24-02: only the newest history_size versions are kept; older ones are refused."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3, "history_size": 5}, rng_seed=11)
+    _play(engine, 20, seed=11)
+    current = engine.get_public_state()["version"]
+    assert engine.history_versions() == list(range(current - 4, current + 1))
+    with pytest.raises(ValueError, match="ENGINE_VERSION_UNAVAILABLE"):
+        engine.get_public_state(version=current - 5)
+    with pytest.raises(ValueError, match="ENGINE_VERSION_UNAVAILABLE"):
+        engine.get_private_state(0, version=current + 1)
+
+    with pytest.raises(ValueError, match="ENGINE_INVALID_CONFIG"):
+        XianqiGameEngine().init_game({"player_count": 3, "history_size": -1})
+    disabled = XianqiGameEngine()
+    disabled.init_game({"player_count": 3, "history_size": 0}, rng_seed=11)
+    _play(disabled, 3, seed=11)
+    assert disabled.history_versions() == []
+    assert disabled.get_public_state(version=disabled.get_public_state()["version"])
+
+
+def test_perf_24_03_changes_since_yields_every_later_version() -> None:
+    """PERF-24-03: changes_since walks the gap in order and ends at the live public state."""
+
+    from engine.core import XianqiGameEngine
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=5)
+    _play(engine, 12, seed=5)
+    current = engine.get_public_state()["version"]
+
+    changes = list(engine.changes_since(current - 4))
+    assert [change["version"] for change in changes] == list(range(current - 3, current + 1))
+    assert changes[-1]["public_state"] == engine.get_public_state()
+    assert list(engine.changes_since(current)) == []
+
+    engine.force_phase("settlement")
+    assert [change["version"] for change in engine.changes_since(current)] == [current + 1]
+    with pytest.raises(ValueError, match="ENGINE_VERSION_UNAVAILABLE"):
+        engine.changes_since(current + 5)
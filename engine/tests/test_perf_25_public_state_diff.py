@@ -0,0 +1,92 @@
+"""PERF-25 tests: public-state patches between successive versions."""
+
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _public_states(seed: int) -> list[dict]:
+    from engine.bots import weakest_cover
+    from engine.core import XianqiGameEngine
+
+    rng = random.Random(seed)
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=seed)
+    states = [engine.get_public_state()]
+    while states[-1]["phase"] != "settlement":
+        seat = states[-1]["turn"]["current_seat"]
+        actions = engine.get_legal_actions(seat)["actions"]
+        if not actions:
+            break
+        action_idx = rng.randrange(len(actions))
+        cover_list = None
+        if actions[action_idx]["type"] == "COVER":
+            hand = dict(engine.get_private_state(seat)["hand"])
+            cover_list = weakest_cover(hand, actions[action_idx]["required_count"])
+        engine.apply_action(action_idx=action_idx, cover_list=cover_list)
+        states.append(engine.get_public_state())
+    return states
+
+
+def test_perf_25_01_patches_round_trip_through_json() -> None:
+    """PERF-25-01: applying each wire-encoded patch to the previous version yields the next one."""
+
+    from engine.serializer import apply_patch, diff_public_state
+
+    for seed in range(8):
+        states = _public_states(seed)
+        client = copy.deepcopy(states[0])
+        for old, new in zip(states, states[1:]):
+            patch = json.loads(json.dumps(diff_public_state(old, new)))
+            assert patch["from_version"] == old["version"]
+            assert patch["to_version"] == new["version"]
+            client = apply_patch(client, patch)
+            assert client == new
+
+
+def test_perf_25_02_patches_are_small_and_append_only() -> None:
+    """PERF-25-02: finished groups and earlier plays never appear in a patch."""
+
+    from engine.serializer import diff_public_state
+
+    full = 0
+    sent = 0
+    for seed in range(4):
+        states = _public_states(seed)
+        for old, new in zip(states, states[1:]):
+            patch = diff_public_state(old, new)
+            for op in patch["ops"]:
+                if op[1][:1] == ["pillar_groups"]:
+                    assert op[0] == "a" and len(op[2]) == 1
+                if op[1][:2] == ["turn", "plays"]:
+                    assert op[0] in ("a", "t")
+            full += len(json.dumps(new))
+            sent += len(json.dumps(patch))
+    assert sent * 2 < full
+
+
+def test_perf_25_03_apply_patch_rejects_wrong_base() -> None:
+    """PERF-25-03: a patch applied to the wrong version is refused and leaves the input alone."""
+
+    from engine.serializer import apply_patch, diff_public_state
+
+    states = _public_states(1)
+    patch = diff_public_state(states[1], states[2])
+    base = copy.deepcopy(states[0])
+    with pytest.raises(ValueError, match="ENGINE_VERSION_CONFLICT"):
+        apply_patch(base, patch)
+    assert base == states[0]
+
+    forged = {**patch, "to_version": patch["to_version"] + 1}
+    with pytest.raises(ValueError, match="ENGINE_VERSION_CONFLICT"):
+        apply_patch(copy.deepcopy(states[1]), forged)
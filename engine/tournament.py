@@ -0,0 +1,270 @@
+"""Multiprocess self-play tournament runner.
+
+Three entrants (bot specs, see ``engine.bots``) play seeded games; game ``i``
+uses ``rng_seed = seed + i`` and rotates the entrants across seats so every
+entrant sits in every seat equally often. Games are independent, so they are
+spread over a process pool and each per-game result is streamed back as soon
+as it finishes; aggregation only depends on the set of results, not on the
+order workers return them.
+
+A game whose seat to act has no legal action is force-settled exactly like
+the backend does (``force_phase("settlement")`` then ``settle``), so its
+chips count towards win rate and EV like any other game; such games are
+only tallied separately as ``forced``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from multiprocessing import get_context
+import os
+import random
+from typing import Any, Callable, Iterator
+
+from engine.bots import create_bot
+from engine.core import XianqiGameEngine
+
+DEFAULT_CHUNKSIZE = 8
+_Z_95 = 1.959963984540054
+_MAX_STEPS = 1000
+
+
+def seat_lineup(game_index: int) -> list[int]:
+    """Return the entrant index seated at seats 0..2 for game_index."""
+
+    shift = game_index % 3
+    return [(seat + shift) % 3 for seat in range(3)]
+
+
+def play_game(entrants: list[str], seed: int, game_index: int = 0) -> dict[str, Any]:
+    """Play one seeded game and return its result record."""
+
+    lineup = seat_lineup(game_index)
+    bots = [create_bot(entrants[lineup[seat]], seed=seed * 3 + seat) for seat in range(3)]
+    rngs = [random.Random(seed * 3 + seat) for seat in range(3)]
+
+    engine = XianqiGameEngine()
+    engine.init_game({"player_count": 3}, rng_seed=seed)
+    steps = 0
+    forced = False
+    while steps < _MAX_STEPS:
+        public_state = engine.get_public_state()
+        if public_state["phase"] == "settlement":
+            break
+        seat = int(public_state["turn"]["current_seat"])
+        legal_actions = engine.get_legal_actions(seat)
+        if not legal_actions["actions"]:
+            engine.force_phase("settlement", reason="no_legal_actions")
+            forced = True
+            break
+        action_idx, cover_list = bots[seat].choose_action(
+            {
+                "seat": seat,
+                "public_state": public_state,
+                "private_state": engine.get_private_state(seat),
+                "legal_actions": legal_actions,
+                "rng": rngs[seat],
+            }
+        )
+        engine.apply_action(action_idx, cover_list=cover_list, client_version=int(public_state["version"]))
+        steps += 1
+
+    settled = engine.get_public_state()["phase"] == "settlement"
+    deltas = [0, 0, 0]
+    if settled:
+        for item in engine.settle()["settlement"]["chip_delta_by_seat"]:
+            deltas[int(item["seat"])] = int(item["delta"])
+    return {
+        "game_index": game_index,
+        "seed": seed,
+        "lineup": lineup,
+        "settled": settled,
+        "forced": forced,
+        "steps": steps,
+        "chip_delta_by_seat": deltas,
+    }
+
+
+def _play_job(job: tuple[list[str], int, int]) -> dict[str, Any]:
+    entrants, seed, game_index = job
+    return play_game(entrants, seed, game_index)
+
+
+def iter_games(
+    entrants: list[str],
+    games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield per-game results as they finish; workers=1 runs in-process."""
+
+    if len(entrants) != 3:
+        raise ValueError("tournament needs exactly 3 entrants")
+    for spec in entrants:
+        create_bot(spec)
+    jobs = [(list(entrants), seed + game_index, game_index) for game_index in range(games)]
+    worker_count = workers if workers is not None else (os.cpu_count() or 1)
+    if worker_count <= 1:
+        for job in jobs:
+            yield _play_job(job)
+        return
+    with get_context("spawn").Pool(processes=worker_count) as pool:
+        yield from pool.imap_unordered(_play_job, jobs, chunksize=max(1, chunksize))
+
+
+def _wilson_interval(successes: int, total: int) -> list[float]:
+    if total == 0:
+        return [0.0, 0.0]
+    rate = successes / total
+    denom = 1 + _Z_95**2 / total
+    center = (rate + _Z_95**2 / (2 * total)) / denom
+    half = _Z_95 * math.sqrt(rate * (1 - rate) / total + _Z_95**2 / (4 * total**2)) / denom
+    return [center - half, center + half]
+
+
+def _mean_interval(total: float, total_sq: float, count: int) -> tuple[float, list[float]]:
+    if count == 0:
+        return 0.0, [0.0, 0.0]
+    mean = total / count
+    if count == 1:
+        return mean, [mean, mean]
+    variance = max(0.0, (total_sq - count * mean * mean) / (count - 1))
+    half = _Z_95 * math.sqrt(variance / count)
+    return mean, [mean - half, mean + half]
+
+
+class TournamentStats:
+    """Streaming per-entrant aggregates: win/loss/draw counts and chip EV."""
+
+    def __init__(self, entrants: list[str]) -> None:
+        self.entrants = list(entrants)
+        self.games = 0
+        self.unsettled = 0
+        self.forced = 0
+        self._wins = [0, 0, 0]
+        self._losses = [0, 0, 0]
+        self._draws = [0, 0, 0]
+        self._chip_sum = [0, 0, 0]
+        self._chip_sq_sum = [0, 0, 0]
+
+    def add(self, result: dict[str, Any]) -> None:
+        self.games += 1
+        if result.get("forced"):
+            self.forced += 1
+        if not result["settled"]:
+            self.unsettled += 1
+            return
+        for seat, entrant in enumerate(result["lineup"]):
+            delta = int(result["chip_delta_by_seat"][seat])
+            if delta > 0:
+                self._wins[entrant] += 1
+            elif delta < 0:
+                self._losses[entrant] += 1
+            else:
+                self._draws[entrant] += 1
+            self._chip_sum[entrant] += delta
+            self._chip_sq_sum[entrant] += delta * delta
+
+    def summary(self) -> dict[str, Any]:
+        settled = self.games - self.unsettled
+        entrants = []
+        for entrant, spec in enumerate(self.entrants):
+            chip_ev, chip_ev_ci = _mean_interval(self._chip_sum[entrant], self._chip_sq_sum[entrant], settled)
+            entrants.append(
+                {
+                    "entrant": entrant,
+                    "bot": spec,
+                    "wins": self._wins[entrant],
+                    "losses": self._losses[entrant],
+                    "draws": self._draws[entrant],
+                    "win_rate": self._wins[entrant] / settled if settled else 0.0,
+                    "win_rate_ci95": _wilson_interval(self._wins[entrant], settled),
+                    "chip_total": self._chip_sum[entrant],
+                    "chip_ev": chip_ev,
+                    "chip_ev_ci95": chip_ev_ci,
+                }
+            )
+        return {
+            "games": self.games,
+            "settled": settled,
+            "forced": self.forced,
+            "unsettled": self.unsettled,
+            "entrants": entrants,
+        }
+
+
+def run_tournament(
+    entrants: list[str],
+    games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Run games and return the aggregate summary; on_result sees each game as it lands."""
+
+    stats = TournamentStats(entrants)
+    for result in iter_games(entrants, games, seed=seed, workers=workers, chunksize=chunksize):
+        stats.add(result)
+        if on_result is not None:
+            on_result(result)
+    return stats.summary()
+
+
+def _render_summary(summary: dict[str, Any]) -> list[str]:
+    lines = [
+        f"games={summary['games']} settled={summary['settled']} forced={summary['forced']} "
+        f"unsettled={summary['unsettled']}"
+    ]
+    for item in summary["entrants"]:
+        low, high = item["win_rate_ci95"]
+        ev_low, ev_high = item["chip_ev_ci95"]
+        lines.append(
+            f"[{item['entrant']}] {item['bot']:<16} win={item['win_rate']:.3f} ({low:.3f}..{high:.3f}) "
+            f"ev={item['chip_ev']:+.3f} ({ev_low:+.3f}..{ev_high:+.3f})"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None, output_fn: Callable[[str], None] = print) -> int:
+    parser = argparse.ArgumentParser(description="Run a seeded Xianqi self-play tournament.")
+    parser.add_argument("--bots", nargs=3, default=["random", "greedy", "always-buckle"], help="Three bot specs.")
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of game 0; game i uses seed + i.")
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: CPU count, 1 = in-process).")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--results", type=str, default=None, help="Stream per-game results to this JSONL file.")
+    parser.add_argument("--summary", type=str, default=None, help="Write the aggregate summary JSON here.")
+    args = parser.parse_args(argv)
+
+    results_handle = open(args.results, "w", encoding="utf-8") if args.results else None
+    try:
+        def on_result(result: dict[str, Any]) -> None:
+            if results_handle is not None:
+                results_handle.write(json.dumps(result, sort_keys=True) + "\n")
+
+        summary = run_tournament(
+            args.bots,
+            args.games,
+            seed=args.seed,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            on_result=on_result,
+        )
+    finally:
+        if results_handle is not None:
+            results_handle.close()
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, ensure_ascii=False, indent=2)
+            handle.write("\n")
+    output_fn("\n".join(_render_summary(summary)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
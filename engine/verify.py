@@ -0,0 +1,179 @@
+"""Parallel determinism verifier for recorded games.
+
+Every recorded game (an ``.xqr`` replay or a ``log_path`` directory) is
+re-executed through ``XianqiGameEngine`` and the ``replay.state_digest`` of
+each rebuilt version is compared with the recorded one. Log directories
+record every version; replays record every version when exported with
+``version_digests`` and otherwise only the final state. Games are spread
+over a process pool and the first divergence of each game is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from multiprocessing import get_context
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from engine.game_logger import DELTA_STATE_FILE
+from engine.replay import (
+    REPLAY_SUFFIX,
+    logged_state_digests,
+    read_replay,
+    replay_from_log_dir,
+    replay_version_count,
+    run_replay,
+    state_digest,
+)
+
+DEFAULT_CHUNKSIZE = 16
+
+
+def _is_log_dir(path: Path) -> bool:
+    return (path / "state_v1.json").is_file() or (path / DELTA_STATE_FILE).is_file()
+
+
+def discover_games(root: str | Path) -> list[Path]:
+    """Return every replay file and log directory under root, sorted by path."""
+
+    root_path = Path(root)
+    if root_path.is_file():
+        return [root_path]
+    found = [path for path in root_path.rglob(f"*{REPLAY_SUFFIX}") if path.is_file()]
+    if _is_log_dir(root_path):
+        found.append(root_path)
+    found.extend(path for path in root_path.rglob("*") if path.is_dir() and _is_log_dir(path))
+    return sorted(found)
+
+
+def _expected_digests(path: Path) -> tuple[Any, dict[int, bytes], str]:
+    if path.is_dir():
+        digests = logged_state_digests(path)
+        return replay_from_log_dir(path, digests=digests), digests, "log"
+    replay = read_replay(path)
+    expected: dict[int, bytes] = {}
+    if replay.version_digests is not None:
+        expected = {version: digest for version, digest in enumerate(replay.version_digests, start=1)}
+    if replay.final_digest is not None:
+        expected[replay_version_count(replay)] = replay.final_digest
+    return replay, expected, "replay"
+
+
+class _Diverged(Exception):
+    pass
+
+
+def verify_game(path: str | Path) -> dict[str, Any]:
+    """Re-execute one recorded game and report its first divergence, if any."""
+
+    game_path = Path(path)
+    result: dict[str, Any] = {
+        "path": str(game_path),
+        "kind": "replay" if game_path.is_file() else "log",
+        "versions_checked": 0,
+        "ok": False,
+        "divergence": None,
+        "error": None,
+    }
+    try:
+        replay, expected, result["kind"] = _expected_digests(game_path)
+
+        def on_version(version: int, state: dict[str, Any], _action: Any) -> None:
+            recorded = expected.get(version)
+            if recorded is None:
+                return
+            actual = state_digest(state)[: len(recorded)]
+            result["versions_checked"] += 1
+            if actual != recorded:
+                result["divergence"] = {"version": version, "expected": recorded.hex(), "actual": actual.hex()}
+                raise _Diverged
+
+        run_replay(replay, on_version=on_version, verify=False)
+        result["ok"] = True
+    except _Diverged:
+        pass
+    except (OSError, ValueError, KeyError) as exc:
+        result["error"] = str(exc) or type(exc).__name__
+    except Exception as exc:  # pylint: disable=broad-except
+        # A corrupt log can fail anywhere (schema asserts, type errors); report
+        # it against this game instead of aborting the whole pool run.
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def iter_verify(
+    paths: list[Path],
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield per-game results as they finish; workers=1 runs in-process."""
+
+    jobs = [str(path) for path in paths]
+    worker_count = workers if workers is not None else (os.cpu_count() or 1)
+    if worker_count <= 1:
+        for job in jobs:
+            yield verify_game(job)
+        return
+    with get_context("spawn").Pool(processes=worker_count) as pool:
+        yield from pool.imap_unordered(verify_game, jobs, chunksize=max(1, chunksize))
+
+
+def verify_games(
+    root: str | Path,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Verify every game under root and return counts plus failing games sorted by path."""
+
+    summary: dict[str, Any] = {"games": 0, "ok": 0, "diverged": 0, "errors": 0, "versions_checked": 0, "failures": []}
+    for result in iter_verify(discover_games(root), workers=workers, chunksize=chunksize):
+        summary["games"] += 1
+        summary["versions_checked"] += result["versions_checked"]
+        if result["ok"]:
+            summary["ok"] += 1
+        elif result["divergence"] is not None:
+            summary["diverged"] += 1
+            summary["failures"].append(result)
+        else:
+            summary["errors"] += 1
+            summary["failures"].append(result)
+        if on_result is not None:
+            on_result(result)
+    summary["failures"].sort(key=lambda item: item["path"])
+    return summary
+
+
+def main(argv: list[str] | None = None, output_fn: Callable[[str], None] = print) -> int:
+    parser = argparse.ArgumentParser(description="Re-execute recorded games and compare per-version state digests.")
+    parser.add_argument("root", help="Replay file, log directory, or a directory tree containing them.")
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: CPU count, 1 = in-process).")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--report", type=str, default=None, help="Write the JSON summary here.")
+    args = parser.parse_args(argv)
+
+    summary = verify_games(args.root, workers=args.workers, chunksize=args.chunksize)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, ensure_ascii=False, indent=2)
+            handle.write("\n")
+    output_fn(
+        f"games={summary['games']} ok={summary['ok']} diverged={summary['diverged']} "
+        f"errors={summary['errors']} versions_checked={summary['versions_checked']}"
+    )
+    for failure in summary["failures"]:
+        if failure["divergence"] is not None:
+            divergence = failure["divergence"]
+            output_fn(
+                f"DIVERGED {failure['path']} at v{divergence['version']}: "
+                f"expected {divergence['expected']} got {divergence['actual']}"
+            )
+        else:
+            output_fn(f"ERROR {failure['path']}: {failure['error']}")
+    return 0 if summary["ok"] == summary["games"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""Zobrist-style 64-bit state hashing.
+
+The hash XORs one fixed 64-bit key per state feature, so a transition only
+XORs out the features it removes and XORs in the ones it adds. Keys derive
+from blake2b over the feature tuple, so every process computes the same hash
+for the same state.
+
+Hashed features are the ones that decide the rest of the game: each seat's
+hand and covered card counts, per-seat pillar counts, reveal relations,
+phase, the turn scalars (current seat, round index/kind, last combo power
+and owner, plays so far) and the reveal scalars (buckler, active revealer,
+pending order). The play-by-play history kept for display is not hashed.
+
+Collections (cards, pillars, relations) are kept incrementally in
+``state["_index"]["zobrist"]``; the handful of scalar fields is folded in
+on read by ``state_hash``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+from typing import Any
+
+from engine.cards import CARD_TYPES, LANE_BITS, LANE_MASK, pack_cards
+
+HASH_MASK = (1 << 64) - 1
+
+
+@lru_cache(maxsize=65536)
+def zobrist_key(*parts: Any) -> int:
+    """Return the fixed 64-bit key of one state feature."""
+
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8, person=b"xianqi-zobrist").digest()
+    return int.from_bytes(digest, "little")
+
+
+def _lane_key(kind: str, seat: int, lane: int, count: int) -> int:
+    if count == 0:
+        return 0
+    return zobrist_key(kind, seat, CARD_TYPES[lane], count)
+
+
+def cards_hash(kind: str, seat: int, packed: int) -> int:
+    """Hash a packed card map of seat; kind is ``"hand"`` or ``"covered"``."""
+
+    value = 0
+    lane = 0
+    while packed:
+        count = packed & LANE_MASK
+        if count:
+            value ^= _lane_key(kind, seat, lane, count)
+        packed >>= LANE_BITS
+        lane += 1
+    return value
+
+
+def cards_delta_hash(kind: str, seat: int, before: int, after: int) -> int:
+    """Return the XOR that turns the hash of before into the hash of after."""
+
+    value = 0
+    lane = 0
+    while before or after:
+        old_count = before & LANE_MASK
+        new_count = after & LANE_MASK
+        if old_count != new_count:
+            value ^= _lane_key(kind, seat, lane, old_count) ^ _lane_key(kind, seat, lane, new_count)
+        before >>= LANE_BITS
+        after >>= LANE_BITS
+        lane += 1
+    return value
+
+
+def pillar_hash(seat: int, count: int) -> int:
+    return zobrist_key("pillars", seat, count) if count else 0
+
+
+def relation_hash(relation: dict[str, Any], occurrence: int) -> int:
+    """Hash the occurrence-th copy (0-based) of one reveal relation."""
+
+    return zobrist_key(
+        "relation",
+        int(relation.get("revealer_seat", -1)),
+        int(relation.get("buckler_seat", -1)),
+        bool(relation.get("revealer_enough_at_time", False)),
+        occurrence,
+    )
+
+
+def collections_hash(state: dict[str, Any], pillar_counts: list[int], covered: list[dict[str, int]]) -> int:
+    """Hash the incrementally maintained features of state from scratch."""
+
+    value = 0
+    for seat, player in enumerate(state.get("players") or []):
+        value ^= cards_hash("hand", seat, pack_cards(player.get("hand") or {}))
+    for seat, cards in enumerate(covered):
+        value ^= cards_hash("covered", seat, pack_cards(cards))
+    for seat, count in enumerate(pillar_counts):
+        value ^= pillar_hash(seat, int(count))
+    seen: dict[tuple[int, int, bool], int] = {}
+    for relation in (state.get("reveal") or {}).get("relations") or []:
+        if not isinstance(relation, dict):
+            continue
+        signature = (
+            int(relation.get("revealer_seat", -1)),
+            int(relation.get("buckler_seat", -1)),
+            bool(relation.get("revealer_enough_at_time", False)),
+        )
+        occurrence = seen.get(signature, 0)
+        seen[signature] = occurrence + 1
+        value ^= relation_hash(relation, occurrence)
+    return value
+
+
+def relation_occurrence(relations: list[dict[str, Any]], relation: dict[str, Any]) -> int:
+    """Count earlier relations equal to relation (the occurrence index of a new append)."""
+
+    signature = (relation["revealer_seat"], relation["buckler_seat"], relation["revealer_enough_at_time"])
+    return sum(
+        1
+        for other in relations
+        if (other.get("revealer_seat"), other.get("buckler_seat"), other.get("revealer_enough_at_time")) == signature
+    )
+
+
+def _optional_seat(value: Any) -> int:
+    return -1 if value is None else int(value)
+
+
+def scalar_hash(state: dict[str, Any]) -> int:
+    """Hash phase, turn scalars and reveal scalars (constant work per call)."""
+
+    turn = state.get("turn") or {}
+    reveal = state.get("reveal") or {}
+    last_combo = turn.get("last_combo") or {}
+    return (
+        zobrist_key("phase", str(state.get("phase")))
+        ^ zobrist_key("current_seat", _optional_seat(turn.get("current_seat")))
+        ^ zobrist_key("round_index", int(turn.get("round_index", 0)))
+        ^ zobrist_key("round_kind", int(turn.get("round_kind", 0)))
+        ^ zobrist_key("last_combo", int(last_combo.get("power", -1)), _optional_seat(last_combo.get("owner_seat")))
+        ^ zobrist_key("plays", len(turn.get("plays") or []))
+        ^ zobrist_key("buckler_seat", _optional_seat(reveal.get("buckler_seat")))
+        ^ zobrist_key("active_revealer_seat", _optional_seat(reveal.get("active_revealer_seat")))
+        ^ zobrist_key("pending_order", tuple(int(seat) for seat in reveal.get("pending_order") or []))
+    )